@@ -0,0 +1,3 @@
+"""
+Benchmarks of the process mining and ingestion hot paths (see run.py)
+"""
@@ -0,0 +1,238 @@
+"""
+Process Mining Benchmarks
+
+Times the hot paths of ingestion and analysis on a synthetic event log and
+prints the results as JSON, so runs of different versions can be compared:
+
+    python -m benchmarks.run --cases 100000 --output results.json
+
+Run from the backend directory. Supabase is replaced by an in-memory store
+(see stub_supabase.py), so no credentials or network are needed.
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+# Settings are read on import; the benchmark needs no real project
+os.environ.setdefault("SUPABASE_URL", "http://supabase.benchmark")
+os.environ.setdefault("SUPABASE_KEY", "benchmark.anon.key")
+os.environ.setdefault("EVENT_LOG_CACHE_DIR", tempfile.mkdtemp(prefix="tessely-bench-"))
+
+import numpy as np  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from benchmarks.stub_supabase import InMemorySupabase, StubScopedClient  # noqa: E402
+from benchmarks.synthetic import LogSpec, generate_csv  # noqa: E402
+from src.api.api import app  # noqa: E402
+from src.api.dependencies import (  # noqa: E402
+    get_current_user,
+    get_user_supabase_client,
+)
+from src.api.graph_payload import encode_msgpack  # noqa: E402
+from src.api.streaming import iter_json  # noqa: E402
+from src.core.supabase_client import get_supabase_client  # noqa: E402
+from src.models.process_mining import ProcessMiningDataResponse  # noqa: E402
+from src.services.dfg_miner import discover_dfg  # noqa: E402
+from src.services.event_log import EventLog  # noqa: E402
+from src.services.process_mining_engine import ProcessMiningEngine  # noqa: E402
+from src.services.rollups import (  # noqa: E402
+    build_rollup,
+    case_completion,
+    combine_rollups,
+)
+from src.services.time_periods import parse_time_period  # noqa: E402
+
+# Version of the result document layout
+RESULTS_VERSION = 1
+
+USER_ID = "benchmark-user"
+DATA_URL = "/api/v1/process-mining/data"
+
+
+def measure(
+    func: Callable[[], Any],
+    repeat: int,
+    setup: Optional[Callable[[], Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Time a function over several runs, after one untimed warm-up run
+
+    Args:
+        func: Function to time
+        repeat: Number of timed runs
+        setup: Untimed function called before every run
+
+    Returns:
+        Dictionary with runs and min/median/mean/max seconds
+    """
+    if setup is not None:
+        setup()
+    func()
+
+    times: List[float] = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    return {
+        "runs": repeat,
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "mean_s": statistics.fmean(times),
+        "max_s": max(times),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    """Commit of the benchmarked tree, if it is a git checkout"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_core(content: bytes, repeat: int) -> Dict[str, Dict[str, Any]]:
+    """Parsing, discovery, rollups and serialization, without HTTP"""
+    text = content.decode()
+    log = EventLog.from_csv(io.StringIO(text), name="benchmark.csv", source_id="1")
+    _, completed = case_completion(log)
+    engine = ProcessMiningEngine()
+    rollup = build_rollup(log)
+    quarter = parse_time_period("Q2-2025")
+    data = engine.analyze([log])
+
+    return {
+        "csv_parse": measure(lambda: EventLog.from_csv(io.StringIO(text)), repeat),
+        "dfg_discovery": measure(lambda: discover_dfg(log, completed), repeat),
+        "process_analysis": measure(lambda: engine.analyze([log]), repeat),
+        "rollup_build": measure(lambda: build_rollup(log), repeat),
+        "rollup_query": measure(lambda: combine_rollups([rollup], quarter), repeat),
+        "serialize_pydantic": measure(
+            lambda: ProcessMiningDataResponse(**data).model_dump_json(by_alias=True),
+            repeat,
+        ),
+        "serialize_stream_json": measure(
+            lambda: b"".join(iter_json(data, ProcessMiningDataResponse)), repeat
+        ),
+        "serialize_msgpack": measure(
+            lambda: encode_msgpack(data, ProcessMiningDataResponse), repeat
+        ),
+    }
+
+
+def bench_api(content: bytes, repeat: int) -> Dict[str, Dict[str, Any]]:
+    """Upload and /process-mining/data through the FastAPI app"""
+    store = InMemorySupabase()
+    app.dependency_overrides[get_current_user] = lambda: {"id": USER_ID}
+    app.dependency_overrides[get_user_supabase_client] = lambda: StubScopedClient(
+        get_supabase_client(), "benchmark-token", store
+    )
+    try:
+        with TestClient(app) as client:
+            service = app.state.process_mining_service
+
+            def upload() -> None:
+                response = client.post(
+                    "/api/v1/csv_datasource/upload",
+                    files={"file": ("benchmark.csv", content, "text/csv")},
+                )
+                response.raise_for_status()
+
+            start = time.perf_counter()
+            upload()
+            upload_seconds = time.perf_counter() - start
+
+            def get(headers: Optional[Dict[str, str]] = None) -> None:
+                response = client.get(DATA_URL, headers=headers)
+                if response.is_error:
+                    response.raise_for_status()
+
+            etag = client.get(DATA_URL).headers["ETag"]
+            return {
+                "api_upload": {"runs": 1, "min_s": upload_seconds},
+                "api_data_cold": measure(
+                    get, repeat, setup=lambda: service.invalidate_user(USER_ID)
+                ),
+                "api_data_cached": measure(get, repeat),
+                "api_data_msgpack": measure(
+                    lambda: get({"Accept": "application/msgpack"}), repeat
+                ),
+                "api_data_not_modified": measure(
+                    lambda: get({"If-None-Match": etag}), repeat
+                ),
+            }
+    finally:
+        app.dependency_overrides.clear()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the benchmarks and print or write the JSON results"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cases", type=int, default=LogSpec.cases)
+    parser.add_argument("--activities", type=int, default=LogSpec.activities)
+    parser.add_argument("--variants", type=int, default=LogSpec.variants)
+    parser.add_argument("--skew", type=float, default=LogSpec.skew)
+    parser.add_argument("--seed", type=int, default=LogSpec.seed)
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Timed runs per benchmark"
+    )
+    parser.add_argument(
+        "--skip-api", action="store_true", help="Skip the end-to-end API benchmarks"
+    )
+    parser.add_argument("--output", help="Write the results to this file")
+    args = parser.parse_args(argv)
+
+    spec = LogSpec(
+        cases=args.cases,
+        activities=args.activities,
+        variants=args.variants,
+        skew=args.skew,
+        seed=args.seed,
+    )
+    content = generate_csv(spec)
+    events = content.count(b"\n") - 1
+
+    results = bench_core(content, args.repeat)
+    if not args.skip_api:
+        results.update(bench_api(content, args.repeat))
+
+    report = {
+        "results_version": RESULTS_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "log": {**spec.to_dict(), "events": events, "csv_bytes": len(content)},
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+In-Memory Supabase
+
+Answers the PostgREST and Storage requests the process mining endpoints make,
+so the end-to-end benchmark exercises the real client code paths (request
+building, thread pool, response parsing) without a network or a project.
+Filters are ignored: the benchmark has a single user.
+"""
+
+import json
+from typing import Any, Dict, List
+
+import httpx
+from postgrest.utils import SyncClient
+
+from src.core.supabase_client import ScopedSupabaseClient
+
+
+def _file_content(request: httpx.Request) -> bytes:
+    """Content of a storage upload, sent raw or as the multipart file field"""
+    body = request.read()
+    content_type = request.headers.get("content-type", "")
+    if not content_type.startswith("multipart/form-data"):
+        return body
+    boundary = content_type.split("boundary=", 1)[1].encode()
+    for part in body.split(b"--" + boundary):
+        head, _, content = part.partition(b"\r\n\r\n")
+        if b'name="file"' in head:
+            return content.removesuffix(b"\r\n")
+    return b""
+
+
+class InMemorySupabase:
+    """Tables and storage objects of a fake Supabase project"""
+
+    def __init__(self) -> None:
+        self.rows: Dict[str, List[Dict[str, Any]]] = {}
+        self.objects: Dict[str, bytes] = {}
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        """Answer one HTTP request"""
+        path = request.url.path
+        if path.startswith("/rest/v1/"):
+            table = self.rows.setdefault(path.removeprefix("/rest/v1/"), [])
+            if request.method == "POST":
+                # Inserts send one row as an object or several as an array
+                body = json.loads(request.read())
+                inserted = []
+                for row in body if isinstance(body, list) else [body]:
+                    inserted.append({**row, "id": len(table) + 1})
+                    table.append(inserted[-1])
+                return httpx.Response(201, json=inserted)
+            return httpx.Response(200, json=table)
+
+        key = path.split("/object/", 1)[1]
+        if request.method in ("POST", "PUT"):
+            self.objects[key] = _file_content(request)
+            return httpx.Response(200, json={"Key": key})
+        if key not in self.objects:
+            return httpx.Response(404, json={"message": "Object not found"})
+        return httpx.Response(200, content=self.objects[key])
+
+
+class StubScopedClient(ScopedSupabaseClient):
+    """ScopedSupabaseClient whose requests are answered in memory"""
+
+    def __init__(self, client: Any, access_token: str, store: InMemorySupabase) -> None:
+        self._transport = httpx.MockTransport(store.handle)
+        super().__init__(client, access_token)
+
+    def _scoped_session(self, session: httpx.Client, access_token: str) -> SyncClient:
+        """Copy of a singleton session that sends its requests to the store"""
+        headers = httpx.Headers(session.headers)
+        headers["Authorization"] = f"Bearer {access_token}"
+        return SyncClient(
+            base_url=session.base_url,
+            headers=headers,
+            transport=self._transport,
+        )
@@ -1,20 +1,55 @@
 # @track_context("api_setup.md")
 
-import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
 
+from src.api.dependencies import use_local_auth
+from src.api.instrumentation import MetricsMiddleware
 from src.api.router import api_router
-from src.core.config import settings
+from src.core.config import LOG_LEVEL, settings
+from src.core.logging_config import configure_logging
+from src.core.metrics import CacheStatsCollector
+from src.core.principal_cache import principal_cache
+from src.core.supabase_client import shutdown_supabase_executor
+from src.services.process_mining_service import ProcessMiningService
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+configure_logging(LOG_LEVEL, settings.LOG_FORMAT, settings.LOG_SAMPLE_RATE)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Create and warm up application-lifetime services, release them on shutdown"""
+    # Fail fast on a bad AUTH_MODE and report a missing JWT secret once
+    use_local_auth()
+    service = ProcessMiningService()
+    await service.warm_up()
+    app.state.process_mining_service = service
+    cache_stats = CacheStatsCollector(
+        {
+            "principal": principal_cache.stats,
+            "results": service.results.stats,
+            "file_counts": service.file_counts.stats,
+        }
+    )
+    REGISTRY.register(cache_stats)
+
+    yield
+
+    REGISTRY.unregister(cache_stats)
+    await service.shutdown()
+    shutdown_supabase_executor()
+
 
 app = FastAPI(
     title="Supabase Auth API",
     description="Production-ready authentication API with Supabase",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -26,6 +61,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so the latency includes every other middleware
+app.add_middleware(MetricsMiddleware)
+
 # Add API routes
 app.include_router(api_router, prefix="/api/v1")
 
@@ -34,3 +72,9 @@ app.include_router(api_router, prefix="/api/v1")
 async def health_check() -> dict[str, str]:
     """Simple health check endpoint"""
     return {"status": "healthy", "version": "0.1.0"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus scrape endpoint"""
+    return Response(content=generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
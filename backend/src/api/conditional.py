@@ -0,0 +1,86 @@
+"""
+Conditional GET Support
+
+This module derives strong ETags for process mining responses from the
+dataset version (a fingerprint of the user's uploaded files) and the request
+parameters, so an unchanged dashboard can be answered with 304 Not Modified
+before any result is computed or serialized.
+"""
+
+import hashlib
+import json
+from typing import Any, Optional
+
+from fastapi import Response, status
+
+from src.core.constants import ProcessMining
+
+# Responses are per user and must be revalidated before reuse
+CACHE_CONTROL = "private, no-cache"
+
+
+def dataset_etag(user_id: str, version: str, *parts: Any) -> str:
+    """
+    Strong ETag of a response computed from a dataset version
+
+    Args:
+        user_id: Owner of the dataset
+        version: Dataset version from dataset_version()
+        parts: Endpoint, filter parameters and media type of the response
+
+    Returns:
+        Quoted ETag value
+    """
+    key = json.dumps([ProcessMining.SCHEMA_VERSION, user_id, version, *parts])
+    return f'"{hashlib.sha256(key.encode()).hexdigest()[:32]}"'
+
+
+def is_not_modified(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches the current ETag
+
+    Uses the weak comparison required for If-None-Match (RFC 9110 13.1.2).
+    The "*" form only matters for writes and is not treated as a match, so an
+    invalid request is never answered with 304.
+
+    Args:
+        if_none_match: If-None-Match header value
+        etag: Current ETag of the response
+
+    Returns:
+        True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    tags = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in tags
+
+
+def set_cache_headers(response: Response, etag: str) -> None:
+    """
+    Add the ETag and Cache-Control headers to a response
+
+    Args:
+        response: Outgoing response
+        etag: ETag of the response
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def not_modified(etag: str, vary: Optional[str] = None) -> Response:
+    """
+    304 Not Modified response for a current ETag
+
+    Args:
+        etag: ETag the client already holds
+        vary: Vary header of the full response, which the 304 must repeat
+
+    Returns:
+        Empty response with the cache headers
+    """
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    if vary:
+        response.headers["Vary"] = vary
+    set_cache_headers(response, etag)
+    return response
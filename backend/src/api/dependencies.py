@@ -1,33 +1,46 @@
 # @track_context("dependencies.md")
 
+import asyncio
 import logging
+import time
+from functools import cache
 from typing import Any
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
+from supabase import AuthApiError
 
 from src.core.config import settings
+from src.core.constants import AuthModes
 from src.core.messages import ErrorMessages, LogMessages
-from src.core.supabase_client import get_supabase_client
+from src.core.metrics import observe_stage
+from src.core.principal_cache import principal_cache, token_hash
+from src.core.supabase_client import (
+    ScopedSupabaseClient,
+    get_scoped_supabase_client,
+    get_supabase_client,
+    run_supabase,
+)
 from src.services.auth_service import AuthService
+from src.services.process_mining_service import ProcessMiningService
 
 logger = logging.getLogger(__name__)
 security = HTTPBearer()
 
 
-def validate_jwt_token(token: str) -> str:
+def decode_jwt_token(token: str) -> dict[str, Any]:
     """
-    Extract and validate JWT token, return user_id
+    Verify a Supabase JWT locally and return its claims
 
     Args:
         token: JWT token string
 
     Returns:
-        user_id extracted from token
+        Verified token claims
 
     Raises:
-        HTTPException: If token is invalid
+        HTTPException: If token is invalid or has no subject
     """
     try:
         # Decode and verify token
@@ -43,18 +56,6 @@ def validate_jwt_token(token: str) -> str:
             },
             audience="authenticated",
         )
-
-        # Extract user_id from sub claim
-        user_id: Any = payload.get("sub")
-        if not user_id:
-            logger.warning(LogMessages.JWT_MISSING_SUB)
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=ErrorMessages.INVALID_TOKEN_MISSING_USER,
-            )
-
-        return str(user_id)
-
     except JWTError as err:
         logger.warning(LogMessages.JWT_VALIDATION_FAILED.format(error=err))
         raise HTTPException(
@@ -62,29 +63,174 @@ def validate_jwt_token(token: str) -> str:
             detail=ErrorMessages.INVALID_TOKEN,
         ) from err
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-) -> dict[str, Any]:
+    if not payload.get("sub"):
+        logger.warning(LogMessages.JWT_MISSING_SUB)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=ErrorMessages.INVALID_TOKEN_MISSING_USER,
+        )
+
+    return payload
+
+
+def validate_jwt_token(token: str) -> str:
     """
-    Get current authenticated user from JWT token
+    Extract and validate JWT token, return user_id
 
     Args:
-        credentials: HTTP Bearer token credentials
+        token: JWT token string
+
+    Returns:
+        user_id extracted from token
+
+    Raises:
+        HTTPException: If token is invalid
+    """
+    return str(decode_jwt_token(token)["sub"])
+
+
+class TokenRevocationList:
+    """
+    Tokens found to be revoked upstream, checked asynchronously
+
+    Locally verified tokens are re-checked against Supabase in the background
+    at most once per check interval. A token that Supabase rejects is
+    remembered until it expires, so its next request is refused without a
+    round-trip.
+    """
+
+    def __init__(self, check_interval_seconds: int) -> None:
+        self.check_interval_seconds = check_interval_seconds
+        self._revoked: dict[str, float] = {}
+        self._next_check: dict[str, float] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def is_revoked(self, token_hash: str) -> bool:
+        """Return True if the token was found to be revoked"""
+        return token_hash in self._revoked
+
+    def schedule_check(self, token: str, token_hash: str, expires_at: float) -> None:
+        """
+        Start a background upstream check of a token if one is due
+
+        Args:
+            token: Raw JWT
+            token_hash: Hash of the token
+            expires_at: Token expiry (epoch seconds)
+        """
+        now = time.time()
+        self._prune(now)
+        if self._next_check.get(token_hash, 0.0) > now:
+            return
+
+        self._next_check[token_hash] = min(
+            now + self.check_interval_seconds, expires_at
+        )
+        task = asyncio.create_task(self._check(token, token_hash, expires_at))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _check(self, token: str, token_hash: str, expires_at: float) -> None:
+        """Ask Supabase whether the token is still valid"""
+        try:
+            supabase = get_supabase_client()
+            result = await run_supabase(supabase.auth.get_user, token)
+            revoked = not result or not result.user
+        except AuthApiError:
+            revoked = True
+        except Exception as e:
+            # Network errors must not lock users out; retry on the next request
+            logger.warning("Token revocation check failed: %s", e)
+            self._next_check.pop(token_hash, None)
+            return
+
+        if revoked:
+            self._revoked[token_hash] = expires_at
+
+    def _prune(self, now: float) -> None:
+        """Forget entries for tokens that have expired anyway"""
+        for key in [h for h, exp in self._revoked.items() if exp <= now]:
+            del self._revoked[key]
+        for key in [h for h, due in self._next_check.items() if due <= now]:
+            del self._next_check[key]
+
+
+revocation_list = TokenRevocationList(settings.AUTH_REVOCATION_CHECK_INTERVAL_SECONDS)
+
+
+@cache
+def use_local_auth() -> bool:
+    """
+    Return True if tokens should be verified locally
+
+    Settings do not change at runtime, so the mode is resolved once (at
+    startup, by the lifespan hook) and a missing secret is reported once.
+
+    Raises:
+        ValueError: If AUTH_MODE is not a supported mode
+    """
+    if settings.AUTH_MODE not in (AuthModes.LOCAL, AuthModes.REMOTE):
+        raise ValueError(f"Unsupported AUTH_MODE: {settings.AUTH_MODE!r}")
+    if settings.AUTH_MODE != AuthModes.LOCAL:
+        return False
+    if not settings.SUPABASE_JWT_SECRET:
+        logger.warning(LogMessages.JWT_SECRET_MISSING)
+        return False
+    return True
+
+
+def authenticate_locally(token: str) -> dict[str, Any]:
+    """
+    Build the current user from locally verified token claims
+
+    Args:
+        token: JWT token string
 
     Returns:
         Dictionary containing user information
 
     Raises:
-        HTTPException: If token is invalid or user not found
+        HTTPException: If token is invalid or was revoked
     """
-    token = credentials.credentials
+    claims = decode_jwt_token(token)
+    hashed_token = token_hash(token)
 
+    if settings.AUTH_REVOCATION_CHECK:
+        if revocation_list.is_revoked(hashed_token):
+            logger.warning(LogMessages.TOKEN_REVOKED.format(user_id=claims["sub"]))
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired token",
+            )
+        revocation_list.schedule_check(token, hashed_token, float(claims["exp"]))
+
+    user_metadata = claims.get("user_metadata")
+    return {
+        "id": str(claims["sub"]),
+        "email": claims.get("email"),
+        "user_metadata": user_metadata if isinstance(user_metadata, dict) else {},
+    }
+
+
+async def authenticate_remotely(token: str) -> dict[str, Any]:
+    """
+    Validate a token with Supabase and build the current user
+
+    Args:
+        token: JWT token string
+
+    Returns:
+        Dictionary containing user information
+
+    Raises:
+        HTTPException: If token is invalid or user not found
+    """
     try:
         # Get Supabase client
         supabase = get_supabase_client()
 
         # Verify token with Supabase
-        result = supabase.auth.get_user(token)
+        result = await run_supabase(supabase.auth.get_user, token)
 
         if not result or not result.user:
             logger.warning("Token validation failed: No user found")
@@ -94,24 +240,89 @@ def get_current_user(
             )
 
         # Return user info as dict
-        user_dict = {
+        return {
             "id": result.user.id,
             "email": result.user.email,
             "user_metadata": result.user.user_metadata or {},
         }
 
-        logger.debug(f"User authenticated: {user_dict['id']}")
-        return user_dict
-
     except HTTPException:
         # Re-raise HTTP exceptions
         raise
     except Exception as e:
-        logger.error(f"Authentication error: {str(e)}", exc_info=True)
+        logger.error("Authentication error: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
         ) from e
 
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> dict[str, Any]:
+    """
+    Get current authenticated user from JWT token
+
+    In local auth mode the token is verified against SUPABASE_JWT_SECRET
+    without a network call; in remote mode Supabase validates the token and
+    the resulting user is cached per token for AUTH_CACHE_TTL_SECONDS.
+
+    Args:
+        credentials: HTTP Bearer token credentials
+
+    Returns:
+        Dictionary containing user information
+
+    Raises:
+        HTTPException: If token is invalid or user not found
+    """
+    token = credentials.credentials
+
+    with observe_stage("auth"):
+        if use_local_auth():
+            user_dict = authenticate_locally(token)
+            logger.debug("User authenticated locally: %s", user_dict["id"])
+            return user_dict
+
+        if settings.AUTH_CACHE_ENABLED:
+            user_dict = await principal_cache.get_or_load(
+                token, lambda: authenticate_remotely(token)
+            )
+        else:
+            user_dict = await authenticate_remotely(token)
+
+    logger.debug("User authenticated: %s", user_dict["id"])
+    return user_dict
+
+
+def get_user_supabase_client(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> ScopedSupabaseClient:
+    """
+    Get a Supabase client that acts with the caller's access token
+
+    Args:
+        credentials: HTTP Bearer token credentials
+
+    Returns:
+        Per-request client scoped to the caller, so row level security applies
+    """
+    return get_scoped_supabase_client(credentials.credentials)
+
+
 def get_auth_service() -> AuthService:
     return AuthService()
+
+
+def get_process_mining_service(request: Request) -> ProcessMiningService:
+    """
+    Dependency for the application-lifetime process mining service
+
+    Args:
+        request: Current request
+
+    Returns:
+        ProcessMiningService created by the application lifespan hook
+    """
+    service: ProcessMiningService = request.app.state.process_mining_service
+    return service
@@ -8,6 +8,8 @@ from fastapi.security import HTTPAuthorizationCredentials
 
 from src.api.dependencies import get_auth_service, get_current_user, security
 from src.core.constants import Supabase
+from src.core.principal_cache import principal_cache
+from src.core.supabase_client import get_supabase_client, run_supabase
 from src.core.messages import ErrorMessages, SuccessMessages
 from src.models.auth import (
     AuthResponse,
@@ -118,19 +120,21 @@ async def login(
     auth_service: AuthService = Depends(get_auth_service),
 ) -> AuthResponse:
     """Log in with email and password"""
-    logger.info(f"Login attempt for email: {user_data.email}")
+    logger.info("Login attempt for email: %s", user_data.email)
     try:
         result = await auth_service.login(user_data)
-        logger.info(f"Login successful for email: {user_data.email}")
+        logger.info("Login successful for email: %s", user_data.email)
         return format_auth_response(result)
     except ValueError:
-        logger.warning(f"Login failed - invalid credentials for email: {user_data.email}")
+        logger.warning(
+            "Login failed - invalid credentials for email: %s", user_data.email
+        )
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=ErrorMessages.INVALID_CREDENTIALS,
         ) from None
     except Exception as e:
-        logger.error(f"Login error for email: {user_data.email} - {e}")
+        logger.error("Login error for email: %s - %s", user_data.email, e)
         raise handle_auth_error(e) from e
 
 
@@ -148,6 +152,7 @@ async def logout(
             )
 
         success = await auth_service.logout(token.credentials)
+        principal_cache.invalidate(token.credentials)
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -225,7 +230,8 @@ async def session_check_raw(
     token = authorization.replace("Bearer ", "", 1)
 
     try:
-        result = supabase.auth.get_user(token)
+        supabase = get_supabase_client()
+        result = await run_supabase(supabase.auth.get_user, token)
 
         if not result or not result.user:
             raise HTTPException(
@@ -1,130 +1,407 @@
 # src/api/routes/upload.py (or wherever your router is)
 
-from fastapi import Header,APIRouter, File, UploadFile, HTTPException, Depends
+from fastapi import APIRouter, File, Form, UploadFile, HTTPException, Depends, Query
+from typing import Any, Dict, List, Optional
 from datetime import datetime
+import asyncio
 import logging
-from src.core.supabase_client import get_supabase_client
-from src.api.dependencies import get_current_user
+from src.core.config import settings
+from src.core.constants import Supabase, Uploads
+from src.core.supabase_client import ScopedSupabaseClient, run_supabase
+from src.api.dependencies import (
+    get_current_user,
+    get_process_mining_service,
+    get_user_supabase_client,
+)
+from src.models.csv_datasource import BatchDeleteRequest
+from src.services.csv_ingestion import (
+    parse_upload,
+    store_binary_event_log,
+    stream_to_storage,
+)
+from src.services.file_listing import count_files, decode_cursor, list_files_page
+from src.services.process_mining_service import ProcessMiningService
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+
 @router.get("/files")
 async def get_user_csv_files(
-    current_user: dict = Depends(get_current_user),
-):
+    limit: int = Query(Uploads.PAGE_SIZE, ge=1, le=Uploads.MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor of the previous page (omit for the first)"
+    ),
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    supabase: ScopedSupabaseClient = Depends(get_user_supabase_client),
+    service: ProcessMiningService = Depends(get_process_mining_service),
+) -> Dict[str, Any]:
     """
-    Retrieve all CSV files uploaded by the current user
+    Retrieve a page of the CSV files uploaded by the current user, newest first
+
+    count is the user's total number of files. Pass next_cursor as cursor to
+    fetch the following page; it is null on the last page.
     """
+    user_id = current_user["id"]
     try:
-        supabase = get_supabase_client()
-        response = supabase.table("uploaded_csv_files")\
-            .select("*")\
-            .eq("user_id", current_user.get('id'))\
-            .order("uploaded_at", desc=True)\
-            .execute()
-        logger.info(f"Current user ID: {current_user.get('id')}")
-        logger.info(f"Query result: {response.data}")
+        position = decode_cursor(cursor) if cursor else None
+
+        page = run_supabase(list_files_page, supabase, user_id, limit, position)
+        count = service.file_counts.get(user_id)
+        if count is None:
+            # Count on a second pool thread while the page is fetched
+            (data, next_cursor), count = await asyncio.gather(
+                page, run_supabase(count_files, supabase, user_id)
+            )
+            service.file_counts.set(user_id, count)
+        else:
+            data, next_cursor = await page
+
+        logger.debug("Retrieved %d of %d files for user %s", len(data), count, user_id)
         return {
             "success": True,
-            "data": response.data,
-            "count": len(response.data)
+            "data": data,
+            "count": count,
+            "next_cursor": next_cursor,
         }
-        
+
+    except ValueError as e:
+        logger.warning("Invalid parameters for user %s: %s", user_id, e)
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Failed to fetch files for user {current_user.get('id')} - Error: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Failed to retrieve files: {str(e)}")
+        logger.error(
+            "Failed to fetch files for user %s - Error: %s",
+            user_id,
+            e,
+            exc_info=True,
+        )
+        raise HTTPException(
+            status_code=500, detail=f"Failed to retrieve files: {str(e)}"
+        )
+
+
+def _object_paths(rows: List[Dict[str, Any]]) -> List[str]:
+    """Storage paths of the CSV and binary event log objects of upload rows"""
+    return [
+        path
+        for row in rows
+        for path in (row.get("file_url"), row.get("event_log_url"))
+        if path
+    ]
+
+
+async def _delete_files(
+    supabase: ScopedSupabaseClient, user_id: str, file_ids: List[int]
+) -> List[Dict[str, Any]]:
+    """
+    Delete uploaded files with one table query and one storage request
+
+    Rows are deleted first, so a failed storage removal leaves orphaned
+    objects rather than rows pointing at missing files.
+
+    Args:
+        supabase: Client scoped to the user
+        user_id: Owner of the files
+        file_ids: Identifiers of the files to delete
+
+    Returns:
+        Deleted rows (id, file_url, event_log_url); files that do not exist or
+        belong to another user are skipped
+    """
+    query = (
+        supabase.table(Uploads.TABLE)
+        .delete()
+        .in_("id", file_ids)
+        .eq("user_id", user_id)
+    )
+    deleted = (await run_supabase(query.execute)).data or []
+
+    paths = _object_paths(deleted)
+    if paths:
+        bucket = supabase.storage.from_(Uploads.BUCKET)
+        await run_supabase(bucket.remove, paths)
+    return deleted
+
 
 @router.delete("/files/{file_id}")
 async def delete_csv_file(
     file_id: int,
-    current_user: dict = Depends(get_current_user),
-    authorization: str = Header(...),
-):
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    supabase: ScopedSupabaseClient = Depends(get_user_supabase_client),
+    service: ProcessMiningService = Depends(get_process_mining_service),
+) -> Dict[str, Any]:
     """
     Delete a specific CSV file from both Storage and Database
     """
     try:
-        token = authorization.replace("Bearer ", "", 1) if authorization.startswith("Bearer ") else authorization
-        supabase = get_supabase_client()
-        supabase.postgrest.auth(token)
-        supabase.storage._client.headers["Authorization"] = f"Bearer {token}"
-        
-        user_id = current_user.get('id')
-
-        file_record = supabase.table("uploaded_csv_files")\
-            .select("file_url")\
-            .eq("id", file_id)\
-            .eq("user_id", user_id)\
-            .single()\
-            .execute()
-
-        if not file_record.data:
-            raise HTTPException(status_code=404, detail="File not found or unauthorized")
-
-        file_path = file_record.data['file_url']
-
-        storage_response = supabase.storage.from_("uploaded_csv_files").remove([file_path])
-        
-        db_response = supabase.table("uploaded_csv_files")\
-            .delete()\
-            .eq("id", file_id)\
-            .eq("user_id", user_id)\
-            .execute()
-
-        logger.info(f"User {user_id} deleted file {file_id} successfully")
+        user_id = current_user["id"]
+
+        deleted = await _delete_files(supabase, user_id, [file_id])
+        if not deleted:
+            raise HTTPException(
+                status_code=404, detail="File not found or unauthorized"
+            )
+        service.invalidate_user(user_id, removed_file_ids=[file_id])
+
+        logger.info("User %s deleted file %s successfully", user_id, file_id)
 
         return {
             "success": True,
             "message": "File deleted successfully",
-            "deleted_id": file_id
+            "deleted_id": file_id,
         }
 
     except HTTPException as he:
         raise he
     except Exception as e:
-        logger.error(f"Delete failed for file {file_id}: {str(e)}", exc_info=True)
+        logger.error("Delete failed for file %s: %s", file_id, e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Delete failed: {str(e)}")
 
+
+@router.post("/files/delete")
+async def delete_csv_files(
+    request: BatchDeleteRequest,
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    supabase: ScopedSupabaseClient = Depends(get_user_supabase_client),
+    service: ProcessMiningService = Depends(get_process_mining_service),
+) -> Dict[str, Any]:
+    """
+    Delete several CSV files from both Storage and Database
+
+    Files that do not exist or belong to another user are reported in
+    not_found instead of failing the batch.
+    """
+    user_id = current_user["id"]
+    try:
+        deleted = await _delete_files(supabase, user_id, request.file_ids)
+        deleted_ids = [record["id"] for record in deleted]
+        service.invalidate_user(user_id, removed_file_ids=deleted_ids)
+
+        logger.info("User %s deleted %d files", user_id, len(deleted_ids))
+
+        removed = set(deleted_ids)
+        return {
+            "success": True,
+            "message": f"Deleted {len(deleted_ids)} files",
+            "deleted_ids": deleted_ids,
+            "not_found": [
+                file_id for file_id in request.file_ids if file_id not in removed
+            ],
+        }
+
+    except Exception as e:
+        logger.error("Batch delete failed for user %s: %s", user_id, e, exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Delete failed: {str(e)}")
+
+
+async def _store_upload(
+    file: UploadFile,
+    industry: Optional[str],
+    current_user: Dict[str, Any],
+    supabase: ScopedSupabaseClient,
+) -> Dict[str, Any]:
+    """
+    Stream an uploaded file to storage and build its uploaded_csv_files row
+
+    The file is parsed before anything is stored, and the objects already
+    stored are removed if a later step fails, so a failed upload leaves no
+    orphaned objects behind.
+
+    Args:
+        file: Uploaded CSV file
+        industry: Industry tag (defaults to the tenant's industry)
+        current_user: Uploading user
+        supabase: Client scoped to the user
+
+    Returns:
+        Row to insert into uploaded_csv_files
+    """
+    timestamp = datetime.now().isoformat()
+    file_name = f"{timestamp}_{file.filename}"
+    file_path = f"{current_user['id']}/{file_name}"
+
+    # One pass builds the column sketches, which let keys and joins be
+    # inferred without re-reading files, and the binary event log
+    log, column_sketches = await asyncio.to_thread(
+        parse_upload, file.file, file.filename or ""
+    )
+
+    bucket = supabase.storage.from_(Uploads.BUCKET)
+    stored: List[str] = []
+    try:
+        await file.seek(0)
+        profiler = await run_supabase(stream_to_storage, bucket, file_path, file.file)
+        stored.append(file_path)
+        event_log_path = None
+        if log is not None:
+            event_log_path = await run_supabase(
+                store_binary_event_log, bucket, file_path, log
+            )
+            stored.append(event_log_path)
+    except BaseException:
+        await _remove_objects(supabase, stored)
+        raise
+
+    return {
+        "user_id": current_user["id"],
+        "file_name": file.filename,
+        "file_url": file_path,
+        "uploaded_at": timestamp,
+        "event_log_url": event_log_path,
+        # Untagged uploads inherit the tenant's industry for filtering
+        "industry": industry
+        or (current_user.get("user_metadata") or {}).get(Supabase.INDUSTRY_FIELD),
+        "column_sketches": column_sketches,
+        **profiler.summary(),
+    }
+
+
+async def _remove_objects(supabase: ScopedSupabaseClient, paths: List[str]) -> None:
+    """
+    Best-effort removal of stored objects whose upload did not complete
+
+    Args:
+        supabase: Client scoped to the user
+        paths: Object paths in the uploads bucket
+    """
+    if not paths:
+        return
+    try:
+        bucket = supabase.storage.from_(Uploads.BUCKET)
+        await run_supabase(bucket.remove, paths)
+    except Exception as e:
+        logger.warning("Failed to remove orphaned objects %s: %s", paths, e)
+
+
+async def _insert_uploads(
+    supabase: ScopedSupabaseClient, rows: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Insert uploaded_csv_files rows with a single query
+
+    The objects the rows point at are removed if the insert fails, so they
+    are not left in storage without a row referencing them.
+
+    Args:
+        supabase: Client scoped to the user
+        rows: Rows built by _store_upload
+
+    Returns:
+        Inserted rows
+    """
+    try:
+        query = supabase.table(Uploads.TABLE).insert(rows)
+        return (await run_supabase(query.execute)).data or []
+    except BaseException:
+        await _remove_objects(supabase, _object_paths(rows))
+        raise
+
+
 @router.post("/upload")
 async def upload_csv(
     file: UploadFile = File(...),
-    current_user: dict = Depends(get_current_user),
-    authorization: str = Header(...)
-):    
+    industry: Optional[str] = Form(None),
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    supabase: ScopedSupabaseClient = Depends(get_user_supabase_client),
+    service: ProcessMiningService = Depends(get_process_mining_service),
+) -> Dict[str, Any]:
     try:
+        row = await _store_upload(file, industry, current_user, supabase)
+
+        data = await _insert_uploads(supabase, [row])
+        service.invalidate_user(current_user["id"])
+
+        return {"success": True, "data": data[0]}
 
-        token = authorization.replace("Bearer ", "", 1) if authorization.startswith("Bearer ") else authorization
-        supabase = get_supabase_client()
-        supabase.postgrest.auth(token)
-        supabase.storage._client.headers["Authorization"] = f"Bearer {token}"
-        
-        contents = await file.read()        
-        timestamp = datetime.now().isoformat()
-        file_name = f"{timestamp}_{file.filename}"
-        file_path = f"{current_user.get('id')}/{file_name}"
-
-        storage_response = supabase.storage.from_("uploaded_csv_files").upload(
-            path=file_path,
-            file=contents,
-            file_options={"content-type": "text/csv", "upsert": "false"}
+    except Exception as e:
+        logger.error(
+            "Upload failed for user %s - Error: %s",
+            current_user["id"],
+            e,
+            exc_info=True,
         )
+        raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
-        db_response = supabase.table("uploaded_csv_files").insert({
-            "user_id": current_user.get('id'),
-            "file_name": file.filename,
-            "file_url": file_path,
-            "uploaded_at": timestamp,
-        }).execute()
-          
+    finally:
+        await file.close()
+
+
+@router.post("/upload/batch")
+async def upload_csv_batch(
+    files: List[UploadFile] = File(...),
+    industry: Optional[str] = Form(None),
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    supabase: ScopedSupabaseClient = Depends(get_user_supabase_client),
+    service: ProcessMiningService = Depends(get_process_mining_service),
+) -> Dict[str, Any]:
+    """
+    Upload several CSV files at once
+
+    Files are streamed to storage concurrently (at most UPLOAD_CONCURRENCY at
+    a time) and their rows inserted with a single query. Files that fail are
+    reported in errors; the others are still stored. If the insert fails,
+    the objects of every file in the batch are removed.
+    """
+    user_id = current_user["id"]
+    if len(files) > Uploads.MAX_BATCH_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {Uploads.MAX_BATCH_FILES} files can be uploaded at once",
+        )
+
+    semaphore = asyncio.Semaphore(settings.UPLOAD_CONCURRENCY)
+
+    async def store(file: UploadFile) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                return await _store_upload(file, industry, current_user, supabase)
+            finally:
+                await file.close()
+
+    try:
+        outcomes = await asyncio.gather(
+            *(store(file) for file in files), return_exceptions=True
+        )
+        rows: List[Dict[str, Any]] = []
+        errors: List[Dict[str, Any]] = []
+        for file, outcome in zip(files, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(
+                    "Upload of %s failed for user %s: %s",
+                    file.filename,
+                    user_id,
+                    outcome,
+                    exc_info=outcome,
+                )
+                errors.append({"file_name": file.filename, "detail": str(outcome)})
+            elif not isinstance(outcome, BaseException):
+                rows.append(outcome)
+
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException) and not isinstance(
+                outcome, Exception
+            ):
+                # The stored files will not get rows, so drop their objects
+                await _remove_objects(supabase, _object_paths(rows))
+                raise outcome
+
+        data: List[Dict[str, Any]] = []
+        if rows:
+            data = await _insert_uploads(supabase, rows)
+            service.invalidate_user(user_id)
+
+        logger.info("User %s uploaded %d of %d files", user_id, len(data), len(files))
         return {
-            "success": True,
-            "data": db_response.data[0]
+            "success": not errors,
+            "data": data,
+            "errors": errors,
         }
-        
+
     except Exception as e:
-        logger.error(f"Upload failed for user {current_user.get('id')} - Error: {str(e)}", exc_info=True)
+        logger.error(
+            "Batch upload failed for user %s - Error: %s",
+            user_id,
+            e,
+            exc_info=True,
+        )
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
-    
-    finally:
-        await file.close()
@@ -5,16 +5,37 @@ This module provides REST API endpoints for process mining data.
 """
 
 import logging
-from typing import Optional
+from typing import Any, Dict, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 
-from src.api.dependencies import get_current_user
+from src.api.conditional import (
+    dataset_etag,
+    is_not_modified,
+    not_modified,
+    set_cache_headers,
+)
+from src.api.dependencies import (
+    get_current_user,
+    get_process_mining_service,
+    get_user_supabase_client,
+)
+from src.api.graph_payload import (
+    MSGPACK_MEDIA_TYPE,
+    accepts_msgpack,
+    msgpack_response,
+)
+from src.api.streaming import stream_model
+from src.core.supabase_client import ScopedSupabaseClient
 from src.models.process_mining import (
+    AnalysisJobRequest,
+    AnalysisJobResponse,
     CaseRootsResponse,
     OverallMetricsModel,
     ProcessDetailResponse,
     ProcessMiningDataResponse,
+    ProcessVariantsResponse,
+    SchemaResponse,
 )
 from src.services.process_mining_service import ProcessMiningService
 
@@ -22,31 +43,36 @@ router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-def get_process_mining_service() -> ProcessMiningService:
-    """
-    Dependency for process mining service
-
-    Returns:
-        ProcessMiningService instance
-    """
-    return ProcessMiningService()
-
-
-@router.get("/data", response_model=ProcessMiningDataResponse)
+@router.get(
+    "/data",
+    response_model=ProcessMiningDataResponse,
+    responses={200: {"content": {MSGPACK_MEDIA_TYPE: {}}}},
+)
 async def get_process_mining_data(
     time_period: Optional[str] = None,
     industry: Optional[str] = None,
+    accept: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
     service: ProcessMiningService = Depends(get_process_mining_service),
-    current_user: dict = Depends(get_current_user),
-) -> ProcessMiningDataResponse:
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    supabase: ScopedSupabaseClient = Depends(get_user_supabase_client),
+) -> Response:
     """
     Get complete process mining data for dashboard
 
+    The data is produced by the service, so it is streamed as JSON without
+    re-validating it against the response model. Clients accepting
+    application/msgpack get the compact binary payload with columnar graphs.
+    A current If-None-Match ETag is answered with 304 before computing.
+
     Args:
         time_period: Optional time period filter (e.g., Q4-2025)
         industry: Optional industry filter
+        accept: Accept header, selecting JSON or MessagePack
+        if_none_match: ETag of the client's cached copy
         service: Injected process mining service
         current_user: Current authenticated user
+        supabase: Supabase client scoped to the current user
 
     Returns:
         Complete process mining data
@@ -56,25 +82,51 @@ async def get_process_mining_data(
     """
     try:
         logger.info(
-            f"User {current_user.get('id')} fetching process mining data: "
-            f"time_period={time_period}, industry={industry}"
+            "User %s fetching process mining data: time_period=%s, industry=%s",
+            current_user["id"],
+            time_period,
+            industry,
         )
 
-        data = await service.get_process_data(time_period=time_period, industry=industry)
+        binary = accepts_msgpack(accept)
+        version = await service.get_dataset_version(current_user["id"], supabase)
+        etag = dataset_etag(
+            current_user["id"], version, "data", time_period, industry, binary
+        )
+        if is_not_modified(if_none_match, etag):
+            return not_modified(etag, vary="Accept")
+
+        data = await service.get_process_data(
+            time_period=time_period,
+            industry=industry,
+            user_id=current_user["id"],
+            supabase=supabase,
+        )
 
-        logger.debug(f"Successfully retrieved process mining data for user {current_user.get('id')}")
+        logger.debug(
+            "Successfully retrieved process mining data for user %s",
+            current_user["id"],
+        )
 
-        return ProcessMiningDataResponse(**data)
+        if binary:
+            response = await msgpack_response(data, ProcessMiningDataResponse)
+        else:
+            response = stream_model(data, ProcessMiningDataResponse)
+        response.headers["Vary"] = "Accept"
+        set_cache_headers(response, etag)
+        return response
 
     except ValueError as e:
-        logger.warning(f"Invalid parameters for user {current_user.get('id')}: {str(e)}")
+        logger.warning("Invalid parameters for user %s: %s", current_user["id"], e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
     except Exception as e:
         logger.error(
-            f"Failed to fetch process mining data for user {current_user.get('id')}: {str(e)}",
+            "Failed to fetch process mining data for user %s: %s",
+            current_user["id"],
+            e,
             exc_info=True,
         )
         raise HTTPException(
@@ -83,19 +135,29 @@ async def get_process_mining_data(
         )
 
 
-@router.get("/processes/{process_id}", response_model=ProcessDetailResponse)
+@router.get(
+    "/processes/{process_id}",
+    response_model=ProcessDetailResponse,
+    responses={200: {"content": {MSGPACK_MEDIA_TYPE: {}}}},
+)
 async def get_process_details(
     process_id: str,
+    accept: Optional[str] = Header(None),
     service: ProcessMiningService = Depends(get_process_mining_service),
-    current_user: dict = Depends(get_current_user),
-) -> ProcessDetailResponse:
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    supabase: ScopedSupabaseClient = Depends(get_user_supabase_client),
+) -> Response:
     """
     Get detailed information about a specific process
 
+    Clients accepting application/msgpack get the compact binary payload.
+
     Args:
         process_id: Process identifier
+        accept: Accept header, selecting JSON or MessagePack
         service: Injected process mining service
         current_user: Current authenticated user
+        supabase: Supabase client scoped to the current user
 
     Returns:
         Detailed process information
@@ -104,27 +166,43 @@ async def get_process_details(
         HTTPException: If process not found or retrieval fails
     """
     try:
-        logger.info(f"User {current_user.get('id')} fetching process: {process_id}")
+        logger.info("User %s fetching process: %s", current_user["id"], process_id)
 
-        process = await service.get_process_by_id(process_id)
+        process = await service.get_process_by_id(
+            process_id, user_id=current_user["id"], supabase=supabase
+        )
 
         if not process:
-            logger.warning(f"Process not found for user {current_user.get('id')}: {process_id}")
+            logger.warning(
+                "Process not found for user %s: %s", current_user["id"], process_id
+            )
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Process '{process_id}' not found",
             )
 
-        logger.debug(f"Successfully retrieved process {process_id} for user {current_user.get('id')}")
+        logger.debug(
+            "Successfully retrieved process %s for user %s",
+            process_id,
+            current_user["id"],
+        )
 
-        return ProcessDetailResponse(**process)
+        if accepts_msgpack(accept):
+            response = await msgpack_response(process, ProcessDetailResponse)
+        else:
+            response = stream_model(process, ProcessDetailResponse)
+        response.headers["Vary"] = "Accept"
+        return response
 
     except HTTPException:
         # Re-raise HTTP exceptions
         raise
     except Exception as e:
         logger.error(
-            f"Failed to fetch process {process_id} for user {current_user.get('id')}: {str(e)}",
+            "Failed to fetch process %s for user %s: %s",
+            process_id,
+            current_user["id"],
+            e,
             exc_info=True,
         )
         raise HTTPException(
@@ -133,43 +211,133 @@ async def get_process_details(
         )
 
 
+@router.get("/processes/{process_id}/variants", response_model=ProcessVariantsResponse)
+async def get_process_variants(
+    process_id: str,
+    limit: int = Query(10, ge=1, le=1000),
+    service: ProcessMiningService = Depends(get_process_mining_service),
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    supabase: ScopedSupabaseClient = Depends(get_user_supabase_client),
+) -> ProcessVariantsResponse:
+    """
+    Get the most frequent variants (activity sequences) of a process
+
+    Args:
+        process_id: Process identifier
+        limit: Maximum number of variants to return
+        service: Injected process mining service
+        current_user: Current authenticated user
+        supabase: Supabase client scoped to the current user
+
+    Returns:
+        Top variants with their frequencies and cycle times
+
+    Raises:
+        HTTPException: If process not found or retrieval fails
+    """
+    try:
+        logger.info(
+            "User %s fetching variants of process: %s",
+            current_user["id"],
+            process_id,
+        )
+
+        variants = await service.get_process_variants(
+            process_id, limit, user_id=current_user["id"], supabase=supabase
+        )
+
+        if not variants:
+            logger.warning(
+                "Process not found for user %s: %s", current_user["id"], process_id
+            )
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Process '{process_id}' not found",
+            )
+
+        return ProcessVariantsResponse(**variants)
+
+    except HTTPException:
+        # Re-raise HTTP exceptions
+        raise
+    except Exception as e:
+        logger.error(
+            "Failed to fetch variants of %s for user %s: %s",
+            process_id,
+            current_user["id"],
+            e,
+            exc_info=True,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve process variants",
+        )
+
+
 @router.get("/case-roots", response_model=CaseRootsResponse)
 async def get_case_roots(
+    response: Response,
     time_period: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
     service: ProcessMiningService = Depends(get_process_mining_service),
-    current_user: dict = Depends(get_current_user),
-) -> CaseRootsResponse:
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    supabase: ScopedSupabaseClient = Depends(get_user_supabase_client),
+) -> Union[CaseRootsResponse, Response]:
     """
     Get case roots summary for pie chart visualization
 
+    A current If-None-Match ETag is answered with 304 before computing.
+
     Args:
+        response: Outgoing response, for the cache headers
         time_period: Optional time period filter
+        if_none_match: ETag of the client's cached copy
         service: Injected process mining service
         current_user: Current authenticated user
+        supabase: Supabase client scoped to the current user
 
     Returns:
-        Case roots summary with total cases count
+        Case roots summary with total cases count, or 304 Not Modified
 
     Raises:
         HTTPException: If data retrieval fails
     """
     try:
         logger.info(
-            f"User {current_user.get('id')} fetching case roots: time_period={time_period}"
+            "User %s fetching case roots: time_period=%s",
+            current_user["id"],
+            time_period,
         )
 
-        data = await service.get_case_roots(time_period=time_period)
+        version = await service.get_dataset_version(current_user["id"], supabase)
+        etag = dataset_etag(current_user["id"], version, "case-roots", time_period)
+        if is_not_modified(if_none_match, etag):
+            return not_modified(etag)
+
+        data = await service.get_case_roots(
+            time_period=time_period, user_id=current_user["id"], supabase=supabase
+        )
 
         logger.debug(
-            f"Successfully retrieved {len(data['case_roots'])} case roots "
-            f"for user {current_user.get('id')}"
+            "Successfully retrieved %d case roots for user %s",
+            len(data["case_roots"]),
+            current_user["id"],
         )
 
+        set_cache_headers(response, etag)
         return CaseRootsResponse(**data)
 
+    except ValueError as e:
+        logger.warning("Invalid parameters for user %s: %s", current_user["id"], e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
     except Exception as e:
         logger.error(
-            f"Failed to fetch case roots for user {current_user.get('id')}: {str(e)}",
+            "Failed to fetch case roots for user %s: %s",
+            current_user["id"],
+            e,
             exc_info=True,
         )
         raise HTTPException(
@@ -180,37 +348,253 @@ async def get_case_roots(
 
 @router.get("/metrics", response_model=OverallMetricsModel)
 async def get_overall_metrics(
+    response: Response,
+    time_period: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
     service: ProcessMiningService = Depends(get_process_mining_service),
-    current_user: dict = Depends(get_current_user),
-) -> OverallMetricsModel:
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    supabase: ScopedSupabaseClient = Depends(get_user_supabase_client),
+) -> Union[OverallMetricsModel, Response]:
     """
     Get overall process metrics for KPI cards
 
+    A current If-None-Match ETag is answered with 304 before computing.
+
     Args:
+        response: Outgoing response, for the cache headers
+        time_period: Optional time period filter (e.g., Q4-2025)
+        if_none_match: ETag of the client's cached copy
         service: Injected process mining service
         current_user: Current authenticated user
+        supabase: Supabase client scoped to the current user
 
     Returns:
-        Overall metrics data
+        Overall metrics data, or 304 Not Modified
 
     Raises:
         HTTPException: If data retrieval fails
     """
     try:
-        logger.info(f"User {current_user.get('id')} fetching overall metrics")
+        logger.info(
+            "User %s fetching overall metrics: time_period=%s",
+            current_user["id"],
+            time_period,
+        )
+
+        version = await service.get_dataset_version(current_user["id"], supabase)
+        etag = dataset_etag(current_user["id"], version, "metrics", time_period)
+        if is_not_modified(if_none_match, etag):
+            return not_modified(etag)
 
-        metrics = await service.get_overall_metrics()
+        metrics = await service.get_overall_metrics(
+            user_id=current_user["id"], supabase=supabase, time_period=time_period
+        )
 
-        logger.debug(f"Successfully retrieved overall metrics for user {current_user.get('id')}")
+        logger.debug(
+            "Successfully retrieved overall metrics for user %s", current_user["id"]
+        )
 
+        set_cache_headers(response, etag)
         return OverallMetricsModel(**metrics)
 
+    except ValueError as e:
+        logger.warning("Invalid parameters for user %s: %s", current_user["id"], e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
     except Exception as e:
         logger.error(
-            f"Failed to fetch metrics for user {current_user.get('id')}: {str(e)}",
+            "Failed to fetch metrics for user %s: %s",
+            current_user["id"],
+            e,
             exc_info=True,
         )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve overall metrics",
         )
+
+
+@router.get("/schema", response_model=SchemaResponse)
+async def get_schema(
+    service: ProcessMiningService = Depends(get_process_mining_service),
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    supabase: ScopedSupabaseClient = Depends(get_user_supabase_client),
+) -> SchemaResponse:
+    """
+    Get the keys and joins inferred across the user's uploaded tables
+
+    Args:
+        service: Injected process mining service
+        current_user: Current authenticated user
+        supabase: Supabase client scoped to the current user
+
+    Returns:
+        Inferred tables and joins
+
+    Raises:
+        HTTPException: If schema inference fails
+    """
+    try:
+        logger.info("User %s fetching inferred schema", current_user["id"])
+
+        schema = await service.get_schema(current_user["id"], supabase)
+
+        logger.debug(
+            "Inferred %d joins for user %s",
+            len(schema["joins"]),
+            current_user["id"],
+        )
+
+        return SchemaResponse(**schema)
+
+    except Exception as e:
+        logger.error(
+            "Failed to infer schema for user %s: %s",
+            current_user["id"],
+            e,
+            exc_info=True,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to infer schema",
+        )
+
+
+@router.post(
+    "/jobs",
+    response_model=AnalysisJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def submit_analysis_job(
+    request: AnalysisJobRequest,
+    service: ProcessMiningService = Depends(get_process_mining_service),
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    supabase: ScopedSupabaseClient = Depends(get_user_supabase_client),
+) -> AnalysisJobResponse:
+    """
+    Queue a background analysis of an uploaded file
+
+    Args:
+        request: File to analyze and optional time period filter
+        service: Injected process mining service
+        current_user: Current authenticated user
+        supabase: Supabase client scoped to the current user
+
+    Returns:
+        Status of the queued job; poll /jobs/{job_id} for progress
+
+    Raises:
+        HTTPException: If the file is not found or the job cannot be queued
+    """
+    try:
+        logger.info(
+            "User %s submitting analysis job: file_id=%s, time_period=%s",
+            current_user["id"],
+            request.file_id,
+            request.time_period,
+        )
+
+        job = await service.submit_analysis_job(
+            request.file_id,
+            user_id=current_user["id"],
+            supabase=supabase,
+            time_period=request.time_period,
+        )
+
+        if job is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"File '{request.file_id}' not found",
+            )
+
+        return AnalysisJobResponse(**job)
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.warning("Invalid parameters for user %s: %s", current_user["id"], e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except Exception as e:
+        logger.error(
+            "Failed to submit analysis job for user %s: %s",
+            current_user["id"],
+            e,
+            exc_info=True,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to submit analysis job",
+        )
+
+
+@router.get("/jobs/{job_id}", response_model=AnalysisJobResponse)
+async def get_analysis_job(
+    job_id: str,
+    service: ProcessMiningService = Depends(get_process_mining_service),
+    current_user: Dict[str, Any] = Depends(get_current_user),
+) -> AnalysisJobResponse:
+    """
+    Get the status and progress of a background analysis job
+
+    Args:
+        job_id: Job identifier
+        service: Injected process mining service
+        current_user: Current authenticated user
+
+    Returns:
+        Job status
+
+    Raises:
+        HTTPException: If the job is not found
+    """
+    job = await service.jobs.get(job_id, current_user["id"])
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job '{job_id}' not found",
+        )
+
+    return AnalysisJobResponse(**job)
+
+
+@router.get("/jobs/{job_id}/result", response_model=ProcessMiningDataResponse)
+async def get_analysis_job_result(
+    job_id: str,
+    service: ProcessMiningService = Depends(get_process_mining_service),
+    current_user: Dict[str, Any] = Depends(get_current_user),
+) -> Response:
+    """
+    Get the process mining data computed by a completed job
+
+    Args:
+        job_id: Job identifier
+        service: Injected process mining service
+        current_user: Current authenticated user
+
+    Returns:
+        Complete process mining data
+
+    Raises:
+        HTTPException: If the job is not found or has not completed
+    """
+    job = await service.jobs.get(job_id, current_user["id"])
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job '{job_id}' not found",
+        )
+
+    result = await service.jobs.result(job_id, current_user["id"])
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job '{job_id}' is {job['status']}"
+            + (f": {job['error']}" if job["error"] else ""),
+        )
+
+    return stream_model(result, ProcessMiningDataResponse)
@@ -0,0 +1,180 @@
+"""
+Compact Binary Graph Payload
+
+This module encodes process mining responses as MessagePack for clients that
+send ``Accept: application/msgpack``. The document mirrors the JSON response,
+except that every process graph is columnar:
+
+* ``node_ids``: dictionary of node names; edges refer to nodes by index
+* ``edges``: one little-endian binary column per edge field (``from`` and
+  ``to`` as uint32 node indices, metrics as float64 with NaN for missing
+  values), which the frontend maps straight onto typed arrays
+* ``join_columns``: distinct join column mappings, referenced per edge by
+  ``join_offsets`` / ``join_indices`` (CSR layout)
+
+``edge_ids`` is omitted when every edge id is ``"{from}->{to}"``.
+
+Encoding is CPU-bound, so responses are encoded on the thread pool, like the
+chunks of streamed JSON responses.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Type
+
+import msgpack
+import numpy as np
+from fastapi import Response
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+
+from src.api.streaming import project
+from src.core.metrics import observe_stage
+from src.models.process_mining import JoinColumnModel, NodeModel, ProcessModel
+
+logger = logging.getLogger(__name__)
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Media types accepted as a request for the binary payload
+_MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+# Float64 edge columns, in wire order
+_EDGE_METRICS = (
+    "frequency",
+    "probability",
+    "average_transition_time_mins",
+    "median_transition_time_mins",
+    "p95_transition_time_mins",
+)
+
+
+def accepts_msgpack(accept: Optional[str]) -> bool:
+    """
+    Whether an Accept header asks for the binary payload
+
+    Args:
+        accept: Accept header value
+
+    Returns:
+        True if a MessagePack media type is listed
+    """
+    if not accept:
+        return False
+    media_types = (part.split(";", 1)[0].strip().lower() for part in accept.split(","))
+    return any(media_type in _MSGPACK_MEDIA_TYPES for media_type in media_types)
+
+
+def _column(values: List[Any], dtype: str) -> bytes:
+    """Little-endian bytes of a numeric column (None becomes NaN)"""
+    return np.array(
+        [np.nan if value is None else value for value in values], dtype=dtype
+    ).tobytes()
+
+
+def compact_graph(graph: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Encode a process graph in columnar form
+
+    Args:
+        graph: Graph dictionary with nodes and edges (as produced by the engine)
+
+    Returns:
+        Columnar graph dictionary, ready for MessagePack
+    """
+    nodes = [project(node, NodeModel) for node in graph["nodes"]]
+    node_index = {node["node_id"]: index for index, node in enumerate(nodes)}
+    node_ids = list(node_index)
+    edges = graph["edges"]
+
+    def index_of(name: str) -> int:
+        # Edges may reference nodes missing from the node list
+        if name not in node_index:
+            node_index[name] = len(node_ids)
+            node_ids.append(name)
+        return node_index[name]
+
+    sources = [index_of(edge["from"]) for edge in edges]
+    targets = [index_of(edge["to"]) for edge in edges]
+
+    join_columns: Dict[tuple[str, str], int] = {}
+    join_offsets = [0]
+    join_indices = []
+    for edge in edges:
+        for join in edge.get("join_columns") or ():
+            key = (join["from_column"], join["to_column"])
+            join_indices.append(join_columns.setdefault(key, len(join_columns)))
+        join_offsets.append(len(join_indices))
+
+    columns = {
+        "from": np.array(sources, dtype="<u4").tobytes(),
+        "to": np.array(targets, dtype="<u4").tobytes(),
+    }
+    for metric in _EDGE_METRICS:
+        columns[metric] = _column([edge.get(metric) for edge in edges], "<f8")
+
+    edge_ids = [edge["edge_id"] for edge in edges]
+    derived = all(
+        edge_id == f"{edge['from']}->{edge['to']}"
+        for edge_id, edge in zip(edge_ids, edges)
+    )
+
+    return {
+        "node_ids": node_ids,
+        "nodes": nodes,
+        "edge_count": len(edges),
+        "edge_ids": None if derived else edge_ids,
+        "edges": columns,
+        "join_columns": [
+            project({"from_column": source, "to_column": target}, JoinColumnModel)
+            for source, target in join_columns
+        ],
+        "join_offsets": np.array(join_offsets, dtype="<u4").tobytes(),
+        "join_indices": np.array(join_indices, dtype="<u4").tobytes(),
+    }
+
+
+def _compact_process(process: Dict[str, Any], model: Type[BaseModel]) -> Dict[str, Any]:
+    """Project a process onto its model, with a columnar graph"""
+    compact = project({k: v for k, v in process.items() if k != "graph"}, model)
+    compact["graph"] = compact_graph(process["graph"])
+    return compact
+
+
+def encode_msgpack(data: Dict[str, Any], model: Type[BaseModel]) -> bytes:
+    """
+    Encode trusted response data as the compact MessagePack payload
+
+    Args:
+        data: Process mining data, or a single process
+        model: Response model of the endpoint (ProcessMiningDataResponse or
+            ProcessDetailResponse)
+
+    Returns:
+        MessagePack document
+    """
+    with observe_stage("serialization"):
+        if "graph" in data:
+            document = _compact_process(data, model)
+        else:
+            document = project({**data, "processes": []}, model)
+            document["processes"] = [
+                _compact_process(process, ProcessModel) for process in data["processes"]
+            ]
+        content: bytes = msgpack.packb(document, use_bin_type=True)
+    logger.debug("Encoded %d byte MessagePack payload", len(content))
+    return content
+
+
+async def msgpack_response(data: Dict[str, Any], model: Type[BaseModel]) -> Response:
+    """
+    MessagePack response of trusted data, encoded off the event loop
+
+    Args:
+        data: Process mining data, or a single process
+        model: Response model of the endpoint
+
+    Returns:
+        application/msgpack response
+    """
+    content = await run_in_threadpool(encode_msgpack, data, model)
+    return Response(content=content, media_type=MSGPACK_MEDIA_TYPE)
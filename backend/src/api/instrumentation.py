@@ -0,0 +1,59 @@
+"""
+Request Instrumentation
+
+Pure ASGI middleware recording the latency, in-flight count and status of
+every HTTP request per route template (e.g. /api/v1/process-mining/processes/
+{process_id}), so streamed responses are timed until their last chunk and path
+parameters do not multiply the metric series.
+"""
+
+import time
+from typing import Any, Dict
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.metrics import REQUEST_LATENCY, REQUESTS, REQUESTS_IN_PROGRESS
+
+# Route label of requests that match no route
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """Record per-route request metrics"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    def _route(self, scope: Scope) -> str:
+        """Path template of the route a request is dispatched to"""
+        router = scope["app"].router
+        for route in router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(route, "path", UNMATCHED_ROUTE)
+        return UNMATCHED_ROUTE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self._route(scope)
+        response: Dict[str, Any] = {"status": 500}
+
+        async def send_with_status(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method, route)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUEST_LATENCY.labels(method, route).observe(time.perf_counter() - start)
+            REQUESTS.labels(method, route, str(response["status"])).inc()
+            in_progress.dec()
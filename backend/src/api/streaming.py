@@ -0,0 +1,207 @@
+"""
+Streaming JSON Responses
+
+This module serializes trusted internal data (engine output and cached
+results) straight to JSON with orjson, shaped by the endpoint's response
+model but without building and re-validating a Pydantic tree. Lists of more
+than STREAM_BATCH_ITEMS items, such as the edges of a large process graph, are
+encoded and sent one batch at a time, so the first byte leaves before the
+whole document is serialized and no second copy of it is held in memory.
+"""
+
+import functools
+import logging
+import time
+from collections.abc import Iterator
+from typing import Any, Dict, List, Optional, Tuple, Type, Union, get_args, get_origin
+
+import orjson
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from src.core.constants import ProcessMining
+from src.core.metrics import STAGE_LATENCY
+
+logger = logging.getLogger(__name__)
+
+# (encoded key, key, input name, default, nested model, is list) per field
+_Field = Tuple[bytes, str, str, Any, Optional[Type[BaseModel]], bool]
+
+
+def _dumps(value: Any) -> bytes:
+    """Encode a JSON value"""
+    return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def _nested_model(annotation: Any) -> Tuple[Optional[Type[BaseModel]], bool]:
+    """Model nested in a field annotation (Model, List[Model], Optional[...])"""
+    is_list = False
+    if get_origin(annotation) is Union:
+        annotation = next(arg for arg in get_args(annotation) if arg is not type(None))
+    if get_origin(annotation) in (list, List):
+        (annotation,) = get_args(annotation)
+        is_list = True
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, is_list
+    return None, False
+
+
+@functools.cache
+def _layout(model: Type[BaseModel]) -> Tuple[_Field, ...]:
+    """Serialized fields of a response model, in declaration order"""
+    fields = []
+    for name, field in model.model_fields.items():
+        key = field.alias or name
+        default = None
+        if not field.is_required():
+            default = field.get_default(call_default_factory=True)
+        nested, is_list = _nested_model(field.annotation)
+        fields.append((_dumps(key), key, name, default, nested, is_list))
+    return tuple(fields)
+
+
+def _value(data: Dict[str, Any], field: _Field) -> Any:
+    """Value of a field in a data dictionary, by alias or by name"""
+    _, key, name, default, _, _ = field
+    if key in data:
+        return data[key]
+    return data.get(name, default)
+
+
+def project(data: Dict[str, Any], model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Shape trusted data like a response model, without validating it
+
+    Args:
+        data: Data dictionary (keys by alias or by field name)
+        model: Response model
+
+    Returns:
+        Dictionary with the model's fields by alias, defaults filled in and
+        unknown keys dropped, recursively
+    """
+    projected = {}
+    for _, key, name, default, nested, is_list in _layout(model):
+        value = data[key] if key in data else data.get(name, default)
+        if nested is not None and value is not None:
+            if is_list:
+                value = [project(item, nested) for item in value]
+            else:
+                value = project(value, nested)
+        projected[key] = value
+    return projected
+
+
+def _convert(value: Any, model: Optional[Type[BaseModel]], is_list: bool) -> Any:
+    """Project a field value onto its nested model, if any"""
+    if model is None or value is None:
+        return value
+    if is_list:
+        return [project(item, model) for item in value]
+    return project(value, model)
+
+
+def _is_large(value: Any, model: Optional[Type[BaseModel]], is_list: bool) -> bool:
+    """Whether a field value holds a list worth streaming in batches"""
+    if model is None or value is None:
+        return False
+    if is_list:
+        return len(value) > ProcessMining.STREAM_BATCH_ITEMS or any(
+            _is_large_model(item, model) for item in value
+        )
+    return _is_large_model(value, model)
+
+
+def _is_large_model(data: Dict[str, Any], model: Type[BaseModel]) -> bool:
+    """Whether any nested field of a model instance is large"""
+    return any(
+        _is_large(_value(data, field), field[4], field[5])
+        for field in _layout(model)
+        if field[4] is not None
+    )
+
+
+def iter_json(data: Dict[str, Any], model: Type[BaseModel]) -> Iterator[bytes]:
+    """
+    Encode trusted data as JSON shaped like a model, chunk by chunk
+
+    Args:
+        data: Data dictionary
+        model: Model the JSON is shaped like
+
+    Yields:
+        JSON chunks; large fields span several chunks
+    """
+    chunk = bytearray(b"{")
+    for position, field in enumerate(_layout(model)):
+        if position:
+            chunk += b","
+        chunk += field[0] + b":"
+        value = _value(data, field)
+        nested, is_list = field[4], field[5]
+        if nested is not None and _is_large(value, nested, is_list):
+            yield bytes(chunk)
+            chunk = bytearray()
+            if is_list:
+                yield from _iter_list(value, nested)
+            else:
+                yield from iter_json(value, nested)
+        else:
+            chunk += _dumps(_convert(value, nested, is_list))
+    chunk += b"}"
+    yield bytes(chunk)
+
+
+def _iter_list(items: List[Dict[str, Any]], model: Type[BaseModel]) -> Iterator[bytes]:
+    """Encode a list of model instances in batches"""
+    batch = ProcessMining.STREAM_BATCH_ITEMS
+    if len(items) <= batch:
+        # Few items, at least one of them large: stream item by item
+        yield b"["
+        for position, item in enumerate(items):
+            if position:
+                yield b","
+            yield from iter_json(item, model)
+        yield b"]"
+        return
+
+    for start in range(0, len(items), batch):
+        yield (b"[" if start == 0 else b",") + b",".join(
+            _dumps(project(item, model)) for item in items[start : start + batch]
+        )
+    yield b"]"
+
+
+def _timed(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Record the time spent encoding chunks, excluding the time to send them"""
+    elapsed = 0.0
+    try:
+        while True:
+            start = time.perf_counter()
+            chunk = next(chunks, None)
+            elapsed += time.perf_counter() - start
+            if chunk is None:
+                return
+            yield chunk
+    finally:
+        STAGE_LATENCY.labels("serialization").observe(elapsed)
+
+
+def stream_model(data: Dict[str, Any], model: Type[BaseModel]) -> StreamingResponse:
+    """
+    Stream trusted data as JSON shaped like a response model
+
+    Fields are emitted by alias with their defaults filled in and unknown keys
+    dropped, as FastAPI would after validating against ``response_model``, but
+    values are not validated: only use this for data the service produced.
+
+    Args:
+        data: Response data (plain dictionaries and lists)
+        model: Response model of the endpoint
+
+    Returns:
+        Streaming application/json response
+    """
+    return StreamingResponse(
+        _timed(iter_json(data, model)), media_type="application/json"
+    )
@@ -31,13 +31,39 @@ class Settings(BaseSettings):
     SUPABASE_SERVICE_KEY: str = ""
     SUPABASE_ANON_KEY: str = ""
     SUPABASE_JWT_SECRET: str = ""
+    SUPABASE_MAX_WORKERS: int = Defaults.SUPABASE_MAX_WORKERS
+    SUPABASE_MAX_CONNECTIONS: int = Defaults.SUPABASE_MAX_CONNECTIONS
 
     # Application settings
     DEBUG: bool = Defaults.DEBUG
     TESTING: bool = Defaults.TESTING
     LOG_LEVEL: str = Defaults.LOG_LEVEL
+    LOG_FORMAT: str = Defaults.LOG_FORMAT
+    LOG_SAMPLE_RATE: float = Defaults.LOG_SAMPLE_RATE
     USE_GSM: bool = Defaults.USE_GSM
 
+    # Authentication
+    AUTH_MODE: str = Defaults.AUTH_MODE
+    AUTH_REVOCATION_CHECK: bool = Defaults.AUTH_REVOCATION_CHECK
+    AUTH_REVOCATION_CHECK_INTERVAL_SECONDS: int = (
+        Defaults.AUTH_REVOCATION_CHECK_INTERVAL_SECONDS
+    )
+    AUTH_CACHE_ENABLED: bool = Defaults.AUTH_CACHE_ENABLED
+    AUTH_CACHE_MAX_SIZE: int = Defaults.AUTH_CACHE_MAX_SIZE
+    AUTH_CACHE_TTL_SECONDS: int = Defaults.AUTH_CACHE_TTL_SECONDS
+
+    # Process mining
+    EVENT_LOG_CACHE_DIR: str = Defaults.EVENT_LOG_CACHE_DIR
+    EVENT_LOG_CACHE_MAX_BYTES: int = Defaults.EVENT_LOG_CACHE_MAX_BYTES
+    RESULT_CACHE_MAX_ENTRIES: int = Defaults.RESULT_CACHE_MAX_ENTRIES
+    LOADED_EVENT_LOGS_MAX: int = Defaults.LOADED_EVENT_LOGS_MAX
+    DISCOVERY_WORKERS: int = Defaults.DISCOVERY_WORKERS
+    JOB_WORKERS: int = Defaults.JOB_WORKERS
+    JOB_STORE_PATH: str = Defaults.JOB_STORE_PATH
+    JOB_RETENTION_SECONDS: int = Defaults.JOB_RETENTION_SECONDS
+    JOB_RETENTION_MAX: int = Defaults.JOB_RETENTION_MAX
+    UPLOAD_CONCURRENCY: int = Defaults.UPLOAD_CONCURRENCY
+
     model_config = {"env_file": ".env", "case_sensitive": True}
 
 
@@ -42,6 +42,54 @@ class Defaults:
 
     # Logging
     LOG_LEVEL = "INFO"
+    LOG_FORMAT = "text"
+
+    # Fraction of routine (INFO and below) per-request logs kept (1: all)
+    LOG_SAMPLE_RATE = 1.0
+
+    # Authentication: "local" verifies JWTs in-process, "remote" asks Supabase
+    AUTH_MODE = "local"
+    AUTH_REVOCATION_CHECK = False
+    AUTH_REVOCATION_CHECK_INTERVAL_SECONDS = 300
+
+    # Remote-mode cache of validated users, keyed by token hash
+    AUTH_CACHE_ENABLED = True
+    AUTH_CACHE_MAX_SIZE = 10_000
+    AUTH_CACHE_TTL_SECONDS = 60
+
+    # Threads running blocking Supabase calls (storage, tables, auth)
+    SUPABASE_MAX_WORKERS = 16
+
+    # Keep-alive connections shared by per-user Supabase clients
+    SUPABASE_MAX_CONNECTIONS = 32
+
+    # Local cache for memory-mapped binary event logs (empty: ~/.cache/tessely)
+    EVENT_LOG_CACHE_DIR = ""
+
+    # Size above which least recently used cached event logs are deleted (0: none)
+    EVENT_LOG_CACHE_MAX_BYTES = 10 * 1024**3
+
+    # Cached process mining results (one per user, dataset and filter set)
+    RESULT_CACHE_MAX_ENTRIES = 256
+
+    # Event logs kept loaded (memory-mapped) between requests
+    LOADED_EVENT_LOGS_MAX = 128
+
+    # Processes sharing directly-follows discovery of large logs (1: in-process)
+    DISCOVERY_WORKERS = 1
+
+    # Files of a batch upload streamed to storage concurrently
+    UPLOAD_CONCURRENCY = 4
+
+    # Processes running background analysis jobs
+    JOB_WORKERS = 2
+
+    # SQLite file holding analysis job state (empty: in memory)
+    JOB_STORE_PATH = ""
+
+    # Finished analysis jobs are deleted after this age, and beyond this count
+    JOB_RETENTION_SECONDS = 24 * 60 * 60
+    JOB_RETENTION_MAX = 1000
 
     # Boolean defaults
     DEBUG = False
@@ -65,12 +113,95 @@ class Supabase:
     # User metadata fields
     FULL_NAME_FIELD = "full_name"
     COMPANY_FIELD = "company"
+    INDUSTRY_FIELD = "industry"
 
     # GSM secret path template
     SECRET_PATH_TEMPLATE = "projects/{project_id}/secrets/{secret_name}/versions/latest"
 
 
+class AuthModes:
+    """Supported authentication modes"""
+
+    LOCAL = "local"
+    REMOTE = "remote"
+
+
+class LogFormats:
+    """Supported log output formats"""
+
+    TEXT = "text"
+    JSON = "json"
+
+
 class OAuth:
     """OAuth provider constants"""
 
     GOOGLE = "google"
+
+
+class ProcessMining:
+    """Process mining constants"""
+
+    SCHEMA_VERSION = "1.1"
+    SOURCE_SYSTEM = "CSV Upload"
+    DEFAULT_INDUSTRY = "General"
+    DEFAULT_NODE_CATEGORY = "activity"
+
+    # Rows parsed and dictionary-encoded per batch when reading event logs
+    PARSE_BATCH_ROWS = 100_000
+
+    # Nodes or edges encoded per chunk when streaming JSON responses
+    STREAM_BATCH_ITEMS = 1000
+
+    # Accepted (case-insensitive) header names for the event log columns
+    CASE_COLUMN_ALIASES = ("case_id", "caseid", "case", "case:concept:name", "case id")
+    ACTIVITY_COLUMN_ALIASES = (
+        "activity",
+        "concept:name",
+        "event",
+        "activity_name",
+        "task",
+    )
+    TIMESTAMP_COLUMN_ALIASES = (
+        "timestamp",
+        "time:timestamp",
+        "event_time",
+        "start_time",
+        "time",
+        "date",
+    )
+
+
+class JobStatus:
+    """Lifecycle states of background analysis jobs"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class Uploads:
+    """CSV upload constants"""
+
+    # Storage bucket and table holding uploaded CSV files
+    BUCKET = "uploaded_csv_files"
+    TABLE = "uploaded_csv_files"
+    CONTENT_TYPE = "text/csv"
+
+    # Streaming ingestion
+    CHUNK_SIZE = 1024 * 1024
+    SNIFF_BYTES = 64 * 1024
+    SCHEMA_SAMPLE_ROWS = 100
+
+    # File listing: columns of the list view, page sizes and the cached count
+    LIST_COLUMNS = (
+        "id, file_name, file_url, uploaded_at, industry, size_bytes, row_count"
+    )
+    PAGE_SIZE = 50
+    MAX_PAGE_SIZE = 500
+    COUNT_CACHE_MAX_ENTRIES = 10_000
+    COUNT_CACHE_TTL_SECONDS = 60
+
+    # Files accepted by one batch upload or batch delete
+    MAX_BATCH_FILES = 500
@@ -0,0 +1,123 @@
+"""
+Logging Configuration
+
+Log records are put on an in-memory queue and formatted and written by a
+listener thread, so request handlers never block on formatting or stream I/O.
+Records travel unformatted: log with arguments rather than pre-built strings
+(``logger.debug("Loaded %d event logs", count)``), so nothing is formatted for
+disabled levels, and do not mutate logged arguments afterwards.
+
+Routine (INFO and below) records of the per-request hot-path loggers are kept
+with probability LOG_SAMPLE_RATE; warnings and errors are always kept.
+LOG_FORMAT=json writes one JSON object per line, including any fields passed
+with ``extra``.
+"""
+
+import atexit
+import logging
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+
+from src.core.constants import LogFormats
+
+# Loggers that log on every process mining or file listing request
+HOT_PATH_LOGGERS = (
+    "src.api.endpoints.process_mining",
+    "src.api.endpoints.csv_datasource",
+    "src.services.process_mining_service",
+)
+
+# LogRecord attributes; anything else on a record was passed with ``extra``
+_RECORD_ATTRIBUTES = frozenset(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", None, None))
+) | {"message", "asctime"}
+
+_listener: Optional[QueueListener] = None
+
+
+class DeferredQueueHandler(QueueHandler):
+    """Queue handler that leaves formatting to the listener thread"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue is in-process, so the record needs no pickling and the
+        # message and traceback can be rendered by the listener
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of the routine records of some loggers"""
+
+    def __init__(self, rate: float, loggers: Tuple[str, ...]) -> None:
+        """
+        Args:
+            rate: Fraction of INFO and lower records kept, from 0 to 1
+            loggers: Names of the sampled loggers (and their children)
+        """
+        super().__init__()
+        self.rate = rate
+        self.loggers = loggers
+        self.prefixes = tuple(f"{name}." for name in loggers)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate >= 1.0 or record.levelno >= logging.WARNING:
+            return True
+        name = record.name
+        if name not in self.loggers and not name.startswith(self.prefixes):
+            return True
+        return random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str).decode()
+
+
+def configure_logging(level: int, log_format: str, sample_rate: float) -> None:
+    """
+    Route all logging through a queue drained by a listener thread
+
+    Idempotent; the listener is stopped (and the queue flushed) at exit.
+
+    Args:
+        level: Root log level
+        log_format: "text" or "json"
+        sample_rate: Fraction of routine hot-path records kept
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    handler = logging.StreamHandler()
+    if log_format == LogFormats.JSON:
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(sample_rate, HOT_PATH_LOGGERS))
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(queue_handler)
+
+    _listener = QueueListener(log_queue, handler)
+    _listener.start()
+    atexit.register(_listener.stop)
@@ -51,3 +51,5 @@ class LogMessages:
     # JWT validation
     JWT_MISSING_SUB = "Token is valid but missing 'sub' claim"
     JWT_VALIDATION_FAILED = "JWT validation failed: {error}"
+    JWT_SECRET_MISSING = "SUPABASE_JWT_SECRET is not set, falling back to remote token validation"
+    TOKEN_REVOKED = "Token for user {user_id} was revoked upstream"
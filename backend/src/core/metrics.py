@@ -0,0 +1,110 @@
+"""
+Application Metrics
+
+This module defines the Prometheus metrics exposed on /metrics: request
+latency, in-flight requests and status counts per route (recorded by the
+middleware in src/api/instrumentation.py), and the time spent in the hot
+stages of a request:
+
+* auth: authenticating the bearer token (get_current_user)
+* supabase: blocking Supabase calls, including the wait for a pool thread
+* mining: process discovery, rollups and variants
+* serialization: encoding process mining responses
+
+Stages can nest (a remote auth check is also a Supabase call), so stage
+times are not additive.
+"""
+
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any, Dict
+
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+# Up to a minute: mining large event logs is far slower than a typical request
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+REQUEST_LATENCY = Histogram(
+    "tessely_http_request_duration_seconds",
+    "Time to handle a request, until the last body chunk is sent",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "tessely_http_requests_in_progress",
+    "Requests currently being handled",
+    ["method", "route"],
+)
+REQUESTS = Counter(
+    "tessely_http_requests",
+    "Handled requests by response status",
+    ["method", "route", "status"],
+)
+STAGE_LATENCY = Histogram(
+    "tessely_stage_duration_seconds",
+    "Time spent in a stage of request handling",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+@contextmanager
+def observe_stage(stage: str) -> Iterator[None]:
+    """
+    Record the duration of a block in the stage latency histogram
+
+    Args:
+        stage: Stage name (auth, supabase, mining or serialization)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_LATENCY.labels(stage).observe(time.perf_counter() - start)
+
+
+class CacheStatsCollector(Collector):
+    """Exports the counters of caches that keep a ``stats()`` dictionary"""
+
+    def __init__(self, caches: Dict[str, Callable[[], Dict[str, int]]]) -> None:
+        """
+        Args:
+            caches: stats() callable per cache name
+        """
+        self.caches = caches
+
+    def collect(self) -> Iterator[Any]:
+        """Current size and counters of every cache"""
+        size = GaugeMetricFamily(
+            "tessely_cache_entries", "Entries currently cached", labels=["cache"]
+        )
+        events = CounterMetricFamily(
+            "tessely_cache_events",
+            "Cache lookups and removals by outcome",
+            labels=["cache", "event"],
+        )
+        for name, stats in self.caches.items():
+            for event, value in stats().items():
+                if event == "size":
+                    size.add_metric([name], value)
+                else:
+                    events.add_metric([name, event], value)
+        yield size
+        yield events
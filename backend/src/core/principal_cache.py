@@ -0,0 +1,140 @@
+# @track_context("dependencies.md")
+
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from jose import JWTError, jwt
+
+from src.core.config import settings
+from src.core.single_flight import SingleFlight
+
+Principal = dict[str, Any]
+
+
+def token_hash(token: str) -> str:
+    """Hash a token so raw credentials are never used as cache keys"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def token_expiry(token: str) -> float | None:
+    """
+    Read the exp claim of a token without verifying it
+
+    Only used to cap cache lifetimes; the token itself is verified upstream.
+
+    Args:
+        token: JWT token string
+
+    Returns:
+        Expiry as epoch seconds, or None if the token has no readable exp
+    """
+    try:
+        exp = jwt.get_unverified_claims(token).get("exp")
+    except JWTError:
+        return None
+    return float(exp) if isinstance(exp, int | float) else None
+
+
+class PrincipalCache:
+    """
+    Bounded LRU + TTL cache of authenticated users keyed by token hash
+
+    Entries expire after the configured TTL or at the token's own expiry,
+    whichever comes first. Concurrent lookups of the same uncached token share
+    a single upstream call (single-flight).
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[Principal, float]] = OrderedDict()
+        self._loads: SingleFlight[str, Principal] = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    async def get_or_load(
+        self, token: str, loader: Callable[[], Awaitable[Principal]]
+    ) -> Principal:
+        """
+        Return the cached user for a token, loading it at most once
+
+        Args:
+            token: JWT token string
+            loader: Coroutine factory that validates the token upstream
+
+        Returns:
+            User dictionary
+
+        Raises:
+            Exception: Whatever the loader raises; failures are not cached
+        """
+        key = token_hash(token)
+        now = time.time()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            del self._entries[key]
+            self.expirations += 1
+
+        if key in self._loads:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+
+        async def load() -> Principal:
+            principal = await loader()
+            self._store(key, principal, token_expiry(token), now)
+            return principal
+
+        return await self._loads.run(key, load)
+
+    def invalidate(self, token: str) -> None:
+        """Drop the cached user of a token (e.g. after logout)"""
+        self._entries.pop(token_hash(token), None)
+
+    def clear(self) -> None:
+        """Drop all cached users"""
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Cache counters and current size"""
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _store(
+        self, key: str, principal: Principal, expires_at: float | None, now: float
+    ) -> None:
+        """Insert an entry, evicting least recently used entries beyond max_size"""
+        deadline = now + self.ttl_seconds
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        if deadline <= now or self.max_size <= 0:
+            return
+
+        self._entries[key] = (principal, deadline)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.AUTH_CACHE_MAX_SIZE,
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+)
@@ -33,7 +33,7 @@ def get_secret(secret_name: str, project_id: Optional[str] = None) -> str:
                     "GCP_PROJECT_ID must be set when using Google Secret Manager"
                 )
 
-        logger.debug(f"Attempting to retrieve secret {secret_name} from GSM")
+        logger.debug("Attempting to retrieve secret %s from GSM", secret_name)
         client = secretmanager.SecretManagerServiceClient()
         name = Supabase.SECRET_PATH_TEMPLATE.format(
             project_id=project_id, secret_name=secret_name
@@ -0,0 +1,62 @@
+"""
+Single-flight call coalescing
+
+Concurrent callers asking for the same key while a load is running wait for
+that load instead of starting their own, so a burst of identical cache misses
+costs one upstream call or computation.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[K, V]):
+    """Runs at most one load per key at a time and shares its outcome"""
+
+    def __init__(self) -> None:
+        self._in_flight: dict[K, asyncio.Future[V]] = {}
+
+    def __contains__(self, key: K) -> bool:
+        """Return True if a load of the key is running"""
+        return key in self._in_flight
+
+    async def run(self, key: K, load: Callable[[], Awaitable[V]]) -> V:
+        """
+        Load a key, or join the load of it that is already running
+
+        A waiter that is cancelled does not cancel the shared load.
+
+        Args:
+            key: Identity of the value
+            load: Coroutine factory producing the value; only called when no
+                load of the key is running
+
+        Returns:
+            Value produced by the load
+
+        Raises:
+            Exception: Whatever the load raises, to every waiter; failures are
+                not remembered, so the next call loads again
+        """
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            return await asyncio.shield(in_flight)
+
+        future: asyncio.Future[V] = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            value = await load()
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception retrieved when nobody else was waiting for it
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            del self._in_flight[key]
@@ -1,17 +1,168 @@
 # @track_context("config.md")
 
+import asyncio
+import contextvars
+import functools
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+import httpx
+from postgrest import SyncRequestBuilder
+from postgrest.utils import SyncClient
+from storage3._sync.file_api import SyncBucketProxy
 from supabase import Client, create_client
 
 from src.core.config import settings
+from src.core.metrics import observe_stage
+
+T = TypeVar("T")
 
 # Global client instance to preserve PKCE state
 _supabase_client: Client | None = None
 
+# Keep-alive connection pool shared by all user-scoped clients
+_scoped_transport: httpx.HTTPTransport | None = None
+
+# Bounded pool for the blocking supabase-py calls, so they never run on the event loop
+_supabase_executor: ThreadPoolExecutor | None = None
+
 
 def get_supabase_client() -> Client:
     """Get Supabase client instance (singleton to preserve PKCE state)"""
     global _supabase_client
     if _supabase_client is None:
         _supabase_client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
-    
+
     return _supabase_client
+
+
+class _SharedTransport(httpx.BaseTransport):
+    """Transport that forwards to the shared pool and is never closed by a client"""
+
+    def __init__(self, transport: httpx.BaseTransport) -> None:
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self._transport.handle_request(request)
+
+    def close(self) -> None:
+        pass
+
+
+def _get_scoped_transport() -> httpx.BaseTransport:
+    """Get the connection pool shared by user-scoped clients"""
+    global _scoped_transport
+    if _scoped_transport is None:
+        _scoped_transport = httpx.HTTPTransport(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=settings.SUPABASE_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.SUPABASE_MAX_CONNECTIONS,
+            ),
+        )
+
+    return _SharedTransport(_scoped_transport)
+
+
+class _ScopedStorage:
+    """Storage access of a ScopedSupabaseClient"""
+
+    def __init__(self, session: httpx.Client) -> None:
+        self._session = session
+
+    def from_(self, id: str) -> SyncBucketProxy:
+        """Run a storage file operation on a bucket"""
+        return SyncBucketProxy(id, self._session)
+
+
+class ScopedSupabaseClient:
+    """
+    Table and storage access authorized as a single user
+
+    A lightweight per-request view that mirrors ``table()`` and
+    ``storage.from_()`` of the Supabase client. It carries its own
+    Authorization header instead of mutating the shared singleton, and all
+    scoped clients share one keep-alive connection pool, so concurrent
+    requests of different users run in parallel safely.
+    """
+
+    def __init__(self, client: Client, access_token: str) -> None:
+        self._postgrest = self._scoped_session(client.postgrest.session, access_token)
+        self.storage = _ScopedStorage(
+            self._scoped_session(client.storage._client, access_token)
+        )
+
+    @staticmethod
+    def _scoped_session(session: httpx.Client, access_token: str) -> SyncClient:
+        """Copy of a singleton session that authorizes as the user"""
+        headers = httpx.Headers(session.headers)
+        headers["Authorization"] = f"Bearer {access_token}"
+        return SyncClient(
+            base_url=session.base_url,
+            headers=headers,
+            timeout=session.timeout,
+            follow_redirects=True,
+            transport=_get_scoped_transport(),
+        )
+
+    def table(self, table_name: str) -> SyncRequestBuilder[Any]:
+        """Perform a table operation"""
+        return SyncRequestBuilder(self._postgrest, f"/{table_name}")
+
+
+# Clients that can read user data: a user-scoped view or the shared client
+DataClient = ScopedSupabaseClient | Client
+
+
+def get_scoped_supabase_client(access_token: str) -> ScopedSupabaseClient:
+    """Get a Supabase client view that acts with a user's access token"""
+    return ScopedSupabaseClient(get_supabase_client(), access_token)
+
+
+def get_supabase_executor() -> ThreadPoolExecutor:
+    """Get the thread pool that runs blocking Supabase calls"""
+    global _supabase_executor
+    if _supabase_executor is None:
+        _supabase_executor = ThreadPoolExecutor(
+            max_workers=settings.SUPABASE_MAX_WORKERS,
+            thread_name_prefix="supabase",
+        )
+
+    return _supabase_executor
+
+
+async def run_supabase(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking Supabase call without blocking the event loop
+
+    The call runs on the bounded Supabase thread pool (SUPABASE_MAX_WORKERS),
+    so slow storage transfers queue up there instead of stalling other
+    requests or exhausting the default thread pool.
+
+    Args:
+        func: Blocking callable, e.g. ``query.execute`` or ``bucket.upload``
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Return value of func
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    with observe_stage("supabase"):
+        return await loop.run_in_executor(
+            get_supabase_executor(),
+            functools.partial(context.run, func, *args, **kwargs),
+        )
+
+
+def shutdown_supabase_executor() -> None:
+    """Wait for in-flight Supabase calls and release the thread pool and connections"""
+    global _supabase_executor, _scoped_transport
+    if _supabase_executor is not None:
+        _supabase_executor.shutdown(wait=True)
+        _supabase_executor = None
+    if _scoped_transport is not None:
+        _scoped_transport.close()
+        _scoped_transport = None
@@ -0,0 +1,23 @@
+"""
+CSV Data Source Models
+
+This module defines the Pydantic models for batch operations on uploaded
+CSV files.
+"""
+
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from src.core.constants import Uploads
+
+
+class BatchDeleteRequest(BaseModel):
+    """Request to delete several uploaded files at once"""
+
+    file_ids: List[int] = Field(
+        ...,
+        min_length=1,
+        max_length=Uploads.MAX_BATCH_FILES,
+        description="Identifiers of the uploaded files to delete",
+    )
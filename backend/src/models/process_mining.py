@@ -5,7 +5,7 @@ This module defines all Pydantic models for process mining data structures.
 """
 
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -84,6 +84,12 @@ class EdgeModel(BaseModel):
     average_transition_time_mins: float = Field(
         ..., ge=0, description="Average transition time in minutes"
     )
+    median_transition_time_mins: Optional[float] = Field(
+        None, ge=0, description="Median transition time in minutes"
+    )
+    p95_transition_time_mins: Optional[float] = Field(
+        None, ge=0, description="95th percentile transition time in minutes"
+    )
     join_columns: List[JoinColumnModel] = Field(..., description="Join column mappings")
 
     class Config:
@@ -145,3 +151,75 @@ class ProcessDetailResponse(BaseModel):
     average_cycle_time_days: float = Field(..., ge=0, description="Average cycle time in days")
     process_efficiency: float = Field(..., ge=0, le=1, description="Process efficiency (0-1)")
     graph: ProcessGraphModel
+
+
+class VariantModel(BaseModel):
+    """Process variant: one distinct activity sequence"""
+
+    rank: int = Field(..., ge=1, description="Rank by case count (1 = most frequent)")
+    activities: List[str] = Field(..., description="Activity sequence of the variant")
+    case_count: int = Field(..., ge=0, description="Cases following this variant")
+    case_percentage: float = Field(..., ge=0, le=1, description="Percentage of cases (0-1)")
+    average_cycle_time_days: float = Field(..., ge=0, description="Average cycle time in days")
+    median_cycle_time_days: float = Field(..., ge=0, description="Median cycle time in days")
+
+
+class ProcessVariantsResponse(BaseModel):
+    """Most frequent variants of a process"""
+
+    process_id: str = Field(..., description="Unique process identifier")
+    total_cases: int = Field(..., ge=0, description="Total number of cases")
+    total_variants: int = Field(..., ge=0, description="Number of distinct variants")
+    variants: List[VariantModel]
+
+
+class SchemaTableModel(BaseModel):
+    """Uploaded table with its inferred keys"""
+
+    file_id: str = Field(..., description="Uploaded file identifier")
+    table: str = Field(..., description="Table name (file name without extension)")
+    row_count: int = Field(..., ge=0, description="Number of rows")
+    primary_key: Optional[str] = Field(None, description="Most likely primary key column")
+    candidate_keys: List[str] = Field(..., description="Unique, non-null columns")
+
+
+class SchemaJoinModel(BaseModel):
+    """Inferred foreign-key join between two uploaded tables"""
+
+    from_table: str = Field(..., description="Referencing table")
+    from_column: str = Field(..., description="Referencing column")
+    to_table: str = Field(..., description="Referenced table")
+    to_column: str = Field(..., description="Referenced key column")
+    containment: float = Field(
+        ..., ge=0, le=1, description="Share of referencing values found in the key (0-1)"
+    )
+
+
+class SchemaResponse(BaseModel):
+    """Keys and joins inferred across a user's uploaded tables"""
+
+    tables: List[SchemaTableModel]
+    joins: List[SchemaJoinModel]
+
+
+class AnalysisJobRequest(BaseModel):
+    """Request to analyze an uploaded file in the background"""
+
+    file_id: int = Field(..., description="Uploaded file identifier")
+    time_period: Optional[str] = Field(
+        None, description="Optional time period filter (e.g., Q4-2025)"
+    )
+
+
+class AnalysisJobResponse(BaseModel):
+    """Status of a background analysis job"""
+
+    job_id: str = Field(..., description="Unique job identifier")
+    file_id: str = Field(..., description="Analyzed file identifier")
+    status: str = Field(..., description="Job status (queued, running, completed, failed)")
+    stage: str = Field(..., description="Current stage (queued, loading, analyzing, done)")
+    progress: float = Field(..., ge=0, le=1, description="Progress (0-1)")
+    time_period: Optional[str] = Field(None, description="Time period filter")
+    error: Optional[str] = Field(None, description="Failure message")
+    created_at: str = Field(..., description="Submission timestamp")
+    updated_at: str = Field(..., description="Last status change timestamp")
@@ -0,0 +1,509 @@
+"""
+Background Analysis Jobs
+
+This module runs process mining analyses that are too slow for a single HTTP
+request. A job is submitted for one uploaded file, polled for progress, and
+its result fetched once it completed.
+
+Mining runs in a process pool, so CPU-bound discovery never holds the GIL of
+the API workers. Job state is kept in SQLite: in memory by default, or in the
+file configured by JOB_STORE_PATH so jobs survive restarts without any
+external queue service. Store calls block, so the event loop runs them on
+worker threads. Finished jobs are deleted after JOB_RETENTION_SECONDS, and
+beyond the newest JOB_RETENTION_MAX finished jobs.
+"""
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from src.core.constants import JobStatus
+from src.services.event_log import EventLog
+from src.services.event_log_format import FILE_EXTENSION, load_event_log
+from src.services.process_mining_engine import ProcessMiningEngine
+
+logger = logging.getLogger(__name__)
+
+# Progress reported when a job enters each stage
+STAGE_PROGRESS = {
+    "queued": 0.0,
+    "loading": 0.1,
+    "analyzing": 0.3,
+    "done": 1.0,
+}
+
+# Seconds between two sweeps of expired finished jobs
+PURGE_INTERVAL_SECONDS = 60
+
+_ACTIVE = (JobStatus.QUEUED, JobStatus.RUNNING)
+_FINISHED = (JobStatus.COMPLETED, JobStatus.FAILED)
+
+
+def _now() -> str:
+    """Current UTC time as an ISO 8601 string"""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _process_alive(pid: int) -> bool:
+    """True if a process with this id runs on this host"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists, but belongs to another user
+        return True
+    return True
+
+
+def run_analysis(
+    path: str,
+    file_id: str,
+    file_name: str,
+    user_id: str,
+    industry: Optional[str],
+    window: Optional[Tuple[int, int]],
+) -> Dict[str, Any]:
+    """
+    Analyze one event log file (runs in a worker process)
+
+    Args:
+        path: Local binary event log, or CSV for uploads without one
+        file_id: Id of the uploaded file
+        file_name: Original file name
+        user_id: Owner of the file
+        industry: Industry reported in the metadata block
+        window: (start, end) epoch seconds of the time_period filter
+
+    Returns:
+        Complete process mining data dictionary
+
+    Raises:
+        ValueError: If the file is not an event log
+    """
+    if path.endswith(FILE_EXTENSION):
+        log = load_event_log(path)
+    else:
+        with open(path, encoding="utf-8-sig", newline="") as source:
+            log = EventLog.from_csv(source)
+    log.name = file_name
+    log.source_id = file_id
+
+    if window is not None:
+        log = log.cases_started_between(*window)
+
+    return ProcessMiningEngine().analyze(
+        [log], client_id=user_id, industry=industry, time_window=window
+    )
+
+
+class JobStore:
+    """
+    SQLite table of analysis jobs and their results
+
+    One connection is shared by the threads calling the store and guarded by
+    a lock; every statement is a single-row read or write, apart from the
+    periodic purge. All methods block.
+
+    Several API worker processes can share one database file. Every job
+    records the process that runs it, so a restarting worker only fails the
+    jobs of processes that no longer exist.
+    """
+
+    def __init__(
+        self, path: str = "", retention_seconds: int = 0, max_finished: int = 0
+    ) -> None:
+        """
+        Open (and create) the job table
+
+        Args:
+            path: SQLite database file, or empty to keep jobs in memory
+            retention_seconds: Age after which finished jobs are deleted
+                (0: never)
+            max_finished: Number of most recently finished jobs kept (0: all)
+        """
+        self.retention_seconds = retention_seconds
+        self.max_finished = max_finished
+        self._next_purge = 0.0
+        self._connection = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            if path:
+                self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS analysis_jobs (
+                    job_id TEXT PRIMARY KEY,
+                    user_id TEXT NOT NULL,
+                    file_id TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    stage TEXT NOT NULL,
+                    progress REAL NOT NULL,
+                    time_period TEXT,
+                    error TEXT,
+                    result TEXT,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    owner_pid INTEGER
+                )
+                """
+            )
+            columns = {
+                row["name"]
+                for row in self._connection.execute("PRAGMA table_info(analysis_jobs)")
+            }
+            if "owner_pid" not in columns:
+                self._connection.execute(
+                    "ALTER TABLE analysis_jobs ADD COLUMN owner_pid INTEGER"
+                )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS analysis_jobs_status_updated_at "
+                "ON analysis_jobs (status, updated_at)"
+            )
+        self.fail_orphaned_jobs()
+
+    def fail_orphaned_jobs(self) -> int:
+        """
+        Fail queued and running jobs whose worker process is gone
+
+        Such jobs would never finish. Jobs of live processes, including other
+        API workers sharing the database, are left alone.
+
+        Returns:
+            Number of jobs marked as failed
+        """
+        with self._lock, self._connection:
+            owners = [
+                row["owner_pid"]
+                for row in self._connection.execute(
+                    "SELECT DISTINCT owner_pid FROM analysis_jobs "
+                    "WHERE status IN (?, ?)",
+                    _ACTIVE,
+                )
+            ]
+            orphaned = 0
+            for owner_pid in owners:
+                if owner_pid is not None and (
+                    owner_pid == os.getpid() or _process_alive(owner_pid)
+                ):
+                    continue
+                orphaned += self._connection.execute(
+                    "UPDATE analysis_jobs SET status = ?, error = ?, updated_at = ? "
+                    "WHERE status IN (?, ?) AND owner_pid IS ?",
+                    (
+                        JobStatus.FAILED,
+                        "Interrupted by a restart",
+                        _now(),
+                        *_ACTIVE,
+                        owner_pid,
+                    ),
+                ).rowcount
+        if orphaned:
+            logger.warning("Marked %d interrupted analysis jobs as failed", orphaned)
+        return orphaned
+
+    def purge(self) -> int:
+        """
+        Delete finished jobs past the retention age or count
+
+        Returns:
+            Number of deleted jobs
+        """
+        deleted = 0
+        with self._lock, self._connection:
+            if self.retention_seconds > 0:
+                cutoff = datetime.now(timezone.utc) - timedelta(
+                    seconds=self.retention_seconds
+                )
+                deleted += self._connection.execute(
+                    "DELETE FROM analysis_jobs WHERE status IN (?, ?) "
+                    "AND updated_at < ?",
+                    (*_FINISHED, cutoff.isoformat()),
+                ).rowcount
+            if self.max_finished > 0:
+                deleted += self._connection.execute(
+                    "DELETE FROM analysis_jobs WHERE status IN (?, ?) "
+                    "AND job_id NOT IN (SELECT job_id FROM analysis_jobs "
+                    "WHERE status IN (?, ?) ORDER BY updated_at DESC, rowid DESC LIMIT ?)",
+                    (*_FINISHED, *_FINISHED, self.max_finished),
+                ).rowcount
+        if deleted:
+            logger.debug("Purged %d finished analysis jobs", deleted)
+        return deleted
+
+    def create(
+        self, user_id: str, file_id: str, time_period: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        Insert a queued job
+
+        Args:
+            user_id: Owner of the job
+            file_id: Uploaded file to analyze
+            time_period: Time period filter of the analysis
+
+        Returns:
+            Job status dictionary
+        """
+        if time.monotonic() >= self._next_purge:
+            self._next_purge = time.monotonic() + PURGE_INTERVAL_SECONDS
+            self.purge()
+
+        now = _now()
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "file_id": file_id,
+            "status": JobStatus.QUEUED,
+            "stage": "queued",
+            "progress": STAGE_PROGRESS["queued"],
+            "time_period": time_period,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT INTO analysis_jobs (job_id, user_id, file_id, status, stage, "
+                "progress, time_period, created_at, updated_at, owner_pid) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job["job_id"],
+                    user_id,
+                    file_id,
+                    job["status"],
+                    job["stage"],
+                    job["progress"],
+                    time_period,
+                    now,
+                    now,
+                    os.getpid(),
+                ),
+            )
+        return job
+
+    def update(
+        self,
+        job_id: str,
+        status: str,
+        stage: str,
+        error: Optional[str] = None,
+        result: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Move a job to a new status and stage
+
+        Args:
+            job_id: Job to update
+            status: New JobStatus
+            stage: New stage (a key of STAGE_PROGRESS)
+            error: Failure message
+            result: Process mining data of a completed job
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE analysis_jobs SET status = ?, stage = ?, progress = ?, "
+                "error = ?, result = ?, updated_at = ? WHERE job_id = ?",
+                (
+                    status,
+                    stage,
+                    STAGE_PROGRESS[stage],
+                    error,
+                    json.dumps(result) if result is not None else None,
+                    _now(),
+                    job_id,
+                ),
+            )
+
+    def get(self, job_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Status of a job owned by a user
+
+        Args:
+            job_id: Job identifier
+            user_id: User asking for the job
+
+        Returns:
+            Job status dictionary, or None if the user has no such job
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT job_id, file_id, status, stage, progress, time_period, "
+                "error, created_at, updated_at FROM analysis_jobs "
+                "WHERE job_id = ? AND user_id = ?",
+                (job_id, user_id),
+            ).fetchone()
+        return dict(row) if row is not None else None
+
+    def result(self, job_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Result of a completed job owned by a user
+
+        Args:
+            job_id: Job identifier
+            user_id: User asking for the result
+
+        Returns:
+            Process mining data dictionary, or None if there is no result yet
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT result FROM analysis_jobs WHERE job_id = ? AND user_id = ?",
+                (job_id, user_id),
+            ).fetchone()
+        if row is None or row["result"] is None:
+            return None
+        result: Dict[str, Any] = json.loads(row["result"])
+        return result
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._connection.close()
+
+
+class AnalysisJobs:
+    """
+    Queue of background analyses running in a process pool
+
+    The pool is started on the first submitted job, so the API starts
+    without spawning processes nobody uses. Job store calls run on worker
+    threads, so SQLite I/O and result (de)serialization never block the
+    event loop.
+    """
+
+    def __init__(self, store: JobStore, max_workers: int) -> None:
+        self.store = store
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Get the worker process pool, starting it if needed"""
+        if self._pool is None:
+            # Forking a process that runs threads (Supabase pool, event loop) is unsafe
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    def _reset_pool(self) -> None:
+        """Discard the worker process pool without waiting for it"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def submit(
+        self,
+        user_id: str,
+        record: Dict[str, Any],
+        prepare: Callable[[], Awaitable[str]],
+        industry: Optional[str] = None,
+        time_period: Optional[str] = None,
+        window: Optional[Tuple[int, int]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Queue the analysis of an uploaded file
+
+        Args:
+            user_id: Owner of the file
+            record: uploaded_csv_files row with id and file_name
+            prepare: Coroutine factory returning the local path of the event log
+            industry: Industry reported in the metadata block
+            time_period: Time period filter, as requested
+            window: (start, end) epoch seconds of the time period
+
+        Returns:
+            Status dictionary of the queued job
+        """
+        job = await asyncio.to_thread(
+            self.store.create, user_id, str(record["id"]), time_period
+        )
+        task = asyncio.create_task(
+            self._run(job["job_id"], user_id, record, prepare, industry, window)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+        logger.info("Queued analysis job %s for file %s", job["job_id"], record["id"])
+        return job
+
+    async def _run(
+        self,
+        job_id: str,
+        user_id: str,
+        record: Dict[str, Any],
+        prepare: Callable[[], Awaitable[str]],
+        industry: Optional[str],
+        window: Optional[Tuple[int, int]],
+    ) -> None:
+        """Load the event log, mine it in the pool and store the outcome"""
+        try:
+            await self._update(job_id, JobStatus.RUNNING, "loading")
+            path = await prepare()
+
+            await self._update(job_id, JobStatus.RUNNING, "analyzing")
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._get_pool(),
+                run_analysis,
+                path,
+                str(record["id"]),
+                record["file_name"],
+                user_id,
+                industry,
+                window,
+            )
+
+            await self._update(job_id, JobStatus.COMPLETED, "done", result=result)
+            logger.info("Analysis job %s completed", job_id)
+        except BrokenProcessPool as e:
+            # A worker died (e.g. out of memory); start a fresh pool for later jobs
+            logger.error("Analysis job %s failed: %s", job_id, e)
+            await self._update(job_id, JobStatus.FAILED, "done", error=str(e))
+            self._reset_pool()
+        except asyncio.CancelledError:
+            await self._update(job_id, JobStatus.FAILED, "done", error="Cancelled")
+            raise
+        except Exception as e:
+            logger.error("Analysis job %s failed: %s", job_id, e, exc_info=True)
+            await self._update(job_id, JobStatus.FAILED, "done", error=str(e))
+
+    async def _update(
+        self,
+        job_id: str,
+        status: str,
+        stage: str,
+        error: Optional[str] = None,
+        result: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """JobStore.update() on a worker thread"""
+        await asyncio.to_thread(self.store.update, job_id, status, stage, error, result)
+
+    async def get(self, job_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """Status of a job owned by a user, or None"""
+        return await asyncio.to_thread(self.store.get, job_id, user_id)
+
+    async def result(self, job_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """Result of a completed job owned by a user, or None"""
+        return await asyncio.to_thread(self.store.result, job_id, user_id)
+
+    async def shutdown(self) -> None:
+        """Cancel running jobs and stop the worker processes"""
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._reset_pool()
+        await asyncio.to_thread(self.store.close)
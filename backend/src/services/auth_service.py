@@ -5,7 +5,7 @@ from typing import Any
 
 from src.core.constants import OAuth, Supabase
 from src.core.messages import ErrorMessages, LogMessages
-from src.core.supabase_client import get_supabase_client
+from src.core.supabase_client import get_supabase_client, run_supabase
 from src.models.auth import UserCreate, UserLogin
 
 logger = logging.getLogger(__name__)
@@ -20,7 +20,8 @@ class AuthService:
     async def signup(self, user_data: UserCreate) -> dict[str, Any]:
         """Register a new user in Supabase Auth"""
         try:
-            auth_response = self.client.auth.sign_up(
+            auth_response = await run_supabase(
+                self.client.auth.sign_up,
                 {
                     "email": user_data.email,
                     "password": user_data.password,
@@ -43,13 +44,14 @@ class AuthService:
             return self._build_auth_dict(auth_response)
 
         except Exception as e:
-            logger.error(f"Signup error: {e!s}")
+            logger.error("Signup error: %s", e)
             raise ValueError(f"{ErrorMessages.REGISTRATION_FAILED}: {e!s}") from e
 
     async def login(self, user_data: UserLogin) -> dict[str, Any]:
         """Authenticate a user with email and password"""
         try:
-            auth_response = self.client.auth.sign_in_with_password(
+            auth_response = await run_supabase(
+                self.client.auth.sign_in_with_password,
                 {
                     "email": user_data.email,
                     "password": user_data.password,
@@ -71,36 +73,40 @@ class AuthService:
             return self._build_auth_dict(auth_response)
 
         except Exception as e:
-            logger.error(f"Login error: {e!s}")
+            logger.error("Login error: %s", e)
             raise ValueError(f"{ErrorMessages.AUTHENTICATION_FAILED}: {e!s}") from e
 
     async def logout(self, token: str) -> bool:
         try:
-            self.client.auth.sign_out()
+            await run_supabase(self.client.auth.sign_out)
             logger.info(LogMessages.USER_LOGGED_OUT)
             return True
         except Exception as e:
-            logger.error(f"Logout error: {e!s}")
+            logger.error("Logout error: %s", e)
             return False
 
     async def request_password_reset(self, email: str) -> bool:
         try:
             reset_password_url = "http://tessely-app.vercel.app/reset-password" # Put this in .env later
-            self.client.auth.reset_password_for_email(email, {"redirect_to": reset_password_url})
+            await run_supabase(
+                self.client.auth.reset_password_for_email,
+                email,
+                {"redirect_to": reset_password_url},
+            )
             return True
         except Exception as e:
-            logger.error(f"Request password reset error: {e!s}")
+            logger.error("Request password reset error: %s", e)
             raise ValueError(f"Password reset request failed: {e!s}") from e
 
     async def confirm_password_reset(self, new_password: str, access_token: str) -> bool:
         """Confirm password reset using the token from email link"""
         try:
-            self.client.auth.set_session(access_token, access_token)
-            self.client.auth.update_user({"password": new_password})
+            await run_supabase(self.client.auth.set_session, access_token, access_token)
+            await run_supabase(self.client.auth.update_user, {"password": new_password})
             logger.info("Password reset completed successfully")
             return True
         except Exception as e:
-            logger.error(f"Confirm password reset error: {e!s}")
+            logger.error("Confirm password reset error: %s", e)
             return False
 
     async def oauth_login(self, provider: str, redirect_url: str) -> dict[str, Any]:
@@ -109,8 +115,9 @@ class AuthService:
             raise ValueError(f"Unsupported provider: {provider}")
 
         # Let Supabase handle PKCE internally - just pass the redirect URL
-        auth_response = self.client.auth.sign_in_with_oauth(
-            {"provider": "google", "options": {"redirect_to": redirect_url}}
+        auth_response = await run_supabase(
+            self.client.auth.sign_in_with_oauth,
+            {"provider": "google", "options": {"redirect_to": redirect_url}},
         )
 
         return {"auth_url": auth_response.url}
@@ -126,8 +133,8 @@ class AuthService:
             # Pass proper CodeExchangeParams format - Supabase will get code_verifier from storage
             code_exchange_params = {"auth_code": code, "redirect_to": redirect_url}
 
-            auth_response = self.client.auth.exchange_code_for_session(
-                code_exchange_params
+            auth_response = await run_supabase(
+                self.client.auth.exchange_code_for_session, code_exchange_params
             )
 
             if not auth_response.user or not auth_response.session:
@@ -139,14 +146,14 @@ class AuthService:
             return self._build_auth_dict(auth_response)
 
         except Exception as e:
-            logger.error(f"OAuth callback error: {e!s}")
+            logger.error("OAuth callback error: %s", e)
             raise ValueError(f"OAuth authentication failed: {e!s}") from e
 
     def _build_auth_dict(self, auth_response: Any) -> dict[str, Any]:
         """Build auth dict in format expected by format_auth_response helper"""
         user_metadata = auth_response.user.user_metadata
         if isinstance(user_metadata, str):
-            logger.warning(f"User metadata is string instead of dict: {user_metadata}")
+            logger.warning("User metadata is string instead of dict: %s", user_metadata)
             user_metadata = {}
         elif user_metadata is None:
             user_metadata = {}
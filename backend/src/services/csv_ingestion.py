@@ -0,0 +1,311 @@
+"""
+CSV Ingestion
+
+This module streams uploaded CSV files to Supabase storage in bounded-size
+chunks while profiling them on the fly (content hash, size, row count and a
+sniffed schema), so that multi-GB uploads never have to be held in memory.
+
+Before anything is stored, an upload is parsed once: that single pass sketches
+every column and, for event logs, builds the binary event log that is stored
+next to the raw file.
+"""
+
+import collections
+import csv
+import hashlib
+import io
+import logging
+import tempfile
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from typing import Any, BinaryIO
+
+from src.core.constants import ProcessMining, Uploads
+from src.services.event_log import EventLog
+from src.services.event_log_format import FILE_EXTENSION, write_event_log
+from src.services.sketches import TableSketch
+
+logger = logging.getLogger(__name__)
+
+_BOOLEAN_VALUES = {"true", "false", "yes", "no", "t", "f"}
+
+
+def _infer_type(values: list[str]) -> str:
+    """
+    Infer the column type of a sample of CSV values
+
+    Args:
+        values: Non-empty sample values of one column
+
+    Returns:
+        One of "integer", "float", "boolean", "timestamp" or "string"
+    """
+    if not values:
+        return "string"
+
+    def all_parse(parse: Any) -> bool:
+        try:
+            for value in values:
+                parse(value)
+            return True
+        except ValueError:
+            return False
+
+    if all_parse(int):
+        return "integer"
+    if all_parse(float):
+        return "float"
+    if all(value.lower() in _BOOLEAN_VALUES for value in values):
+        return "boolean"
+    if all_parse(datetime.fromisoformat):
+        return "timestamp"
+    return "string"
+
+
+class CsvStreamProfiler:
+    """Incrementally computes hash, size, row count and schema of a CSV stream"""
+
+    def __init__(self) -> None:
+        self._hash = hashlib.sha256()
+        self._head = bytearray()
+        self._in_quotes = False
+        self._last_byte = b""
+        self.size_bytes = 0
+        self.line_count = 0
+
+    def update(self, chunk: bytes) -> None:
+        """
+        Feed the next chunk of the stream
+
+        Line breaks inside quoted fields are not counted as row separators.
+
+        Args:
+            chunk: Raw bytes of the next chunk
+        """
+        if not chunk:
+            return
+
+        self._hash.update(chunk)
+        self.size_bytes += len(chunk)
+        self._last_byte = chunk[-1:]
+        if len(self._head) < Uploads.SNIFF_BYTES:
+            self._head.extend(chunk[: Uploads.SNIFF_BYTES - len(self._head)])
+
+        if b'"' not in chunk:
+            if not self._in_quotes:
+                self.line_count += chunk.count(b"\n")
+            return
+
+        # Segments between quote characters alternate between unquoted and quoted text
+        for segment in chunk.split(b'"'):
+            if not self._in_quotes:
+                self.line_count += segment.count(b"\n")
+            self._in_quotes = not self._in_quotes
+        self._in_quotes = not self._in_quotes
+
+    @property
+    def content_sha256(self) -> str:
+        """Hex SHA-256 digest of the bytes seen so far"""
+        return self._hash.hexdigest()
+
+    @property
+    def row_count(self) -> int:
+        """Number of data rows (excluding the header) seen so far"""
+        lines = self.line_count
+        if self.size_bytes and self._last_byte != b"\n":
+            lines += 1
+        return max(lines - 1, 0)
+
+    def sniff_schema(self) -> dict[str, Any]:
+        """
+        Sniff the dialect and column types from the head of the stream
+
+        Returns:
+            Dictionary with delimiter and a list of {name, type} columns
+        """
+        text = bytes(self._head).decode("utf-8-sig", errors="ignore")
+        if len(self._head) >= Uploads.SNIFF_BYTES:
+            # Drop the trailing partial line cut by the sniff window
+            text = text[: text.rfind("\n") + 1] or text
+
+        try:
+            delimiter = csv.Sniffer().sniff(text, delimiters=",;\t|").delimiter
+        except csv.Error:
+            delimiter = ","
+
+        rows = csv.reader(io.StringIO(text), delimiter=delimiter)
+        header = next(rows, [])
+        samples: list[list[str]] = [[] for _ in header]
+        for i, row in enumerate(rows):
+            if i >= Uploads.SCHEMA_SAMPLE_ROWS:
+                break
+            for column, value in zip(samples, row):
+                if value.strip():
+                    column.append(value.strip())
+
+        return {
+            "delimiter": delimiter,
+            "columns": [
+                {"name": name.strip(), "type": _infer_type(values)}
+                for name, values in zip(header, samples)
+            ],
+        }
+
+    def summary(self) -> dict[str, Any]:
+        """
+        Profile of the complete stream, ready to store with the file record
+
+        Returns:
+            Dictionary with content_sha256, size_bytes, row_count and csv_schema
+        """
+        return {
+            "content_sha256": self.content_sha256,
+            "size_bytes": self.size_bytes,
+            "row_count": self.row_count,
+            "csv_schema": self.sniff_schema(),
+        }
+
+
+class ProfiledReader(io.RawIOBase):
+    """Read-only, unseekable view of a binary stream that profiles every read"""
+
+    def __init__(self, source: BinaryIO, profiler: CsvStreamProfiler) -> None:
+        """
+        Args:
+            source: Binary file object to read from
+            profiler: Profiler updated with every chunk read
+        """
+        super().__init__()
+        self.source = source
+        self.profiler = profiler
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        chunk = self.source.read(len(buffer))
+        self.profiler.update(chunk)
+        buffer[: len(chunk)] = chunk
+        return len(chunk)
+
+
+def stream_to_storage(
+    bucket: Any,
+    path: str,
+    source: BinaryIO,
+    content_type: str = Uploads.CONTENT_TYPE,
+) -> CsvStreamProfiler:
+    """
+    Stream a file into a Supabase storage bucket with bounded memory
+
+    The body is read from the source stream in chunks while it is sent,
+    instead of being buffered, and profiled on the way. storage3 only streams
+    BufferedReader bodies (anything else is opened as a path), hence the
+    buffered wrapper; as it cannot seek, httpx sends it chunked.
+
+    Args:
+        bucket: Storage bucket proxy (``supabase.storage.from_(...)``)
+        path: Object path inside the bucket
+        source: Binary file object positioned at the start of the content
+        content_type: MIME type stored with the object
+
+    Returns:
+        Profiler that has seen the complete stream
+    """
+    profiler = CsvStreamProfiler()
+    body = io.BufferedReader(
+        ProfiledReader(source, profiler), buffer_size=Uploads.CHUNK_SIZE
+    )
+    bucket.upload(
+        path,
+        body,
+        {"content-type": content_type, "cache-control": "3600", "upsert": "false"},
+    )
+
+    logger.debug("Streamed %d bytes to %s", profiler.size_bytes, path)
+    return profiler
+
+
+def _sketched(rows: Iterable[list[str]], sketch: TableSketch) -> Iterator[list[str]]:
+    """Pass rows through, adding them to the sketch in batches"""
+    batch: list[list[str]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= ProcessMining.PARSE_BATCH_ROWS:
+            sketch.update(batch)
+            batch = []
+        yield row
+    sketch.update(batch)
+
+
+def parse_upload(
+    source: BinaryIO, name: str
+) -> tuple[EventLog | None, list[dict[str, Any]]]:
+    """
+    Parse an uploaded CSV once into its column sketches and event log
+
+    Args:
+        source: Binary file object with the CSV content
+        name: Original file name
+
+    Returns:
+        Tuple of (event log, or None if the CSV is not an event log; column
+        sketches as ColumnSketch.to_dict). Files that are not UTF-8 or not
+        valid CSV give (None, []).
+    """
+    # The delimiter is sniffed from the head, as for the stored csv_schema
+    head = CsvStreamProfiler()
+    source.seek(0)
+    head.update(source.read(Uploads.SNIFF_BYTES))
+    delimiter = head.sniff_schema()["delimiter"]
+
+    source.seek(0)
+    text = io.TextIOWrapper(source, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.reader(text, delimiter=delimiter)
+        header = next(reader, None) or []
+        sketch = TableSketch(header)
+        rows = _sketched(reader, sketch)
+
+        log = None
+        try:
+            log = EventLog.from_rows(header, rows, name=name)
+        except UnicodeDecodeError:
+            raise
+        except ValueError as e:
+            logger.debug("%s is not an event log: %s", name, e)
+        # Sketch the rest of a file that is not an event log
+        collections.deque(rows, maxlen=0)
+    except (UnicodeDecodeError, csv.Error) as e:
+        # The raw file is still stored, it just cannot be analyzed
+        logger.warning("Could not parse %s: %s", name, e)
+        return None, []
+    finally:
+        # Keep the caller's file open when the wrapper is discarded
+        text.detach()
+
+    return log, sketch.to_dicts()
+
+
+def store_binary_event_log(bucket: Any, csv_path: str, log: EventLog) -> str:
+    """
+    Store the binary event log of an uploaded CSV next to it
+
+    Args:
+        bucket: Storage bucket proxy (``supabase.storage.from_(...)``)
+        csv_path: Object path of the raw CSV inside the bucket
+        log: Event log parsed from the CSV
+
+    Returns:
+        Object path of the binary event log
+    """
+    artifact_path = f"{csv_path}{FILE_EXTENSION}"
+    with tempfile.TemporaryFile() as artifact:
+        write_event_log(log, artifact)
+        artifact.seek(0)
+        stream_to_storage(
+            bucket, artifact_path, artifact, content_type="application/octet-stream"
+        )
+
+    logger.debug("Stored binary event log for %s at %s", log.name, artifact_path)
+    return artifact_path
@@ -0,0 +1,259 @@
+"""
+Directly-Follows Graph Miner
+
+This module discovers the directly-follows graph (DFG) of a columnar event log
+together with frequency and timing statistics. The log is sorted by
+(case, timestamp) once; transition pairs are derived with shifted-array
+comparisons and all statistics use grouped reductions, so the cost grows
+linearly with the number of events.
+"""
+
+import logging
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.services.event_log import EventLog
+
+logger = logging.getLogger(__name__)
+
+# Largest activity-pair key space grouped with a dense counting pass
+MAX_DENSE_EDGE_KEYS = 1 << 22
+
+# Bit layout used to sort (group, value) pairs as a single int64 key
+PACKED_VALUE_BITS = 40
+PACKED_VALUE_MASK = (1 << PACKED_VALUE_BITS) - 1
+MAX_PACKED_GROUPS = 1 << (63 - PACKED_VALUE_BITS)
+
+
+def grouped_quantiles(
+    groups: NDArray[Any], values: NDArray[Any], size: int, quantiles: tuple[float, ...]
+) -> NDArray[Any]:
+    """
+    Compute quantiles of values per integer group with linear interpolation
+
+    Values are ordered within their group so that every group is a contiguous,
+    sorted run and each quantile becomes a vectorized gather. Non-negative
+    integer values (e.g. durations in seconds) are packed together with their
+    group into one int64 key and ordered with a single value sort.
+
+    Args:
+        groups: Group index per value
+        values: Values to summarize
+        size: Number of groups
+        quantiles: Quantiles to compute, in [0, 1]
+
+    Returns:
+        Array of shape (len(quantiles), size); empty groups yield 0
+    """
+    result = np.zeros((len(quantiles), size), dtype=np.float64)
+    if len(values) == 0:
+        return result
+
+    if (
+        np.issubdtype(values.dtype, np.integer)
+        and size <= MAX_PACKED_GROUPS
+        and values.min() >= 0
+        and values.max() <= PACKED_VALUE_MASK
+    ):
+        packed = (groups.astype(np.int64) << PACKED_VALUE_BITS) | values
+        packed.sort()
+        sorted_values = (packed & PACKED_VALUE_MASK).astype(np.float64)
+    else:
+        by_value = np.argsort(values, kind="stable")
+        order = by_value[np.argsort(groups[by_value], kind="stable")]
+        sorted_values = values[order].astype(np.float64)
+
+    counts = np.bincount(groups, minlength=size)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    present = counts > 0
+    result[:, present] = run_quantiles(
+        sorted_values, starts[present], counts[present], quantiles
+    )
+    return result
+
+
+def run_quantiles(
+    sorted_values: NDArray[Any],
+    starts: NDArray[Any],
+    counts: NDArray[Any],
+    quantiles: tuple[float, ...],
+) -> NDArray[Any]:
+    """
+    Quantiles of consecutive sorted runs with linear interpolation
+
+    Args:
+        sorted_values: Values, sorted within every run
+        starts: Start position of each (non-empty) run
+        counts: Length of each run
+        quantiles: Quantiles to compute, in [0, 1]
+
+    Returns:
+        Array of shape (len(quantiles), len(starts))
+    """
+    result = np.empty((len(quantiles), len(starts)), dtype=np.float64)
+    for row, q in enumerate(quantiles):
+        position = starts + q * (counts - 1)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        weight = position - lower
+        result[row] = (
+            sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+        )
+    return result
+
+
+def grouped_mean(groups: NDArray[Any], values: NDArray[Any], size: int) -> NDArray[Any]:
+    """
+    Mean of values per integer group
+
+    Args:
+        groups: Group index per value
+        values: Values to average
+        size: Number of groups
+
+    Returns:
+        Array of per-group means (0 for empty groups)
+    """
+    counts = np.bincount(groups, minlength=size)
+    sums = np.bincount(groups, weights=values, minlength=size)
+    return np.divide(
+        sums, counts, out=np.zeros(size, dtype=np.float64), where=counts > 0
+    )
+
+
+class DirectlyFollowsGraph:
+    """
+    Directly-follows graph with per-edge and per-activity statistics
+
+    All durations are in seconds. Per-activity arrays are indexed by activity
+    code; per-edge arrays are aligned with ``edge_sources``/``edge_targets``.
+    """
+
+    def __init__(
+        self,
+        activity_labels: NDArray[Any],
+        edge_sources: NDArray[Any],
+        edge_targets: NDArray[Any],
+        edge_counts: NDArray[Any],
+        edge_mean_seconds: NDArray[Any],
+        edge_median_seconds: NDArray[Any],
+        edge_p95_seconds: NDArray[Any],
+        activity_case_counts: NDArray[Any],
+        activity_completed_cases: NDArray[Any],
+        activity_outgoing: NDArray[Any],
+        activity_mean_to_next_seconds: NDArray[Any],
+        start_counts: NDArray[Any],
+        end_counts: NDArray[Any],
+    ):
+        self.activity_labels = activity_labels
+        self.edge_sources = edge_sources
+        self.edge_targets = edge_targets
+        self.edge_counts = edge_counts
+        self.edge_mean_seconds = edge_mean_seconds
+        self.edge_median_seconds = edge_median_seconds
+        self.edge_p95_seconds = edge_p95_seconds
+        self.activity_case_counts = activity_case_counts
+        self.activity_completed_cases = activity_completed_cases
+        self.activity_outgoing = activity_outgoing
+        self.activity_mean_to_next_seconds = activity_mean_to_next_seconds
+        self.start_counts = start_counts
+        self.end_counts = end_counts
+
+    @property
+    def edge_probabilities(self) -> NDArray[np.float64]:
+        """Share of the source activity's outgoing transitions taken by each edge"""
+        outgoing = self.activity_outgoing[self.edge_sources]
+        probabilities: NDArray[np.float64] = np.divide(
+            self.edge_counts,
+            outgoing,
+            out=np.zeros(len(self.edge_counts), dtype=np.float64),
+            where=outgoing > 0,
+        )
+        return probabilities
+
+    @property
+    def activity_success_rates(self) -> NDArray[np.float64]:
+        """Share of the cases visiting each activity that completed"""
+        rates: NDArray[np.float64] = np.divide(
+            self.activity_completed_cases,
+            self.activity_case_counts,
+            out=np.zeros(len(self.activity_case_counts), dtype=np.float64),
+            where=self.activity_case_counts > 0,
+        )
+        return rates
+
+
+def discover_dfg(log: EventLog, completed: NDArray[Any]) -> DirectlyFollowsGraph:
+    """
+    Discover the directly-follows graph of an event log
+
+    Args:
+        log: Event log sorted by (case, timestamp)
+        completed: Per-case flag, True if the case reached a successful outcome
+
+    Returns:
+        Directly-follows graph with frequency and timing statistics
+    """
+    num_activities = log.num_activities
+
+    # Transitions are consecutive events that belong to the same case
+    same_case = log.case_codes[1:] == log.case_codes[:-1]
+    sources = log.activity_codes[:-1][same_case]
+    targets = log.activity_codes[1:][same_case]
+    durations = np.diff(log.timestamps)[same_case]
+
+    edge_keys = sources.astype(np.int64) * num_activities + targets
+    if num_activities * num_activities <= MAX_DENSE_EDGE_KEYS:
+        # Dense edge keys keep the grouping a counting pass instead of a sort
+        key_counts = np.bincount(edge_keys, minlength=num_activities * num_activities)
+        present_keys = np.flatnonzero(key_counts)
+        key_to_edge = np.full(len(key_counts), -1, dtype=np.int64)
+        key_to_edge[present_keys] = np.arange(len(present_keys))
+        edge_index = key_to_edge[edge_keys]
+        edge_counts = key_counts[present_keys]
+    else:
+        present_keys, edge_index, edge_counts = np.unique(
+            edge_keys, return_inverse=True, return_counts=True
+        )
+    num_edges = len(present_keys)
+
+    edge_median, edge_p95 = grouped_quantiles(
+        edge_index, durations, num_edges, (0.5, 0.95)
+    )
+    durations = durations.astype(np.float64)
+
+    visited_cases, visited_activities = log.visited_pairs()
+
+    graph = DirectlyFollowsGraph(
+        activity_labels=log.activity_labels,
+        edge_sources=present_keys // num_activities,
+        edge_targets=present_keys % num_activities,
+        edge_counts=edge_counts,
+        edge_mean_seconds=grouped_mean(edge_index, durations, num_edges),
+        edge_median_seconds=edge_median,
+        edge_p95_seconds=edge_p95,
+        activity_case_counts=np.bincount(visited_activities, minlength=num_activities),
+        activity_completed_cases=np.bincount(
+            visited_activities,
+            weights=completed[visited_cases].astype(np.float64),
+            minlength=num_activities,
+        ),
+        activity_outgoing=np.bincount(sources, minlength=num_activities),
+        activity_mean_to_next_seconds=grouped_mean(sources, durations, num_activities),
+        start_counts=np.bincount(
+            log.activity_codes[log.case_first_index], minlength=num_activities
+        ),
+        end_counts=np.bincount(
+            log.activity_codes[log.case_last_index], minlength=num_activities
+        ),
+    )
+
+    logger.debug(
+        "Discovered DFG with %d activities and %d edges from %d events",
+        num_activities,
+        num_edges,
+        log.num_events,
+    )
+    return graph
@@ -0,0 +1,550 @@
+"""
+Columnar Event Log
+
+This module provides a NumPy-backed, dictionary-encoded event log store used by
+the process mining engine.
+"""
+
+import csv
+import logging
+import warnings
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.core.constants import ProcessMining
+
+if TYPE_CHECKING:
+    from src.services.rollups import Rollup
+    from src.services.variants import VariantTable
+
+logger = logging.getLogger(__name__)
+
+
+def _find_column(header: Sequence[str], aliases: Sequence[str]) -> Optional[int]:
+    """
+    Find the index of the first header matching one of the aliases
+
+    Args:
+        header: CSV header row
+        aliases: Accepted lower-case column names
+
+    Returns:
+        Column index or None if no alias matches
+    """
+    normalized = [column.strip().lower() for column in header]
+    for alias in aliases:
+        if alias in normalized:
+            return normalized.index(alias)
+    return None
+
+
+def parse_timestamps(values: Sequence[str]) -> NDArray[np.int64]:
+    """
+    Parse timestamp strings into int64 seconds since the epoch (UTC)
+
+    ISO 8601 values are parsed in a single vectorized pass; anything numpy
+    cannot read falls back to datetime.fromisoformat per value.
+
+    Args:
+        values: Timestamp strings
+
+    Returns:
+        int64 array of epoch seconds
+
+    Raises:
+        ValueError: If a timestamp is missing or cannot be parsed
+    """
+    try:
+        with warnings.catch_warnings():
+            # numpy warns when it drops an explicit UTC offset after applying it
+            warnings.simplefilter("ignore", UserWarning)
+            moments = np.asarray(values, dtype="datetime64[s]")
+    except ValueError:
+        pass
+    else:
+        # Blank and "NaT" values would otherwise become INT64_MIN
+        missing = np.isnat(moments)
+        if missing.any():
+            raise ValueError(f"Missing timestamp at position {int(missing.argmax())}")
+        return moments.astype(np.int64)
+
+    parsed = np.empty(len(values), dtype=np.int64)
+    for i, value in enumerate(values):
+        moment = datetime.fromisoformat(value.strip())
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        parsed[i] = int(moment.timestamp())
+    return parsed
+
+
+class EventLog:
+    """
+    Columnar event log with dictionary-encoded case and activity columns
+
+    Events are stored sorted by (case, timestamp) so that every case occupies a
+    contiguous slice, delimited by ``case_offsets``. Case codes are re-encoded
+    densely, so a case code is also its index into ``case_offsets``.
+    """
+
+    def __init__(
+        self,
+        case_codes: NDArray[Any],
+        activity_codes: NDArray[Any],
+        timestamps: NDArray[Any],
+        case_labels: NDArray[Any],
+        activity_labels: NDArray[Any],
+        name: str = "",
+        case_column: str = "case_id",
+        source_id: Optional[str] = None,
+    ):
+        """
+        Initialize event log from already encoded columns
+
+        Args:
+            case_codes: Integer case code per event
+            activity_codes: Integer activity code per event
+            timestamps: int64 epoch seconds per event
+            case_labels: Original case identifiers, indexed by case code
+            activity_labels: Activity names, indexed by activity code
+            name: Human-readable log name (usually the uploaded file name)
+            case_column: Name of the case identifier column in the source
+            source_id: Identifier of the uploaded file the log came from
+        """
+        order = np.lexsort((timestamps, case_codes))
+        sorted_cases = case_codes[order]
+        self.activity_codes = np.ascontiguousarray(
+            activity_codes[order], dtype=np.int32
+        )
+        self.timestamps = np.ascontiguousarray(timestamps[order], dtype=np.int64)
+        self.activity_labels = activity_labels
+        self.name = name
+        self.case_column = case_column
+        self.source_id = source_id
+        self._visited_pairs: Optional[tuple[NDArray[Any], NDArray[Any]]] = None
+        self._case_start_index: Optional[tuple[NDArray[Any], NDArray[Any]]] = None
+        self._terminal_activity: Optional[int] = None
+        self.rollup: Optional["Rollup"] = None
+        self.variants: Optional["VariantTable"] = None
+
+        # Re-encode cases densely so that case code == position in case_offsets
+        is_boundary = np.empty(len(sorted_cases), dtype=bool)
+        is_boundary[:1] = True
+        np.not_equal(sorted_cases[1:], sorted_cases[:-1], out=is_boundary[1:])
+        boundaries = np.flatnonzero(is_boundary)
+        self.case_codes = np.cumsum(is_boundary, dtype=np.int64) - 1
+        self._case_labels: NDArray[Any] = case_labels[sorted_cases[boundaries]]
+        self.case_offsets = np.append(boundaries, len(sorted_cases)).astype(np.int64)
+
+    @classmethod
+    def from_sorted(
+        cls,
+        case_codes: NDArray[Any],
+        activity_codes: NDArray[Any],
+        timestamps: NDArray[Any],
+        case_offsets: NDArray[Any],
+        case_labels: NDArray[Any],
+        activity_labels: NDArray[Any],
+        name: str = "",
+        case_column: str = "case_id",
+        source_id: Optional[str] = None,
+    ) -> "EventLog":
+        """
+        Wrap columns that are already sorted and densely encoded, without copying
+
+        Used for memory-mapped logs; the arrays may be read-only views.
+
+        Args:
+            case_codes: Dense case code per event, sorted by (case, timestamp)
+            activity_codes: Activity code per event
+            timestamps: int64 epoch seconds per event
+            case_offsets: Start offset of every case plus the total event count
+            case_labels: Case identifiers (str, or UTF-8 bytes decoded on access)
+            activity_labels: Activity names, indexed by activity code
+            name: Human-readable log name
+            case_column: Name of the case identifier column in the source
+            source_id: Identifier of the uploaded file
+
+        Returns:
+            Event log sharing the given arrays
+        """
+        log = cls.__new__(cls)
+        log.case_codes = case_codes
+        log.activity_codes = activity_codes
+        log.timestamps = timestamps
+        log.case_offsets = case_offsets
+        log._case_labels = case_labels
+        log.activity_labels = activity_labels
+        log.name = name
+        log.case_column = case_column
+        log.source_id = source_id
+        log._visited_pairs = None
+        log._case_start_index = None
+        log._terminal_activity = None
+        log.rollup = None
+        log.variants = None
+        return log
+
+    @classmethod
+    def from_columns(
+        cls,
+        cases: Sequence[str],
+        activities: Sequence[str],
+        timestamps: Sequence[str],
+        name: str = "",
+        case_column: str = "case_id",
+        source_id: Optional[str] = None,
+    ) -> "EventLog":
+        """
+        Build an event log from raw string columns
+
+        Args:
+            cases: Case identifier per event
+            activities: Activity name per event
+            timestamps: Timestamp string per event
+            name: Human-readable log name
+            case_column: Name of the case identifier column in the source
+            source_id: Identifier of the uploaded file
+
+        Returns:
+            Encoded event log
+        """
+        case_labels, case_codes = np.unique(
+            np.asarray(cases, dtype=str), return_inverse=True
+        )
+        activity_labels, activity_codes = np.unique(
+            np.asarray(activities, dtype=str), return_inverse=True
+        )
+        return cls(
+            case_codes=case_codes,
+            activity_codes=activity_codes,
+            timestamps=parse_timestamps(timestamps),
+            case_labels=case_labels,
+            activity_labels=activity_labels,
+            name=name,
+            case_column=case_column,
+            source_id=source_id,
+        )
+
+    @classmethod
+    def from_csv(
+        cls,
+        lines: Iterable[str],
+        name: str = "",
+        source_id: Optional[str] = None,
+        delimiter: str = ",",
+    ) -> "EventLog":
+        """
+        Parse an event log from CSV text
+
+        The case, activity and timestamp columns are detected from the header
+        using the aliases in ProcessMining constants.
+
+        Args:
+            lines: CSV lines (e.g. an open text file or io.StringIO)
+            name: Human-readable log name
+            source_id: Identifier of the uploaded file
+            delimiter: Field delimiter
+
+        Returns:
+            Encoded event log
+
+        Raises:
+            ValueError: If the CSV does not contain the required columns
+        """
+        reader = csv.reader(lines, delimiter=delimiter)
+        header = next(reader, None)
+        if not header:
+            raise ValueError("CSV file is empty")
+        return cls.from_rows(header, reader, name=name, source_id=source_id)
+
+    @classmethod
+    def from_rows(
+        cls,
+        header: Sequence[str],
+        rows: Iterable[Sequence[str]],
+        name: str = "",
+        source_id: Optional[str] = None,
+    ) -> "EventLog":
+        """
+        Parse an event log from parsed CSV rows
+
+        The rows are only consumed if the header names the required columns,
+        so callers sharing the row stream can still read it afterwards. Rows
+        that are too short or have a blank timestamp are skipped.
+
+        Args:
+            header: Column names
+            rows: Data rows
+            name: Human-readable log name
+            source_id: Identifier of the uploaded file
+
+        Returns:
+            Encoded event log
+
+        Raises:
+            ValueError: If the header lacks the required columns
+        """
+        case_idx = _find_column(header, ProcessMining.CASE_COLUMN_ALIASES)
+        activity_idx = _find_column(header, ProcessMining.ACTIVITY_COLUMN_ALIASES)
+        timestamp_idx = _find_column(header, ProcessMining.TIMESTAMP_COLUMN_ALIASES)
+        if case_idx is None or activity_idx is None or timestamp_idx is None:
+            raise ValueError(
+                "CSV is not an event log: case, activity and timestamp columns are required"
+            )
+
+        width = max(case_idx, activity_idx, timestamp_idx) + 1
+        builder = EventLogBuilder(
+            name=name, case_column=header[case_idx].strip(), source_id=source_id
+        )
+        cases: List[str] = []
+        activities: List[str] = []
+        timestamps: List[str] = []
+        for row in rows:
+            if len(row) < width or not row[timestamp_idx].strip():
+                continue
+            cases.append(row[case_idx])
+            activities.append(row[activity_idx])
+            timestamps.append(row[timestamp_idx])
+            if len(cases) >= ProcessMining.PARSE_BATCH_ROWS:
+                builder.append(cases, activities, timestamps)
+                cases, activities, timestamps = [], [], []
+        builder.append(cases, activities, timestamps)
+
+        logger.debug("Parsed %d events from %s", builder.num_events, name or "CSV")
+
+        return builder.build()
+
+    @property
+    def case_labels(self) -> NDArray[Any]:
+        """Case identifiers indexed by case code"""
+        if self._case_labels.dtype.kind == "S":
+            self._case_labels = np.char.decode(self._case_labels, "utf-8")
+        return self._case_labels
+
+    @property
+    def num_events(self) -> int:
+        """Number of events in the log"""
+        return len(self.case_codes)
+
+    @property
+    def num_cases(self) -> int:
+        """Number of cases in the log"""
+        return len(self.case_offsets) - 1
+
+    @property
+    def num_activities(self) -> int:
+        """Number of distinct activities in the log"""
+        return len(self.activity_labels)
+
+    @property
+    def case_first_index(self) -> NDArray[Any]:
+        """Index of the first event of every case"""
+        return self.case_offsets[:-1]
+
+    @property
+    def case_last_index(self) -> NDArray[Any]:
+        """Index of the last event of every case"""
+        return self.case_offsets[1:] - 1
+
+    def visited_pairs(self) -> tuple[NDArray[Any], NDArray[Any]]:
+        """
+        Distinct (case, activity) pairs of the log, computed once
+
+        Returns:
+            Tuple of (case codes, activity codes), one entry per distinct pair
+        """
+        if self._visited_pairs is None:
+            num_activities = max(self.num_activities, 1)
+            keys = np.unique(
+                self.case_codes.astype(np.int64) * num_activities + self.activity_codes
+            )
+            self._visited_pairs = (keys // num_activities, keys % num_activities)
+        return self._visited_pairs
+
+    def terminal_activity(self) -> int:
+        """
+        Activity code of the successful outcome, computed once
+
+        The most common final activity of the log's cases. Sub-logs from
+        select_cases() inherit it, so a case counts as completed by the same
+        rule whichever time window it is analyzed in.
+
+        Returns:
+            Activity code (0 for an empty log)
+        """
+        if self._terminal_activity is None:
+            end_activities = self.activity_codes[self.case_last_index]
+            self._terminal_activity = int(
+                np.bincount(end_activities, minlength=self.num_activities).argmax()
+                if len(end_activities)
+                else 0
+            )
+        return self._terminal_activity
+
+    def case_start_index(self) -> tuple[NDArray[Any], NDArray[Any]]:
+        """
+        Time index of the log, computed once
+
+        Cases ordered by the timestamp of their first event, so the cases
+        started in any window form one contiguous run found by binary search.
+
+        Returns:
+            Tuple of (case codes ordered by start, their sorted start timestamps)
+        """
+        if self._case_start_index is None:
+            starts = self.timestamps[self.case_first_index]
+            order = np.argsort(starts, kind="stable")
+            self._case_start_index = (order, starts[order])
+        return self._case_start_index
+
+    def select_cases(self, case_codes: NDArray[Any]) -> "EventLog":
+        """
+        Sub-log containing only the given cases
+
+        Only the events of the selected cases are gathered; activity codes,
+        labels and the terminal activity are shared with this log.
+
+        Args:
+            case_codes: Ascending case codes to keep
+
+        Returns:
+            Event log of the selected cases
+        """
+        starts = self.case_offsets[case_codes]
+        lengths = self.case_offsets[case_codes + 1] - starts
+        offsets = np.zeros(len(case_codes) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        # Position j of case i maps back to starts[i] + (j - offsets[i])
+        events = np.arange(offsets[-1]) - np.repeat(offsets[:-1] - starts, lengths)
+
+        sub_log = EventLog.from_sorted(
+            case_codes=np.repeat(np.arange(len(case_codes)), lengths),
+            activity_codes=self.activity_codes[events],
+            timestamps=self.timestamps[events],
+            case_offsets=offsets,
+            case_labels=self._case_labels[case_codes],
+            activity_labels=self.activity_labels,
+            name=self.name,
+            case_column=self.case_column,
+            source_id=self.source_id,
+        )
+        sub_log._terminal_activity = self.terminal_activity()
+        return sub_log
+
+    def cases_started_between(self, start: int, end: int) -> "EventLog":
+        """
+        Sub-log of the cases whose first event lies in [start, end)
+
+        Args:
+            start: Window start (epoch seconds, inclusive)
+            end: Window end (epoch seconds, exclusive)
+
+        Returns:
+            Event log of the matching cases (this log if every case matches)
+        """
+        order, sorted_starts = self.case_start_index()
+        first, last = np.searchsorted(sorted_starts, (start, end), side="left")
+        if first == 0 and last == self.num_cases:
+            return self
+        return self.select_cases(np.sort(order[first:last]))
+
+
+class _Dictionary:
+    """Incrementally built label -> code dictionary"""
+
+    def __init__(self) -> None:
+        self.codes: dict[str, int] = {}
+
+    def encode(self, values: Sequence[str]) -> NDArray[np.int64]:
+        """
+        Encode a batch of labels, assigning new codes in first-seen order
+
+        Args:
+            values: Labels to encode
+
+        Returns:
+            int64 array of codes
+        """
+        uniques, inverse = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+        codes = self.codes
+        lookup = np.fromiter(
+            (codes.setdefault(label, len(codes)) for label in uniques.tolist()),
+            dtype=np.int64,
+            count=len(uniques),
+        )
+        return lookup[inverse]
+
+    def labels(self) -> NDArray[np.str_]:
+        """Labels ordered by code"""
+        return np.asarray(list(self.codes), dtype=str)
+
+
+class EventLogBuilder:
+    """
+    Builds an EventLog from batches of raw columns
+
+    Every batch is dictionary-encoded and its timestamps parsed as soon as it
+    is appended, so only integer columns are kept in memory while parsing.
+    """
+
+    def __init__(
+        self,
+        name: str = "",
+        case_column: str = "case_id",
+        source_id: Optional[str] = None,
+    ) -> None:
+        self.name = name
+        self.case_column = case_column
+        self.source_id = source_id
+        self._cases = _Dictionary()
+        self._activities = _Dictionary()
+        self._case_chunks: List[NDArray[Any]] = []
+        self._activity_chunks: List[NDArray[Any]] = []
+        self._timestamp_chunks: List[NDArray[Any]] = []
+        self.num_events = 0
+
+    def append(
+        self, cases: Sequence[str], activities: Sequence[str], timestamps: Sequence[str]
+    ) -> None:
+        """
+        Encode and append a batch of events
+
+        Args:
+            cases: Case identifier per event
+            activities: Activity name per event
+            timestamps: Timestamp string per event
+        """
+        if not cases:
+            return
+        self._case_chunks.append(self._cases.encode(cases))
+        self._activity_chunks.append(
+            self._activities.encode(activities).astype(np.int32)
+        )
+        self._timestamp_chunks.append(parse_timestamps(timestamps))
+        self.num_events += len(cases)
+
+    def build(self) -> EventLog:
+        """
+        Assemble the encoded batches into a sorted event log
+
+        Returns:
+            Encoded event log
+        """
+
+        def concat(chunks: List[NDArray[Any]], dtype: Any) -> NDArray[Any]:
+            return np.concatenate(chunks) if chunks else np.zeros(0, dtype=dtype)
+
+        return EventLog(
+            case_codes=concat(self._case_chunks, np.int64),
+            activity_codes=concat(self._activity_chunks, np.int32),
+            timestamps=concat(self._timestamp_chunks, np.int64),
+            case_labels=self._cases.labels(),
+            activity_labels=self._activities.labels(),
+            name=self.name,
+            case_column=self.case_column,
+            source_id=self.source_id,
+        )
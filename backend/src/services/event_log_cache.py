@@ -0,0 +1,161 @@
+"""
+Local Event Log Cache
+
+Keeps downloaded copies of uploaded event logs (binary .evlog files, or the
+CSV of uploads that predate the binary format) on local disk so they can be
+memory-mapped or handed to worker processes without another download.
+
+Files are named after the uploaded file id. The directory is capped by size:
+after every download the least recently used files are deleted until the
+total is under the limit. A file that is still memory-mapped stays readable
+after deletion on POSIX systems, so eviction never breaks a loaded log.
+"""
+
+import logging
+import os
+import stat
+import tempfile
+from typing import Any, List, Tuple
+
+from src.services.event_log_format import FILE_EXTENSION
+
+logger = logging.getLogger(__name__)
+
+CACHED_EXTENSIONS = (FILE_EXTENSION, ".csv")
+
+
+def default_cache_dir() -> str:
+    """Per-user application cache directory (XDG_CACHE_HOME or ~/.cache)"""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "tessely", "event-logs")
+
+
+class EventLogCache:
+    """
+    Size-bounded LRU directory of downloaded event logs
+
+    Recency is the file's modification time, refreshed on every cache hit.
+    """
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        """
+        Args:
+            directory: Cache directory, created private to the current user
+            max_bytes: Total size above which least recently used files are
+                deleted (0: unbounded)
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.evictions = 0
+
+    def fetch(self, bucket: Any, object_path: str, file_name: str) -> str:
+        """
+        Return the local copy of a storage object, downloading it if missing
+
+        Args:
+            bucket: Storage bucket proxy holding the object
+            object_path: Path of the object in the bucket
+            file_name: Name of the cached file
+
+        Returns:
+            Local path of the cached file
+        """
+        path = os.path.join(self.directory, file_name)
+        try:
+            os.utime(path)
+            return path
+        except FileNotFoundError:
+            pass
+
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        contents = bucket.download(object_path)
+        with tempfile.NamedTemporaryFile(dir=self.directory, delete=False) as partial:
+            partial.write(contents)
+        os.replace(partial.name, path)
+        self._evict(keep=path)
+        return path
+
+    def remove(self, file_id: Any) -> None:
+        """
+        Delete the cached copies of an uploaded file
+
+        Args:
+            file_id: Id of the deleted upload
+        """
+        for extension in CACHED_EXTENSIONS:
+            try:
+                os.remove(os.path.join(self.directory, f"{file_id}{extension}"))
+            except FileNotFoundError:
+                pass
+
+    def recent(self, extension: str, limit: int) -> List[Tuple[str, str]]:
+        """
+        Most recently used cached files of one kind
+
+        Only files this cache wrote (named after a numeric file id, in a
+        directory owned by and private to the current user) are listed.
+
+        Args:
+            extension: File extension, e.g. FILE_EXTENSION
+            limit: Maximum number of files
+
+        Returns:
+            List of (file id, path), most recently used first
+        """
+        if not self._is_private():
+            return []
+        entries = []
+        for entry in self._entries():
+            file_id, _, suffix = entry.name.partition(".")
+            if f".{suffix}" == extension and file_id.isdigit():
+                entries.append((entry.stat().st_mtime, file_id, entry.path))
+        entries.sort(reverse=True)
+        return [(file_id, path) for _, file_id, path in entries[:limit]]
+
+    def _is_private(self) -> bool:
+        """True if the directory is owned by this user and closed to others"""
+        try:
+            info = os.stat(self.directory)
+        except FileNotFoundError:
+            return False
+        if hasattr(os, "getuid") and info.st_uid != os.getuid():
+            logger.warning("Ignoring foreign event log cache %s", self.directory)
+            return False
+        if info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            logger.warning("Ignoring shared event log cache %s", self.directory)
+            return False
+        return True
+
+    def _entries(self) -> List[os.DirEntry[str]]:
+        """Cached files (partial downloads excluded)"""
+        try:
+            with os.scandir(self.directory) as entries:
+                return [
+                    entry
+                    for entry in entries
+                    if entry.is_file() and entry.name.endswith(CACHED_EXTENSIONS)
+                ]
+        except FileNotFoundError:
+            return []
+
+    def _evict(self, keep: str) -> None:
+        """Delete least recently used files until the cache fits max_bytes"""
+        if self.max_bytes <= 0:
+            return
+        entries = [(entry.stat(), entry.path) for entry in self._entries()]
+        total = sum(info.st_size for info, _ in entries)
+        entries.sort(key=lambda item: item[0].st_mtime)
+        for info, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            total -= info.st_size
+            self.evictions += 1
+            logger.debug("Evicted cached event log %s", path)
@@ -0,0 +1,197 @@
+"""
+Binary Event Log Format
+
+This module reads and writes the compact, memory-mappable binary layout that
+uploaded event logs are converted to, so that analyses never re-parse CSV.
+
+Layout (little-endian)::
+
+    MAGIC (8 bytes) | header length (uint64) | JSON header | arrays...
+
+The JSON header records the log metadata and the dtype, shape and byte offset
+(relative to the end of the header) of every column. The header is padded so
+that every column starts on a 64-byte boundary and is stored as a
+raw NumPy buffer, so loading is a zero-copy view over an mmap of the file.
+
+Version 2 adds the per-day rollup cube of the log as ``rollup_*`` columns, so
+it is materialized once at ingest; rollup columns that are not Rollup fields
+are ignored when loading. Version 1 files are still readable; their rollups
+are built on first use.
+"""
+
+import json
+import logging
+import mmap
+import struct
+from typing import Any, BinaryIO
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.services.event_log import EventLog
+from src.services.rollups import Rollup, rollup_for
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"TEVLOG\x00\x01"
+FORMAT_VERSION = 2
+SUPPORTED_VERSIONS = (1, 2)
+FILE_EXTENSION = ".evlog"
+_ALIGNMENT = 64
+_LENGTH = struct.Struct("<Q")
+_ROLLUP_PREFIX = "rollup_"
+
+
+def _pad(size: int) -> int:
+    """Number of padding bytes needed to align size to the array alignment"""
+    return -size % _ALIGNMENT
+
+
+def _narrowest_int(
+    values: NDArray[np.integer[Any]], upper_bound: int
+) -> NDArray[np.integer[Any]]:
+    """Cast integer codes to int32 when they fit, keeping int64 otherwise"""
+    if upper_bound < np.iinfo(np.int32).max:
+        return values.astype("<i4", copy=False)
+    return values.astype("<i8", copy=False)
+
+
+def _encode_labels(labels: NDArray[Any]) -> NDArray[np.bytes_]:
+    """Encode string labels as fixed-width UTF-8 bytes"""
+    if labels.dtype.kind == "S":
+        return labels
+    return np.char.encode(labels.astype(str), "utf-8")
+
+
+def write_event_log(log: EventLog, target: BinaryIO) -> int:
+    """
+    Serialize an event log into the binary layout
+
+    Args:
+        log: Event log to serialize
+        target: Writable binary file object
+
+    Returns:
+        Number of bytes written
+    """
+    columns = {
+        "case_codes": _narrowest_int(log.case_codes, log.num_cases),
+        "activity_codes": _narrowest_int(log.activity_codes, log.num_activities),
+        "timestamps": log.timestamps.astype("<i8", copy=False),
+        "case_offsets": log.case_offsets.astype("<i8", copy=False),
+        "case_labels": _encode_labels(log._case_labels),
+        "activity_labels": _encode_labels(log.activity_labels),
+    }
+    for name, values in rollup_for(log).columns().items():
+        columns[f"{_ROLLUP_PREFIX}{name}"] = np.ascontiguousarray(
+            values, dtype=values.dtype.newbyteorder("<")
+        )
+
+    # Column offsets are relative to the (aligned) start of the data section
+    layout: dict[str, dict[str, Any]] = {}
+    offset = 0
+    for name, values in columns.items():
+        layout[name] = {
+            "dtype": values.dtype.str,
+            "shape": list(values.shape),
+            "offset": offset,
+        }
+        offset += values.nbytes + _pad(values.nbytes)
+
+    header = json.dumps(
+        {
+            "version": FORMAT_VERSION,
+            "name": log.name,
+            "case_column": log.case_column,
+            "source_id": log.source_id,
+            "columns": layout,
+        }
+    ).encode()
+    header += b" " * _pad(len(MAGIC) + _LENGTH.size + len(header))
+
+    target.write(MAGIC)
+    target.write(_LENGTH.pack(len(header)))
+    target.write(header)
+    for values in columns.values():
+        target.write(np.ascontiguousarray(values).tobytes())
+        target.write(b"\0" * _pad(values.nbytes))
+
+    total = len(MAGIC) + _LENGTH.size + len(header) + offset
+    logger.debug("Serialized event log %s (%d bytes)", log.name, total)
+    return total
+
+
+def save_event_log(log: EventLog, path: str) -> int:
+    """
+    Write an event log to a file in the binary layout
+
+    Args:
+        log: Event log to serialize
+        path: Destination file path
+
+    Returns:
+        Number of bytes written
+    """
+    with open(path, "wb") as target:
+        return write_event_log(log, target)
+
+
+def load_event_log(path: str) -> EventLog:
+    """
+    Memory-map a binary event log
+
+    The returned log's columns are read-only views over the mapped file, so
+    loading costs no parsing and pages are only read when touched.
+
+    Args:
+        path: Path of a file written by save_event_log
+
+    Returns:
+        Event log backed by the mapped file
+
+    Raises:
+        ValueError: If the file is not a binary event log
+    """
+    with open(path, "rb") as source:
+        buffer = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if buffer[: len(MAGIC)] != MAGIC:
+        buffer.close()
+        raise ValueError(f"{path} is not a binary event log")
+
+    (header_length,) = _LENGTH.unpack_from(buffer, len(MAGIC))
+    header_start = len(MAGIC) + _LENGTH.size
+    data_start = header_start + header_length
+    header = json.loads(bytes(buffer[header_start:data_start]))
+    if header.get("version") not in SUPPORTED_VERSIONS:
+        buffer.close()
+        raise ValueError(f"Unsupported event log version: {header.get('version')}")
+
+    columns = {}
+    for name, spec in header["columns"].items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"]))
+        columns[name] = np.frombuffer(
+            buffer, dtype=dtype, count=count, offset=data_start + spec["offset"]
+        )
+
+    log = EventLog.from_sorted(
+        case_codes=columns["case_codes"],
+        activity_codes=columns["activity_codes"],
+        timestamps=columns["timestamps"],
+        case_offsets=columns["case_offsets"],
+        case_labels=columns["case_labels"],
+        activity_labels=np.char.decode(columns["activity_labels"], "utf-8"),
+        name=header["name"],
+        case_column=header["case_column"],
+        source_id=header["source_id"],
+    )
+
+    rollup_columns = {
+        name[len(_ROLLUP_PREFIX) :]: values
+        for name, values in columns.items()
+        if name.startswith(_ROLLUP_PREFIX)
+    }
+    if rollup_columns:
+        log.rollup = Rollup.from_columns(rollup_columns)
+    return log
@@ -0,0 +1,202 @@
+"""
+Uploaded File Listing
+
+Pages through a user's uploaded files newest first with keyset pagination on
+(uploaded_at, id): each page is an index range scan that starts where the
+previous page ended, so its cost does not grow with the upload history the
+way an OFFSET does. Backed by an index on (user_id, uploaded_at desc, id desc).
+
+Total counts are cached per user for a short time, and dropped when the user
+uploads or deletes a file, instead of being recounted on every page.
+"""
+
+import base64
+import binascii
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+from postgrest.types import CountMethod
+
+from src.core.constants import Uploads
+from src.core.supabase_client import ScopedSupabaseClient
+
+logger = logging.getLogger(__name__)
+
+Cursor = Tuple[str, int]
+
+
+def encode_cursor(row: Dict[str, Any]) -> str:
+    """
+    Encode the position after a row as an opaque cursor
+
+    Args:
+        row: Last uploaded_csv_files row of a page, with uploaded_at and id
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = orjson.dumps([row["uploaded_at"], row["id"]])
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """
+    Decode a cursor from encode_cursor()
+
+    Args:
+        cursor: Cursor string from a previous page
+
+    Returns:
+        (uploaded_at, id) of the last row of the previous page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        uploaded_at, file_id = orjson.loads(payload)
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError):
+        raise ValueError("Invalid cursor") from None
+    if not isinstance(uploaded_at, str) or not isinstance(file_id, int):
+        raise ValueError("Invalid cursor")
+    return uploaded_at, file_id
+
+
+def list_files_page(
+    supabase: ScopedSupabaseClient,
+    user_id: str,
+    limit: int,
+    cursor: Optional[Cursor] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Fetch one page of a user's uploaded files, newest first
+
+    Args:
+        supabase: Client scoped to the user
+        user_id: Owner of the uploaded files
+        limit: Maximum number of files on the page
+        cursor: Position after which the page starts (None: first page)
+
+    Returns:
+        Tuple of (list view rows, cursor of the next page or None on the last)
+    """
+    query = (
+        supabase.table(Uploads.TABLE)
+        .select(Uploads.LIST_COLUMNS)
+        .eq("user_id", user_id)
+    )
+    if cursor is not None:
+        uploaded_at, file_id = cursor
+        query = query.or_(
+            f'uploaded_at.lt."{uploaded_at}",'
+            f'and(uploaded_at.eq."{uploaded_at}",id.lt.{file_id})'
+        )
+    # One extra row tells whether another page follows
+    response = (
+        query.order("uploaded_at", desc=True)
+        .order("id", desc=True)
+        .limit(limit + 1)
+        .execute()
+    )
+    rows = response.data or []
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1])
+
+
+def count_files(supabase: ScopedSupabaseClient, user_id: str) -> int:
+    """
+    Count a user's uploaded files without fetching them
+
+    Args:
+        supabase: Client scoped to the user
+        user_id: Owner of the uploaded files
+
+    Returns:
+        Number of uploaded files
+    """
+    response = (
+        supabase.table(Uploads.TABLE)
+        .select("id", count=CountMethod.exact, head=True)
+        .eq("user_id", user_id)
+        .execute()
+    )
+    return response.count or 0
+
+
+class FileCountCache:
+    """
+    Bounded LRU + TTL cache of uploaded file counts per user
+
+    Uploads and deletes handled by this process invalidate a user's count;
+    the TTL bounds how stale a count changed through another worker can be.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, Tuple[int, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, user_id: str) -> Optional[int]:
+        """
+        Cached file count of a user
+
+        Args:
+            user_id: Owner of the uploaded files
+
+        Returns:
+            File count, or None if not cached or expired
+        """
+        entry = self._entries.get(user_id)
+        if entry is None or entry[1] <= time.monotonic():
+            self._entries.pop(user_id, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, user_id: str, count: int) -> None:
+        """
+        Cache the file count of a user
+
+        Args:
+            user_id: Owner of the uploaded files
+            count: Number of uploaded files
+        """
+        if self.max_entries <= 0:
+            return
+        self._entries[user_id] = (count, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate_user(self, user_id: str) -> None:
+        """
+        Drop the cached count of a user
+
+        Args:
+            user_id: User who uploaded or deleted files
+        """
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Drop all cached counts"""
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Cache counters and current size"""
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
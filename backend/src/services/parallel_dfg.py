@@ -0,0 +1,424 @@
+"""
+Parallel Directly-Follows Discovery
+
+This module spreads directly-follows discovery of large event logs over a
+pool of worker processes. Cases are sharded across workers; because the log
+is sorted by case, every shard is a contiguous run of whole cases, so no
+transition crosses a shard boundary and partial aggregates merge by addition.
+
+The event columns are copied once into shared memory, which the workers
+attach without copying. Discovery then runs in two passes:
+
+1. map: every shard counts its activities, visited (case, activity) pairs and
+   transitions, and sorts its packed (edge, duration) keys into a shared
+   output buffer
+2. reduce: the sorted keys are split into ranges of whole edges with similar
+   transition counts, and each range merges the sorted runs of all shards to
+   compute exact frequency, mean, median and p95 durations of its edges
+"""
+
+import logging
+import multiprocessing
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.services.dfg_miner import (
+    MAX_PACKED_GROUPS,
+    PACKED_VALUE_BITS,
+    PACKED_VALUE_MASK,
+    DirectlyFollowsGraph,
+    run_quantiles,
+)
+from src.services.event_log import EventLog
+from src.services.rollups import case_completion
+
+logger = logging.getLogger(__name__)
+
+# Smallest shard worth sending to a worker process
+MIN_EVENTS_PER_SHARD = 250_000
+
+# Sorted keys sampled per shard to choose the reduce ranges
+_SPLIT_SAMPLES_PER_SHARD = 1024
+
+# Name -> (byte offset, dtype, length) of the arrays in a shared memory block
+Layout = Dict[str, Tuple[int, str, int]]
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """Get the discovery process pool, (re)starting it for a new worker count"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # Forking a process that runs threads (Supabase pool, event loop) is unsafe
+            _pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            _pool_workers = workers
+        return _pool
+
+
+def _ready(_: int) -> bool:
+    """No-op task that makes a worker import this module"""
+    return True
+
+
+def start_discovery_pool(workers: int) -> None:
+    """
+    Spawn the discovery worker processes ahead of the first large log
+
+    Args:
+        workers: Number of worker processes
+    """
+    list(_get_pool(workers).map(_ready, range(workers)))
+
+
+def shutdown_discovery_pool() -> None:
+    """Stop the discovery worker processes"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+def can_discover_in_parallel(log: EventLog, workers: int) -> bool:
+    """
+    Whether a log is large enough (and packable) for parallel discovery
+
+    Args:
+        log: Event log sorted by (case, timestamp)
+        workers: Configured number of worker processes
+
+    Returns:
+        True if at least two shards of MIN_EVENTS_PER_SHARD events result
+    """
+    return (
+        workers > 1
+        and log.num_events >= 2 * MIN_EVENTS_PER_SHARD
+        and log.num_activities * log.num_activities <= MAX_PACKED_GROUPS
+        and int(np.diff(log.timestamps).max(initial=0)) <= PACKED_VALUE_MASK
+    )
+
+
+def _views(
+    block: shared_memory.SharedMemory, layout: Layout
+) -> Dict[str, NDArray[Any]]:
+    """Arrays of a shared memory block (must be released before it is closed)"""
+    return {
+        key: np.ndarray((length,), dtype=dtype, buffer=block.buf, offset=offset)
+        for key, (offset, dtype, length) in layout.items()
+    }
+
+
+@contextmanager
+def _attached(name: str) -> Iterator[shared_memory.SharedMemory]:
+    """Attach the parent's shared memory block in a worker process"""
+    # Spawned workers share the parent's resource tracker, so attaching does not
+    # take ownership: the block is unlinked by the parent only
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        yield block
+    finally:
+        block.close()
+
+
+def _map_shard(
+    name: str, layout: Layout, shard: Tuple[int, int], num_activities: int
+) -> Dict[str, NDArray[Any]]:
+    """
+    Aggregate one shard of whole cases (runs in a worker process)
+
+    Writes the shard's sorted packed transition keys and per-case distinct
+    activity counts into the shared block.
+
+    Args:
+        name: Shared memory block name
+        layout: Arrays of the block
+        shard: (first case, end case) of the shard
+        num_activities: Activities of the log
+
+    Returns:
+        Per-activity partial counts and duration sums of the shard
+    """
+    with _attached(name) as block:
+        return _aggregate_shard(_views(block, layout), shard, num_activities)
+
+
+def _aggregate_shard(
+    arrays: Dict[str, NDArray[Any]], shard: Tuple[int, int], num_activities: int
+) -> Dict[str, NDArray[Any]]:
+    """Body of _map_shard, working on views of the shared block"""
+    first_case, end_case = shard
+    offsets = arrays["case_offsets"][first_case : end_case + 1]
+    lo, hi = int(offsets[0]), int(offsets[-1])
+    activities = arrays["activity_codes"][lo:hi]
+    timestamps = arrays["timestamps"][lo:hi]
+    lengths = np.diff(offsets)
+    cases = np.repeat(np.arange(end_case - first_case), lengths)
+
+    same_case = cases[1:] == cases[:-1]
+    sources = activities[:-1][same_case]
+    targets = activities[1:][same_case]
+    durations = np.diff(timestamps)[same_case]
+
+    keys = arrays["transition_keys"][lo - first_case : hi - end_case]
+    np.left_shift(
+        sources.astype(np.int64) * num_activities + targets,
+        PACKED_VALUE_BITS,
+        out=keys,
+    )
+    keys |= durations
+    keys.sort()
+
+    visited = np.unique(cases * num_activities + activities)
+    visited_cases, visited_activities = np.divmod(visited, num_activities)
+    arrays["distinct_activities"][first_case:end_case] = np.bincount(
+        visited_cases, minlength=end_case - first_case
+    )
+    completed = arrays["completed"][first_case:end_case]
+
+    return {
+        "activity_case_counts": np.bincount(
+            visited_activities, minlength=num_activities
+        ),
+        "activity_completed_cases": np.bincount(
+            visited_activities,
+            weights=completed[visited_cases].astype(np.float64),
+            minlength=num_activities,
+        ),
+        "activity_outgoing": np.bincount(sources, minlength=num_activities),
+        "activity_seconds_to_next": np.bincount(
+            sources, weights=durations.astype(np.float64), minlength=num_activities
+        ),
+    }
+
+
+def _reduce_range(
+    name: str, layout: Layout, segments: List[Tuple[int, int]]
+) -> Dict[str, NDArray[Any]]:
+    """
+    Edge statistics of one range of whole edges (runs in a worker process)
+
+    Args:
+        name: Shared memory block name
+        layout: Arrays of the block
+        segments: (start, end) of the range in every shard's sorted keys
+
+    Returns:
+        Edge keys with their counts, duration sums, medians and p95s
+    """
+    with _attached(name) as block:
+        packed = _gather_segments(_views(block, layout)["transition_keys"], segments)
+    # Concatenated sorted runs; the sort only has to merge them
+    packed.sort(kind="stable")
+
+    edge_keys = packed >> PACKED_VALUE_BITS
+    durations = (packed & PACKED_VALUE_MASK).astype(np.float64)
+    if len(packed) == 0:
+        empty = np.zeros(0, dtype=np.float64)
+        return {
+            "edge_keys": edge_keys,
+            "counts": np.zeros(0, dtype=np.int64),
+            "seconds_sum": empty,
+            "median_seconds": empty,
+            "p95_seconds": empty,
+        }
+
+    is_start = np.empty(len(edge_keys), dtype=bool)
+    is_start[0] = True
+    np.not_equal(edge_keys[1:], edge_keys[:-1], out=is_start[1:])
+    starts = np.flatnonzero(is_start)
+    counts = np.diff(np.append(starts, len(edge_keys)))
+    median, p95 = run_quantiles(durations, starts, counts, (0.5, 0.95))
+
+    return {
+        "edge_keys": edge_keys[starts],
+        "counts": counts,
+        "seconds_sum": np.add.reduceat(durations, starts),
+        "median_seconds": median,
+        "p95_seconds": p95,
+    }
+
+
+def _gather_segments(
+    keys: NDArray[np.int64], segments: List[Tuple[int, int]]
+) -> NDArray[np.int64]:
+    """Copy segments of the shared sorted keys into one array"""
+    return np.concatenate([keys[start:end] for start, end in segments])
+
+
+def _case_shards(log: EventLog, num_shards: int) -> List[Tuple[int, int]]:
+    """Split the cases into contiguous runs with similar event counts"""
+    targets = np.arange(1, num_shards) * log.num_events // num_shards
+    bounds = np.unique(
+        np.concatenate(
+            ([0], np.searchsorted(log.case_offsets, targets), [log.num_cases])
+        )
+    )
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
+def _range_splits(
+    keys: NDArray[np.int64], runs: List[Tuple[int, int]], num_ranges: int
+) -> NDArray[np.int64]:
+    """Packed keys at edge starts that divide the transitions into ranges"""
+    samples = np.concatenate(
+        [
+            keys[start:end][:: max((end - start) // _SPLIT_SAMPLES_PER_SHARD, 1)]
+            for start, end in runs
+        ]
+    )
+    if len(samples) == 0:
+        return np.zeros(0, dtype=np.int64)
+    samples.sort()
+    picks = samples[np.arange(1, num_ranges) * len(samples) // num_ranges]
+    # Round down to the start of the edge, so an edge never spans two ranges
+    splits: NDArray[np.int64] = np.unique(
+        (picks >> PACKED_VALUE_BITS) << PACKED_VALUE_BITS
+    )
+    return splits
+
+
+def discover_parallel(
+    log: EventLog, workers: int
+) -> Tuple[
+    DirectlyFollowsGraph, NDArray[np.float64], NDArray[np.bool_], NDArray[np.bool_]
+]:
+    """
+    Discover the directly-follows graph and case outcomes on worker processes
+
+    Produces the same results as case_outcomes() and discover_dfg().
+
+    Args:
+        log: Event log sorted by (case, timestamp)
+        workers: Number of worker processes
+
+    Returns:
+        Tuple of (graph, cycle seconds, completed flags, straight-through flags)
+    """
+    num_activities = log.num_activities
+    cycle_seconds, completed = case_completion(log)
+    shards = _case_shards(
+        log, min(workers, max(log.num_events // MIN_EVENTS_PER_SHARD, 1))
+    )
+
+    columns: Dict[str, NDArray[Any]] = {
+        "case_offsets": log.case_offsets,
+        "activity_codes": log.activity_codes,
+        "timestamps": log.timestamps,
+        "completed": completed,
+    }
+    sizes = {
+        "transition_keys": (np.dtype(np.int64), log.num_events - log.num_cases),
+        "distinct_activities": (np.dtype(np.int64), log.num_cases),
+    }
+    for key, values in columns.items():
+        sizes[key] = (values.dtype, len(values))
+
+    layout: Layout = {}
+    size = 0
+    for key, (dtype, length) in sizes.items():
+        layout[key] = (size, dtype.str, length)
+        size += -(-dtype.itemsize * length // 8) * 8
+
+    block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    views = _views(block, layout)
+    keys: Optional[NDArray[np.int64]] = None
+    try:
+        for key, values in columns.items():
+            views[key][:] = values
+
+        pool = _get_pool(workers)
+        partials = list(
+            pool.map(
+                _map_shard,
+                *zip(
+                    *[(block.name, layout, shard, num_activities) for shard in shards]
+                ),
+            )
+        )
+
+        # Shard i's sorted keys start after the transitions of the shards before it
+        keys = views["transition_keys"]
+        runs = [
+            (int(log.case_offsets[first]) - first, int(log.case_offsets[end]) - end)
+            for first, end in shards
+        ]
+        splits = _range_splits(keys, runs, len(shards))
+        cuts = [
+            [start, *(start + np.searchsorted(keys[start:end], splits)).tolist(), end]
+            for start, end in runs
+        ]
+        ranges = [
+            [(run_cuts[i], run_cuts[i + 1]) for run_cuts in cuts]
+            for i in range(len(splits) + 1)
+        ]
+        reduced = list(
+            pool.map(_reduce_range, *zip(*[(block.name, layout, r) for r in ranges]))
+        )
+
+        distinct = views["distinct_activities"].copy()
+    finally:
+        # Views must be released before the block can be closed
+        keys = None
+        views.clear()
+        block.close()
+        block.unlink()
+
+    def total(field: str) -> NDArray[Any]:
+        summed: NDArray[Any] = np.sum([partial[field] for partial in partials], axis=0)
+        return summed
+
+    def joined(field: str) -> NDArray[Any]:
+        return np.concatenate([part[field] for part in reduced])
+
+    edge_keys = joined("edge_keys")
+    edge_counts = joined("counts")
+    outgoing = total("activity_outgoing")
+    graph = DirectlyFollowsGraph(
+        activity_labels=log.activity_labels,
+        edge_sources=edge_keys // num_activities,
+        edge_targets=edge_keys % num_activities,
+        edge_counts=edge_counts,
+        edge_mean_seconds=joined("seconds_sum") / np.maximum(edge_counts, 1),
+        edge_median_seconds=joined("median_seconds"),
+        edge_p95_seconds=joined("p95_seconds"),
+        activity_case_counts=total("activity_case_counts"),
+        activity_completed_cases=total("activity_completed_cases"),
+        activity_outgoing=outgoing,
+        activity_mean_to_next_seconds=np.divide(
+            total("activity_seconds_to_next"),
+            outgoing,
+            out=np.zeros(num_activities, dtype=np.float64),
+            where=outgoing > 0,
+        ),
+        start_counts=np.bincount(
+            log.activity_codes[log.case_first_index], minlength=num_activities
+        ),
+        end_counts=np.bincount(
+            log.activity_codes[log.case_last_index], minlength=num_activities
+        ),
+    )
+    straight_through = distinct == np.diff(log.case_offsets)
+
+    logger.debug(
+        "Discovered DFG with %d activities and %d edges from %d events in %d shards",
+        num_activities,
+        len(edge_keys),
+        log.num_events,
+        len(shards),
+    )
+    return graph, cycle_seconds, completed, straight_through
@@ -0,0 +1,49 @@
+"""
+Process Index
+
+This module maps the process ids of one dataset version to their uploaded
+files and computed process records, so a single process can be looked up with
+one hash probe and computed on its own.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.services.process_mining_engine import process_id_for
+
+
+class ProcessIndex:
+    """
+    process_id -> process record index of one dataset version
+
+    Every uploaded file is known up front; process records are filled in
+    lazily, either one at a time or in bulk from a full analysis.
+    """
+
+    def __init__(self, records: Iterable[Dict[str, Any]]) -> None:
+        """
+        Initialize the index from the dataset's file rows
+
+        Args:
+            records: uploaded_csv_files rows of the dataset
+        """
+        self.records: Dict[str, Dict[str, Any]] = {
+            process_id_for(str(record["id"])): record for record in records
+        }
+        self._processes: Dict[str, Dict[str, Any]] = {}
+
+    def get(self, process_id: str) -> Optional[Dict[str, Any]]:
+        """Computed process record, or None if not computed yet"""
+        return self._processes.get(process_id)
+
+    def record(self, process_id: str) -> Optional[Dict[str, Any]]:
+        """File row a process is computed from, or None for unknown ids"""
+        return self.records.get(process_id)
+
+    def add(self, process: Dict[str, Any]) -> None:
+        """Store a computed process record"""
+        self._processes[process["process_id"]] = process
+
+    def add_all(self, processes: List[Dict[str, Any]]) -> None:
+        """Store every process record of a full analysis"""
+        for process in processes:
+            self.add(process)
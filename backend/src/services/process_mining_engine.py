@@ -0,0 +1,282 @@
+"""
+Process Mining Engine
+
+This module computes the process mining response structures (processes,
+graphs, case roots and overall metrics) from columnar event logs. Every
+statistic is derived with vectorized NumPy passes over the event columns; the
+only Python-level loops run over the (small) output nodes and edges.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.core.constants import ProcessMining
+from src.services.dfg_miner import DirectlyFollowsGraph, discover_dfg
+from src.services.event_log import EventLog
+from src.services.parallel_dfg import can_discover_in_parallel, discover_parallel
+from src.services.rollups import case_outcomes
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_MINUTE = 60.0
+SECONDS_PER_DAY = 86400.0
+
+
+def _safe_ratio(numerator: float, denominator: float) -> float:
+    """Return numerator / denominator, or 0.0 when the denominator is zero"""
+    return float(numerator) / float(denominator) if denominator else 0.0
+
+
+def process_id_for(source_id: str) -> str:
+    """Process id reported for the event log of an uploaded file"""
+    return f"proc_{source_id}"
+
+
+def _format_date(epoch_seconds: int) -> str:
+    """Format epoch seconds as YYYY-MM-DD (UTC)"""
+    return datetime.fromtimestamp(epoch_seconds, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+class ProcessMiningEngine:
+    """Computes process mining data from columnar event logs"""
+
+    def __init__(self, workers: int = 1):
+        """
+        Initialize engine
+
+        Args:
+            workers: Worker processes used to discover large logs (1: in-process)
+        """
+        self.workers = workers
+
+    def analyze(
+        self,
+        logs: Sequence[EventLog],
+        client_id: str = "",
+        industry: Optional[str] = None,
+        time_window: Optional[Tuple[int, int]] = None,
+        case_roots: Optional[Dict[str, Dict[str, str]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Compute the complete process mining data for a set of event logs
+
+        Each event log is reported as one process.
+
+        Args:
+            logs: Event logs to analyze
+            client_id: Client identifier for the metadata block
+            industry: Industry reported in the metadata block
+            time_window: (start, end) epoch seconds the logs were filtered to,
+                reported as the time range instead of the data's extent
+            case_roots: Inferred case root per log source_id (logs without one
+                are their own case root)
+
+        Returns:
+            Process mining data dictionary matching ProcessMiningDataResponse
+        """
+        logs = [log for log in logs if log.num_events > 0]
+        total_cases = sum(log.num_cases for log in logs)
+        case_roots = case_roots or {}
+        processes = [
+            self.build_process(
+                log,
+                total_cases,
+                case_roots.get(log.source_id) if log.source_id is not None else None,
+            )
+            for log in logs
+        ]
+
+        if time_window is not None:
+            time_range = {
+                "start": _format_date(time_window[0]),
+                "end": _format_date(time_window[1] - 1),
+            }
+        elif logs:
+            start = min(int(log.timestamps.min()) for log in logs)
+            end = max(int(log.timestamps.max()) for log in logs)
+            time_range = {"start": _format_date(start), "end": _format_date(end)}
+        else:
+            today = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d")
+            time_range = {"start": today, "end": today}
+
+        return {
+            "schema_version": ProcessMining.SCHEMA_VERSION,
+            "metadata": {
+                "industry": industry or ProcessMining.DEFAULT_INDUSTRY,
+                "client_id": client_id,
+                "source_system": ProcessMining.SOURCE_SYSTEM,
+                "analysis_timestamp": datetime.now().isoformat() + "Z",
+                "time_range": time_range,
+            },
+            "overall_metrics": self.overall_metrics(processes),
+            "case_roots": self.case_roots(processes),
+            "processes": processes,
+        }
+
+    def build_process(
+        self,
+        log: EventLog,
+        total_cases: Optional[int] = None,
+        case_root: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Compute the process record and graph for a single event log
+
+        Args:
+            log: Event log sorted by (case, timestamp)
+            total_cases: Cases across all analyzed logs, for case_percentage
+                (defaults to this log's cases)
+            case_root: Table and key the case column references (defaults to
+                the log itself and its case column)
+
+        Returns:
+            Process dictionary matching ProcessModel
+        """
+        num_cases = log.num_cases
+        if can_discover_in_parallel(log, self.workers):
+            dfg, cycle_seconds, completed, straight_through = discover_parallel(
+                log, self.workers
+            )
+        else:
+            cycle_seconds, completed, straight_through = case_outcomes(log)
+            dfg = discover_dfg(log, completed)
+
+        graph = self._build_graph(dfg)
+
+        process_id = process_id_for(log.source_id or log.name)
+        return {
+            "process_id": process_id,
+            "display_name": log.name.rsplit(".", 1)[0] or process_id,
+            "case_root": case_root
+            or {
+                "root_table": log.name.rsplit(".", 1)[0] or process_id,
+                "root_primary_key": log.case_column,
+            },
+            "case_count": int(num_cases),
+            "case_percentage": _safe_ratio(num_cases, total_cases or num_cases),
+            "average_cycle_time_days": float(cycle_seconds.mean() / SECONDS_PER_DAY),
+            "process_efficiency": float(completed.mean()),
+            "straight_through_cases": int(straight_through.sum()),
+            "total_cycle_time_days": float(cycle_seconds.sum() / SECONDS_PER_DAY),
+            "graph": graph,
+        }
+
+    def _build_graph(
+        self, dfg: DirectlyFollowsGraph
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Format a directly-follows graph as graph nodes and edges
+
+        Args:
+            dfg: Discovered directly-follows graph
+
+        Returns:
+            Graph dictionary matching ProcessGraphModel
+        """
+        labels = dfg.activity_labels
+        cases_at_node = dfg.activity_case_counts
+        time_to_next_mins = dfg.activity_mean_to_next_seconds / SECONDS_PER_MINUTE
+        success_rates = dfg.activity_success_rates
+
+        nodes = []
+        for activity in np.flatnonzero(cases_at_node).tolist():
+            if dfg.start_counts[activity] * 2 >= cases_at_node[activity]:
+                node_type = "start"
+            elif dfg.end_counts[activity] * 2 >= cases_at_node[activity]:
+                node_type = "end"
+            else:
+                node_type = "middle"
+            nodes.append(
+                {
+                    "node_id": str(labels[activity]),
+                    "node_type": node_type,
+                    "node_category": ProcessMining.DEFAULT_NODE_CATEGORY,
+                    "metrics": {
+                        "case_count_at_node": int(cases_at_node[activity]),
+                        "avg_time_to_next_mins": float(time_to_next_mins[activity]),
+                        "success_rate": float(success_rates[activity]),
+                    },
+                }
+            )
+
+        edges = []
+        for source, target, count, probability, mean, median, p95 in zip(
+            dfg.edge_sources.tolist(),
+            dfg.edge_targets.tolist(),
+            dfg.edge_counts.tolist(),
+            dfg.edge_probabilities.tolist(),
+            (dfg.edge_mean_seconds / SECONDS_PER_MINUTE).tolist(),
+            (dfg.edge_median_seconds / SECONDS_PER_MINUTE).tolist(),
+            (dfg.edge_p95_seconds / SECONDS_PER_MINUTE).tolist(),
+        ):
+            source_name, target_name = str(labels[source]), str(labels[target])
+            edges.append(
+                {
+                    "edge_id": f"{source_name}->{target_name}",
+                    "from": source_name,
+                    "to": target_name,
+                    "frequency": count,
+                    "probability": probability,
+                    "average_transition_time_mins": mean,
+                    "median_transition_time_mins": median,
+                    "p95_transition_time_mins": p95,
+                    "join_columns": [],
+                }
+            )
+
+        return {"nodes": nodes, "edges": edges}
+
+    def overall_metrics(self, processes: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Combine per-process aggregates into overall metrics
+
+        Args:
+            processes: Process dictionaries produced by build_process
+
+        Returns:
+            Overall metrics dictionary matching OverallMetricsModel
+        """
+        total_cases = sum(process["case_count"] for process in processes)
+        completed_cases = sum(
+            process["process_efficiency"] * process["case_count"]
+            for process in processes
+        )
+        straight_through = sum(
+            process["straight_through_cases"] for process in processes
+        )
+        total_cycle_days = sum(
+            process["total_cycle_time_days"] for process in processes
+        )
+
+        return {
+            "total_cases_processed": total_cases,
+            "overall_process_efficiency": _safe_ratio(completed_cases, total_cases),
+            "average_cycle_time_days": _safe_ratio(total_cycle_days, total_cases),
+            "straight_through_processing_rate": _safe_ratio(
+                straight_through, total_cases
+            ),
+        }
+
+    def case_roots(self, processes: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Summarize case counts per case root table
+
+        Args:
+            processes: Process dictionaries produced by build_process
+
+        Returns:
+            List of case root dictionaries matching CaseRootModel
+        """
+        total_cases = sum(process["case_count"] for process in processes)
+        return [
+            {
+                "root_table": process["case_root"]["root_table"],
+                "root_primary_key": process["case_root"]["root_primary_key"],
+                "case_count": process["case_count"],
+                "percentage": _safe_ratio(process["case_count"], total_cases),
+            }
+            for process in processes
+        ]
@@ -4,29 +4,210 @@ Process Mining Service
 This module provides business logic for process mining operations.
 """
 
+import asyncio
+import io
 import logging
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.core.config import settings
+from src.core.constants import ProcessMining, Uploads
+from src.core.metrics import observe_stage
+from src.core.supabase_client import (
+    DataClient,
+    get_supabase_client,
+    run_supabase,
+)
+from src.services.analysis_jobs import AnalysisJobs, JobStore
+from src.services.event_log import EventLog
+from src.services.event_log_cache import EventLogCache, default_cache_dir
+from src.services.event_log_format import FILE_EXTENSION, load_event_log
+from src.services.file_listing import FileCountCache
+from src.services.parallel_dfg import shutdown_discovery_pool, start_discovery_pool
+from src.services.process_index import ProcessIndex
+from src.services.process_mining_engine import ProcessMiningEngine
+from src.services.result_cache import ResultCache, dataset_version
+from src.services.rollups import combine_rollups, rollup_for
+from src.services.schema_inference import case_root_for, infer_schema
+from src.services.time_periods import parse_time_period
+from src.services.variants import variants_for
 
 logger = logging.getLogger(__name__)
 
 
+def _file_industry(record: Dict[str, Any]) -> str:
+    """Industry an uploaded file is tagged with (untagged files use the default)"""
+    return record.get("industry") or ProcessMining.DEFAULT_INDUSTRY
+
+
+def _case_roots(
+    schema: Dict[str, Any], logs: List[EventLog]
+) -> Dict[str, Dict[str, str]]:
+    """Inferred case root of every event log whose case column joins a table"""
+    roots = {}
+    for log in logs:
+        if log.source_id is None:
+            continue
+        root = case_root_for(schema, log.name, log.case_column)
+        if root is not None:
+            roots[log.source_id] = root
+    return roots
+
+
 class ProcessMiningService:
-    """Service for process mining operations"""
+    """
+    Service for process mining operations
+
+    One instance lives for the lifetime of the application (see the lifespan
+    hook in api.py), so loaded event logs and computed results stay warm
+    between requests.
+    """
 
-    def __init__(self):
+    def __init__(self) -> None:
         """Initialize process mining service"""
+        self.engine = ProcessMiningEngine(workers=settings.DISCOVERY_WORKERS)
+        self.results = ResultCache(max_entries=settings.RESULT_CACHE_MAX_ENTRIES)
+        self.file_counts = FileCountCache(
+            max_entries=Uploads.COUNT_CACHE_MAX_ENTRIES,
+            ttl_seconds=Uploads.COUNT_CACHE_TTL_SECONDS,
+        )
+        self._process_indexes: OrderedDict[tuple[str, str], ProcessIndex] = (
+            OrderedDict()
+        )
+        self._schemas: OrderedDict[tuple[str, str], Dict[str, Any]] = OrderedDict()
+        self._loaded_logs: OrderedDict[str, EventLog] = OrderedDict()
+        self._loaded_logs_lock = threading.Lock()
+        self.event_log_cache = EventLogCache(
+            settings.EVENT_LOG_CACHE_DIR or default_cache_dir(),
+            max_bytes=settings.EVENT_LOG_CACHE_MAX_BYTES,
+        )
+        self.jobs = AnalysisJobs(
+            JobStore(
+                settings.JOB_STORE_PATH,
+                retention_seconds=settings.JOB_RETENTION_SECONDS,
+                max_finished=settings.JOB_RETENTION_MAX,
+            ),
+            max_workers=settings.JOB_WORKERS,
+        )
         logger.debug("ProcessMiningService initialized")
 
+    async def warm_up(self) -> None:
+        """
+        Prepare the service before the first request
+
+        Creates the Supabase client, runs the mining kernels once on a tiny
+        log, spawns the discovery workers and memory-maps the most recently
+        cached binary event logs.
+        """
+        await asyncio.to_thread(self._warm_up)
+
+    def _warm_up(self) -> None:
+        """Blocking part of warm_up"""
+        try:
+            get_supabase_client()
+        except Exception as e:
+            logger.warning("Supabase client warm-up failed: %s", e)
+
+        self.engine.analyze(
+            [
+                EventLog.from_columns(
+                    cases=["warm-up", "warm-up"],
+                    activities=["start", "end"],
+                    timestamps=["2025-01-01T00:00:00", "2025-01-01T01:00:00"],
+                )
+            ]
+        )
+
+        if settings.DISCOVERY_WORKERS > 1:
+            start_discovery_pool(settings.DISCOVERY_WORKERS)
+
+        cached = self.event_log_cache.recent(
+            FILE_EXTENSION, settings.LOADED_EVENT_LOGS_MAX
+        )
+        for file_id, path in cached:
+            try:
+                self._remember_log(file_id, load_event_log(path))
+            except ValueError as e:
+                logger.debug("Skipping cached event log %s: %s", path, e)
+
+        logger.info(
+            "Process mining service warmed up with %d event logs",
+            len(self._loaded_logs),
+        )
+
+    async def shutdown(self) -> None:
+        """Stop background jobs, release cached results and memory-mapped event logs"""
+        await self.jobs.shutdown()
+        await asyncio.to_thread(shutdown_discovery_pool)
+        self.results.clear()
+        self.file_counts.clear()
+        self._process_indexes.clear()
+        self._schemas.clear()
+        with self._loaded_logs_lock:
+            self._loaded_logs.clear()
+        logger.info("Process mining service shut down")
+
+    def invalidate_user(
+        self, user_id: str, removed_file_ids: Iterable[Any] = ()
+    ) -> None:
+        """
+        Forget cached state after a user's dataset changed
+
+        Args:
+            user_id: User who uploaded or deleted files
+            removed_file_ids: Ids of deleted files whose event logs (loaded and
+                cached on disk) can be released
+        """
+        self.results.invalidate_user(user_id)
+        self.file_counts.invalidate_user(user_id)
+        for key in [key for key in self._process_indexes if key[0] == user_id]:
+            del self._process_indexes[key]
+        for key in [key for key in self._schemas if key[0] == user_id]:
+            del self._schemas[key]
+        with self._loaded_logs_lock:
+            for file_id in removed_file_ids:
+                self._loaded_logs.pop(str(file_id), None)
+                self.event_log_cache.remove(file_id)
+
+    async def get_dataset_version(
+        self, user_id: str, supabase: Optional[DataClient] = None
+    ) -> str:
+        """
+        Get the version of a user's dataset without computing anything
+
+        Args:
+            user_id: Owner of the uploaded files
+            supabase: Client scoped to the user (defaults to the shared client)
+
+        Returns:
+            Dataset version from dataset_version() (users without files share
+            the version of the empty dataset)
+        """
+        supabase = supabase or get_supabase_client()
+        records = await run_supabase(self._list_files, user_id, supabase)
+        return dataset_version(records)
+
     async def get_process_data(
-        self, time_period: Optional[str] = None, industry: Optional[str] = None
+        self,
+        time_period: Optional[str] = None,
+        industry: Optional[str] = None,
+        user_id: Optional[str] = None,
+        supabase: Optional[DataClient] = None,
     ) -> Dict[str, Any]:
         """
         Get complete process mining data
 
+        Users without uploaded event logs get the demo dataset. Results are
+        cached per (user, dataset version, time_period, industry), so the
+        dashboard endpoints share one analysis until the user's files change.
+
         Args:
             time_period: Time period filter (e.g., Q4-2025)
             industry: Industry filter
+            user_id: Owner of the uploaded event logs
+            supabase: Client scoped to the user (defaults to the shared client)
 
         Returns:
             Complete process mining data dictionary
@@ -34,78 +215,626 @@ class ProcessMiningService:
         Raises:
             ValueError: If invalid parameters provided
         """
-        logger.info(f"Fetching process data: time_period={time_period}, industry={industry}")
+        logger.info(
+            "Fetching process data: time_period=%s, industry=%s", time_period, industry
+        )
+
+        window = parse_time_period(time_period) if time_period else None
+        supabase = supabase or get_supabase_client()
+        records = []
+        if user_id:
+            records = await run_supabase(self._list_files, user_id, supabase)
+        if not user_id or not records:
+            logger.debug("No uploaded files, returning demo data")
+            return self._get_mock_data()
+
+        version = dataset_version(records)
+        data = await self.results.get_or_compute(
+            (user_id, version, time_period, industry),
+            lambda: self._compute_process_data(
+                records, user_id, version, window, industry, supabase
+            ),
+        )
+
+        if not time_period:
+            self._process_index(user_id, version, records).add_all(data["processes"])
+        return data
+
+    async def _compute_process_data(
+        self,
+        records: List[Dict[str, Any]],
+        user_id: str,
+        version: str,
+        window: Optional[Tuple[int, int]],
+        industry: Optional[str],
+        supabase: DataClient,
+    ) -> Dict[str, Any]:
+        """
+        Load, filter and analyze the event logs of a user's uploaded files
 
-        # TODO: Replace with actual data loading from file/database
-        data = self._get_mock_data()
+        The industry filter selects whole files by their industry tag before
+        anything is loaded. The time filter keeps the cases started inside the
+        window, located by binary search on each log's case start index.
 
-        # Apply filters if provided
-        if time_period:
-            logger.debug(f"Filtering by time_period: {time_period}")
-            # TODO: Implement time period filtering when real data is available
+        Args:
+            records: uploaded_csv_files rows of the user
+            user_id: Owner of the uploaded event logs
+            version: Dataset version of the records
+            window: (start, end) epoch seconds of the time_period filter
+            industry: Industry filter
+            supabase: Client scoped to the user
+
+        Returns:
+            Complete process mining data dictionary
+        """
+        # Keys and joins span all tables, whichever files the filter selects
+        schema = await self._schema(user_id, version, records, supabase)
 
         if industry:
-            logger.debug(f"Filtering by industry: {industry}")
-            # TODO: Implement industry filtering when real data is available
+            logger.debug("Filtering by industry: %s", industry)
+            records = [
+                record
+                for record in records
+                if _file_industry(record).casefold() == industry.strip().casefold()
+            ]
 
-        return data
+        logs = []
+        if records:
+            logs = await run_supabase(self._load_event_logs, records, supabase)
+        if not logs and window is None and not industry:
+            logger.debug("No event logs available, returning demo data")
+            return self._get_mock_data()
+
+        industries = {_file_industry(record) for record in records}
+        reported_industry = industry or (
+            industries.pop() if len(industries) == 1 else None
+        )
+
+        # Filtering and mining are CPU-bound; keep them off the event loop as well
+        with observe_stage("mining"):
+            return await asyncio.to_thread(
+                self._analyze,
+                logs,
+                user_id,
+                window,
+                reported_industry,
+                _case_roots(schema, logs),
+            )
+
+    def _analyze(
+        self,
+        logs: List[EventLog],
+        user_id: str,
+        window: Optional[Tuple[int, int]],
+        industry: Optional[str],
+        case_roots: Optional[Dict[str, Dict[str, str]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Restrict event logs to a time window and analyze them
+
+        Args:
+            logs: Event logs to analyze
+            user_id: Owner of the event logs
+            window: (start, end) epoch seconds, or None for the full history
+            industry: Industry reported in the metadata block
+            case_roots: Inferred case root per log source_id
+
+        Returns:
+            Complete process mining data dictionary
+        """
+        if window is not None:
+            logger.debug("Filtering by time window: %s", window)
+            logs = [log.cases_started_between(*window) for log in logs]
+
+        return self.engine.analyze(
+            logs,
+            client_id=user_id,
+            industry=industry,
+            time_window=window,
+            case_roots=case_roots,
+        )
+
+    async def get_schema(
+        self, user_id: str, supabase: Optional[DataClient] = None
+    ) -> Dict[str, Any]:
+        """
+        Get the keys and joins inferred across a user's uploaded tables
+
+        Args:
+            user_id: Owner of the uploaded files
+            supabase: Client scoped to the user (defaults to the shared client)
+
+        Returns:
+            Dictionary with tables and joins lists
+        """
+        supabase = supabase or get_supabase_client()
+        records = await run_supabase(self._list_files, user_id, supabase)
+        if not records:
+            return {"tables": [], "joins": []}
+        return await self._schema(user_id, dataset_version(records), records, supabase)
+
+    async def _schema(
+        self,
+        user_id: str,
+        version: str,
+        records: List[Dict[str, Any]],
+        supabase: DataClient,
+    ) -> Dict[str, Any]:
+        """
+        Get the inferred schema of a dataset version, computing it if needed
+
+        Only the column sketches stored at upload are read; with a single
+        file there is nothing to join, so they are not fetched at all.
+
+        Args:
+            user_id: Owner of the dataset
+            version: Dataset version from dataset_version()
+            records: uploaded_csv_files rows of the dataset
+            supabase: Client scoped to the user
+
+        Returns:
+            Result of infer_schema
+        """
+        key = (user_id, version)
+        schema = self._schemas.get(key)
+        if schema is not None:
+            self._schemas.move_to_end(key)
+            return schema
+
+        sketches = []
+        if len(records) > 1:
+            sketches = await run_supabase(self._list_sketches, user_id, supabase)
+        with observe_stage("mining"):
+            schema = await asyncio.to_thread(infer_schema, sketches)
+        self._schemas[key] = schema
+        while len(self._schemas) > settings.RESULT_CACHE_MAX_ENTRIES:
+            self._schemas.popitem(last=False)
+        return schema
+
+    def _list_files(self, user_id: str, supabase: DataClient) -> List[Dict[str, Any]]:
+        """
+        List the uploaded files of a user
+
+        Args:
+            user_id: Owner of the uploaded files
+            supabase: Client scoped to the user
+
+        Returns:
+            uploaded_csv_files rows, newest first
+        """
+        response = (
+            supabase.table(Uploads.TABLE)
+            .select("id, file_name, file_url, event_log_url, content_sha256, industry")
+            .eq("user_id", user_id)
+            .order("uploaded_at", desc=True)
+            .execute()
+        )
+        return response.data or []
+
+    def _list_sketches(
+        self, user_id: str, supabase: DataClient
+    ) -> List[Dict[str, Any]]:
+        """
+        List the column sketches of a user's uploaded files
+
+        Args:
+            user_id: Owner of the uploaded files
+            supabase: Client scoped to the user
+
+        Returns:
+            uploaded_csv_files rows with id, file_name, csv_schema and
+            column_sketches
+        """
+        response = (
+            supabase.table(Uploads.TABLE)
+            .select("id, file_name, csv_schema, column_sketches")
+            .eq("user_id", user_id)
+            .execute()
+        )
+        return response.data or []
+
+    def _load_event_logs(
+        self, records: List[Dict[str, Any]], supabase: DataClient
+    ) -> List[EventLog]:
+        """
+        Load the event logs of uploaded files
+
+        Binary event logs are downloaded once into the local cache and
+        memory-mapped; uploads that predate the binary format are parsed from
+        CSV. Files without case, activity and timestamp columns are skipped.
+
+        Args:
+            records: uploaded_csv_files rows to load
+            supabase: Client scoped to the owner of the files
+
+        Returns:
+            List of columnar event logs
+        """
+        bucket = supabase.storage.from_(Uploads.BUCKET)
+        logs = []
+        for record in records:
+            file_id = str(record["id"])
+            with self._loaded_logs_lock:
+                log = self._loaded_logs.get(file_id)
+                if log is not None:
+                    self._loaded_logs.move_to_end(file_id)
+
+            if log is None:
+                try:
+                    if record.get("event_log_url"):
+                        log = load_event_log(self._cache_event_log(bucket, record))
+                    else:
+                        contents = bucket.download(record["file_url"])
+                        log = EventLog.from_csv(
+                            io.StringIO(contents.decode("utf-8-sig"))
+                        )
+                except ValueError as e:
+                    logger.debug("Skipping file %s: %s", file_id, e)
+                    continue
+                self._remember_log(file_id, log)
+
+            log.name = record["file_name"]
+            log.source_id = file_id
+            logs.append(log)
+
+        logger.debug("Loaded %d event logs", len(logs))
+        return logs
+
+    def _remember_log(self, file_id: str, log: EventLog) -> None:
+        """Keep a loaded event log, evicting the least recently used over the limit"""
+        with self._loaded_logs_lock:
+            self._loaded_logs[file_id] = log
+            self._loaded_logs.move_to_end(file_id)
+            while len(self._loaded_logs) > settings.LOADED_EVENT_LOGS_MAX:
+                self._loaded_logs.popitem(last=False)
+
+    def _cache_event_log(self, bucket: Any, record: Dict[str, Any]) -> str:
+        """
+        Ensure the binary event log of an uploaded file is in the local cache
+
+        Uploaded files are immutable, so a cached copy never goes stale.
+
+        Args:
+            bucket: Storage bucket proxy holding the uploads
+            record: uploaded_csv_files row with id and event_log_url
+
+        Returns:
+            Local path of the binary event log
+        """
+        return self.event_log_cache.fetch(
+            bucket, record["event_log_url"], f"{record['id']}{FILE_EXTENSION}"
+        )
+
+    def _local_event_log_path(
+        self, record: Dict[str, Any], supabase: DataClient
+    ) -> str:
+        """
+        Ensure an uploaded file is available locally for a worker process
+
+        Args:
+            record: uploaded_csv_files row
+            supabase: Client scoped to the owner of the file
+
+        Returns:
+            Local path of the binary event log, or of the CSV for uploads that
+            predate the binary format
+        """
+        bucket = supabase.storage.from_(Uploads.BUCKET)
+        if record.get("event_log_url"):
+            return self._cache_event_log(bucket, record)
+        return self.event_log_cache.fetch(
+            bucket, record["file_url"], f"{record['id']}.csv"
+        )
+
+    async def submit_analysis_job(
+        self,
+        file_id: int,
+        user_id: str,
+        supabase: DataClient,
+        time_period: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Queue a background analysis of one uploaded file
+
+        Args:
+            file_id: Uploaded file to analyze
+            user_id: Owner of the file
+            supabase: Client scoped to the user
+            time_period: Time period filter (e.g., Q4-2025)
+
+        Returns:
+            Status dictionary of the queued job, or None if the user has no
+            such file
 
-    async def get_process_by_id(self, process_id: str) -> Optional[Dict[str, Any]]:
+        Raises:
+            ValueError: If the time period is invalid
+        """
+        window = parse_time_period(time_period) if time_period else None
+        records = await run_supabase(self._list_files, user_id, supabase)
+        record = next((r for r in records if str(r["id"]) == str(file_id)), None)
+        if record is None:
+            return None
+
+        return await self.jobs.submit(
+            user_id,
+            record,
+            lambda: run_supabase(self._local_event_log_path, record, supabase),
+            industry=_file_industry(record),
+            time_period=time_period,
+            window=window,
+        )
+
+    async def get_process_by_id(
+        self,
+        process_id: str,
+        user_id: Optional[str] = None,
+        supabase: Optional[DataClient] = None,
+    ) -> Optional[Dict[str, Any]]:
         """
         Get specific process details by ID
 
         Args:
             process_id: Process identifier
+            user_id: Owner of the uploaded event logs
+            supabase: Client scoped to the user
 
         Returns:
             Process details dictionary or None if not found
         """
-        logger.info(f"Fetching process: {process_id}")
+        logger.info("Fetching process: %s", process_id)
+
+        supabase = supabase or get_supabase_client()
+        records = []
+        if user_id:
+            records = await run_supabase(self._list_files, user_id, supabase)
+        record = None
+        if user_id and records:
+            version = dataset_version(records)
+            index = self._process_index(user_id, version, records)
+            record = index.record(process_id)
+            if record is not None:
+                process = index.get(process_id)
+                if process is None:
+                    process = await self._compute_process(
+                        record, records, user_id, version, supabase
+                    )
+                    if process is not None:
+                        index.add(process)
+
+        if record is None:
+            # Demo processes only exist while the user has no event logs; any
+            # other unknown id is answered without analyzing the dataset
+            process = None
+            if not records or not await self._has_event_logs(records, supabase):
+                process = next(
+                    (
+                        p
+                        for p in self._get_mock_data()["processes"]
+                        if p["process_id"] == process_id
+                    ),
+                    None,
+                )
+
+        if process is None:
+            logger.warning("Process not found: %s", process_id)
+            return None
+
+        logger.debug("Process found: %s", process_id)
+        return process
+
+    async def _has_event_logs(
+        self, records: List[Dict[str, Any]], supabase: DataClient
+    ) -> bool:
+        """
+        Whether any uploaded file of a dataset is an event log
+
+        Uploads with a binary event log are event logs; the others are only
+        loaded if none has one, for files that predate the binary format.
+
+        Args:
+            records: uploaded_csv_files rows of the dataset
+            supabase: Client scoped to the owner of the files
+
+        Returns:
+            True if the dataset is analyzed instead of the demo data
+        """
+        if any(record.get("event_log_url") for record in records):
+            return True
+        logs = await run_supabase(self._load_event_logs, records, supabase)
+        return bool(logs)
+
+    async def get_process_variants(
+        self,
+        process_id: str,
+        limit: int,
+        user_id: Optional[str] = None,
+        supabase: Optional[DataClient] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the most frequent variants of a process
+
+        Args:
+            process_id: Process identifier
+            limit: Maximum number of variants to return
+            user_id: Owner of the uploaded event logs
+            supabase: Client scoped to the user
+
+        Returns:
+            Dictionary with process_id, total_cases, total_variants and the
+            top variants, or None if the process is not found
+        """
+        logger.info("Fetching variants: process_id=%s, limit=%s", process_id, limit)
+
+        supabase = supabase or get_supabase_client()
+        record = None
+        if user_id:
+            records = await run_supabase(self._list_files, user_id, supabase)
+            if records:
+                index = self._process_index(user_id, dataset_version(records), records)
+                record = index.record(process_id)
+        if record is None:
+            logger.warning("Process not found: %s", process_id)
+            return None
+
+        logs = await run_supabase(self._load_event_logs, [record], supabase)
+        if not logs:
+            return None
+
+        with observe_stage("mining"):
+            table = await asyncio.to_thread(variants_for, logs[0])
+        variants = table.top(limit)
+
+        logger.debug("Retrieved %d of %d variants", len(variants), table.num_variants)
+
+        return {
+            "process_id": process_id,
+            "total_cases": table.num_cases,
+            "total_variants": table.num_variants,
+            "variants": variants,
+        }
+
+    async def _compute_process(
+        self,
+        record: Dict[str, Any],
+        records: List[Dict[str, Any]],
+        user_id: str,
+        version: str,
+        supabase: DataClient,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Compute a single process without analyzing the rest of the dataset
 
-        data = await self.get_process_data()
-        processes = data.get("processes", [])
+        The other event logs are only loaded (memory-mapped) to count their
+        cases for case_percentage.
 
-        for process in processes:
-            if process["process_id"] == process_id:
-                logger.debug(f"Process found: {process_id}")
-                return process
+        Args:
+            record: uploaded_csv_files row of the process
+            records: All uploaded_csv_files rows of the dataset
+            user_id: Owner of the files
+            version: Dataset version of the records
+            supabase: Client scoped to the owner of the files
+
+        Returns:
+            Process dictionary, or None if the file is not an event log
+        """
+        logs = await run_supabase(self._load_event_logs, records, supabase)
+        logs = [log for log in logs if log.num_events > 0]
+        target = next((log for log in logs if log.source_id == str(record["id"])), None)
+        if target is None or target.source_id is None:
+            return None
+
+        total_cases = sum(log.num_cases for log in logs)
+        schema = await self._schema(user_id, version, records, supabase)
+        with observe_stage("mining"):
+            return await asyncio.to_thread(
+                self.engine.build_process,
+                target,
+                total_cases,
+                _case_roots(schema, [target]).get(target.source_id),
+            )
 
-        logger.warning(f"Process not found: {process_id}")
-        return None
+    def _process_index(
+        self, user_id: str, version: str, records: List[Dict[str, Any]]
+    ) -> ProcessIndex:
+        """
+        Get the process index of a dataset version, creating it if needed
+
+        Args:
+            user_id: Owner of the dataset
+            version: Dataset version from dataset_version()
+            records: uploaded_csv_files rows of the dataset
+
+        Returns:
+            Process index shared by all requests for this dataset version
+        """
+        key = (user_id, version)
+        index = self._process_indexes.get(key)
+        if index is None:
+            index = ProcessIndex(records)
+            self._process_indexes[key] = index
+            while len(self._process_indexes) > settings.RESULT_CACHE_MAX_ENTRIES:
+                self._process_indexes.popitem(last=False)
+        else:
+            self._process_indexes.move_to_end(key)
+        return index
 
-    async def get_case_roots(self, time_period: Optional[str] = None) -> Dict[str, Any]:
+    async def get_case_roots(
+        self,
+        time_period: Optional[str] = None,
+        user_id: Optional[str] = None,
+        supabase: Optional[DataClient] = None,
+    ) -> Dict[str, Any]:
         """
         Get case roots summary for pie chart
 
         Args:
             time_period: Time period filter
+            user_id: Owner of the uploaded event logs
+            supabase: Client scoped to the user
 
         Returns:
             Dictionary with case_roots list and total_cases count
         """
-        logger.info(f"Fetching case roots: time_period={time_period}")
+        logger.info("Fetching case roots: time_period=%s", time_period)
 
-        data = await self.get_process_data(time_period=time_period)
+        data = await self.get_process_data(
+            time_period=time_period, user_id=user_id, supabase=supabase
+        )
         case_roots = data.get("case_roots", [])
         total_cases = sum(root["case_count"] for root in case_roots)
 
-        logger.debug(f"Retrieved {len(case_roots)} case roots, total_cases={total_cases}")
+        logger.debug(
+            "Retrieved %d case roots, total_cases=%s", len(case_roots), total_cases
+        )
 
         return {"case_roots": case_roots, "total_cases": total_cases}
 
-    async def get_overall_metrics(self) -> Dict[str, Any]:
+    async def get_overall_metrics(
+        self,
+        user_id: Optional[str] = None,
+        supabase: Optional[DataClient] = None,
+        time_period: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """
         Get overall process metrics
 
+        Metrics are combined from the rollup cubes materialized at ingest, so
+        any time period is answered without mining or scanning raw events.
+
+        Args:
+            user_id: Owner of the uploaded event logs
+            supabase: Client scoped to the user
+            time_period: Time period filter (e.g., Q4-2025)
+
         Returns:
             Overall metrics dictionary
+
+        Raises:
+            ValueError: If the time period is invalid
         """
-        logger.info("Fetching overall metrics")
+        logger.info("Fetching overall metrics: time_period=%s", time_period)
+
+        window = parse_time_period(time_period) if time_period else None
+        supabase = supabase or get_supabase_client()
+        records = []
+        if user_id:
+            records = await run_supabase(self._list_files, user_id, supabase)
 
-        data = await self.get_process_data()
-        metrics = data.get("overall_metrics", {})
+        logs = []
+        if records:
+            logs = await run_supabase(self._load_event_logs, records, supabase)
+        if not logs and window is None:
+            mock_metrics: Dict[str, Any] = self._get_mock_data()["overall_metrics"]
+            return mock_metrics
 
-        logger.debug(f"Retrieved metrics: {metrics}")
+        with observe_stage("mining"):
+            metrics = await asyncio.to_thread(
+                lambda: combine_rollups(
+                    [rollup_for(log) for log in logs if log.num_events > 0], window
+                )
+            )
+
+        logger.debug("Retrieved metrics: %s", metrics)
 
         return metrics
 
@@ -136,20 +865,20 @@ class ProcessMiningService:
                     "root_table": "Orders",
                     "root_primary_key": "ORD_ID",
                     "case_count": 12450,
-                    "percentage": 0.58
+                    "percentage": 0.58,
                 },
                 {
                     "root_table": "Customers",
                     "root_primary_key": "CustomerID",
                     "case_count": 6230,
-                    "percentage": 0.29
+                    "percentage": 0.29,
                 },
                 {
                     "root_table": "CardVerifications",
                     "root_primary_key": "CustKey",
                     "case_count": 1740,
-                    "percentage": 0.13
-                }
+                    "percentage": 0.13,
+                },
             ],
             "processes": [
                 {
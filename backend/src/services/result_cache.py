@@ -0,0 +1,129 @@
+"""
+Process Mining Result Cache
+
+This module caches computed process mining results per user and dataset
+version, so the dashboard endpoints that are rendered together share one
+analysis instead of recomputing it per endpoint.
+"""
+
+import hashlib
+import logging
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any, Dict, Optional, Tuple
+
+from src.core.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+ResultKey = Tuple[str, str, Optional[str], Optional[str]]
+
+
+def dataset_version(records: Iterable[Dict[str, Any]]) -> str:
+    """
+    Fingerprint the set of files a user's analysis is computed from
+
+    Any upload or delete changes the fingerprint, so results cached for the
+    previous dataset are never served again.
+
+    Args:
+        records: uploaded_csv_files rows with id and content_sha256 / file_url
+
+    Returns:
+        Hex digest identifying the dataset
+    """
+    digest = hashlib.sha256()
+    for key in sorted(
+        f"{record['id']}:{record.get('content_sha256') or record.get('file_url')}"
+        f":{record.get('industry')}"
+        for record in records
+    ):
+        digest.update(key.encode())
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Size-bounded LRU cache of process mining results
+
+    Keys are (user_id, dataset version, time_period, industry). Concurrent
+    requests for the same key share a single computation.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[ResultKey, Dict[str, Any]] = OrderedDict()
+        self._computations: SingleFlight[ResultKey, Dict[str, Any]] = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def get_or_compute(
+        self, key: ResultKey, compute: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Return the cached result for a key, computing it at most once
+
+        Args:
+            key: (user_id, dataset version, time_period, industry)
+            compute: Coroutine factory producing the result on a miss
+
+        Returns:
+            Process mining result dictionary (shared; do not mutate)
+        """
+        result = self._entries.get(key)
+        if result is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+        if key in self._computations:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+        async def compute_and_store() -> Dict[str, Any]:
+            result = await compute()
+            self._store(key, result)
+            return result
+
+        return await self._computations.run(key, compute_and_store)
+
+    def invalidate_user(self, user_id: str) -> None:
+        """
+        Drop every cached result of a user
+
+        Args:
+            user_id: User whose dataset changed
+        """
+        stale = [key for key in self._entries if key[0] == user_id]
+        for key in stale:
+            del self._entries[key]
+        if stale:
+            logger.debug(
+                "Invalidated %d cached results for user %s", len(stale), user_id
+            )
+
+    def clear(self) -> None:
+        """Drop all cached results"""
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Cache counters and current size"""
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _store(self, key: ResultKey, result: Dict[str, Any]) -> None:
+        """Insert a result, evicting least recently used entries beyond max_entries"""
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
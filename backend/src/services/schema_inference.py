@@ -0,0 +1,179 @@
+"""
+Schema Inference
+
+This module infers candidate keys and foreign-key joins across a user's
+uploaded CSV tables from the column sketches stored at upload, so no table is
+re-read or joined:
+
+* a column is a candidate key when it has no nulls and (almost) as many
+  distinct values as rows
+* a column joins a candidate key of another table when (almost) all of its
+  distinct values are contained in the key's values
+
+Event logs whose case column joins the key of another table have that table
+as their case root, e.g. an order events log whose order_id references
+Orders.ORD_ID.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.services.sketches import ColumnSketch
+
+logger = logging.getLogger(__name__)
+
+# Distinct values per row for a column to be a candidate key (allows HLL error)
+KEY_UNIQUENESS = 0.95
+
+# Share of a column's distinct values that must be in a key to join it
+JOIN_CONTAINMENT = 0.9
+
+# Column names that look like identifiers rank first among candidate keys
+_KEY_NAME = re.compile(r"(^id$|_?id$|_?key$|_?no$|_?code$)", re.IGNORECASE)
+
+
+@dataclass
+class _Table:
+    """Sketched columns and candidate keys of one uploaded table"""
+
+    file_id: str
+    table: str
+    columns: List[ColumnSketch]
+    types: Dict[str, str]
+    keys: List[ColumnSketch]
+
+
+def _table_name(file_name: str) -> str:
+    """Table name of an uploaded file (file name without extension)"""
+    return file_name.rsplit(".", 1)[0] or file_name
+
+
+def _is_candidate_key(sketch: ColumnSketch) -> bool:
+    """Whether a column is unique and non-null enough to be a key"""
+    return (
+        sketch.rows > 0
+        and sketch.nulls == 0
+        and sketch.distinct >= KEY_UNIQUENESS * sketch.rows
+    )
+
+
+def _key_rank(sketch: ColumnSketch, position: int) -> Tuple[int, float, int]:
+    """Sort key preferring identifier-like names, then uniqueness, then order"""
+    return (
+        0 if _KEY_NAME.search(sketch.name) else 1,
+        -sketch.distinct / sketch.rows,
+        position,
+    )
+
+
+def infer_schema(files: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Infer candidate keys and joins across uploaded tables
+
+    Args:
+        files: uploaded_csv_files rows with id, file_name, csv_schema and
+            column_sketches (files without sketches are ignored)
+
+    Returns:
+        Dictionary with ``tables`` (file_id, table, row_count, primary_key,
+        candidate_keys) and ``joins`` (from/to table and column, containment)
+    """
+    tables: List[_Table] = []
+    for record in files:
+        if not record.get("column_sketches"):
+            continue
+        columns = [ColumnSketch.from_dict(data) for data in record["column_sketches"]]
+        types = {
+            column["name"]: column["type"]
+            for column in (record.get("csv_schema") or {}).get("columns", [])
+        }
+        keys = sorted(
+            (
+                (position, column)
+                for position, column in enumerate(columns)
+                if _is_candidate_key(column)
+            ),
+            key=lambda item: _key_rank(item[1], item[0]),
+        )
+        tables.append(
+            _Table(
+                file_id=str(record["id"]),
+                table=_table_name(record["file_name"]),
+                columns=columns,
+                types=types,
+                keys=[column for _, column in keys],
+            )
+        )
+
+    joins = []
+    for source in tables:
+        for column in source.columns:
+            if column.rows == column.nulls:
+                continue
+            best: Optional[Dict[str, Any]] = None
+            for target in tables:
+                if target is source:
+                    continue
+                for key in target.keys:
+                    source_type = source.types.get(column.name)
+                    target_type = target.types.get(key.name)
+                    if source_type and target_type and source_type != target_type:
+                        continue
+                    if column.distinct > key.distinct / KEY_UNIQUENESS:
+                        continue
+                    containment = column.minhash.containment(key.minhash)
+                    if containment >= JOIN_CONTAINMENT and (
+                        best is None or containment > best["containment"]
+                    ):
+                        best = {
+                            "from_table": source.table,
+                            "from_column": column.name,
+                            "to_table": target.table,
+                            "to_column": key.name,
+                            "containment": containment,
+                        }
+            if best is not None:
+                joins.append(best)
+
+    logger.debug("Inferred %d joins across %d tables", len(joins), len(tables))
+
+    return {
+        "tables": [
+            {
+                "file_id": table.file_id,
+                "table": table.table,
+                "row_count": max((c.rows for c in table.columns), default=0),
+                "primary_key": table.keys[0].name if table.keys else None,
+                "candidate_keys": [key.name for key in table.keys],
+            }
+            for table in tables
+        ],
+        "joins": joins,
+    }
+
+
+def case_root_for(
+    schema: Dict[str, Any], file_name: str, case_column: str
+) -> Optional[Dict[str, str]]:
+    """
+    Case root of an event log: the table its case column references
+
+    Args:
+        schema: Result of infer_schema
+        file_name: File name of the event log
+        case_column: Case identifier column of the event log
+
+    Returns:
+        Dictionary with root_table and root_primary_key, or None if the case
+        column joins no other table
+    """
+    table = _table_name(file_name)
+    for join in schema["joins"]:
+        if join["from_table"] == table and join["from_column"] == case_column:
+            return {
+                "root_table": join["to_table"],
+                "root_primary_key": join["to_column"],
+            }
+    return None
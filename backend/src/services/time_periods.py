@@ -0,0 +1,70 @@
+"""
+Time Periods
+
+This module parses the time_period filter values accepted by the process
+mining endpoints into half-open [start, end) windows of epoch seconds (UTC).
+
+Supported formats: ``Q4-2025`` / ``2025-Q4`` (quarter), ``H1-2025`` /
+``2025-H1`` (half year), ``2025-11`` (month) and ``2025`` (year).
+"""
+
+import re
+from datetime import datetime, timezone
+from typing import Tuple
+
+_QUARTER = re.compile(r"^(?:Q([1-4])-(\d{4})|(\d{4})-Q([1-4]))$", re.IGNORECASE)
+_HALF = re.compile(r"^(?:H([12])-(\d{4})|(\d{4})-H([12]))$", re.IGNORECASE)
+_MONTH = re.compile(r"^(\d{4})-(\d{1,2})$")
+_YEAR = re.compile(r"^(\d{4})$")
+
+
+def _epoch(year: int, month: int) -> int:
+    """Epoch seconds of the first instant of a month, rolling over past December"""
+    year += (month - 1) // 12
+    month = (month - 1) % 12 + 1
+    return int(datetime(year, month, 1, tzinfo=timezone.utc).timestamp())
+
+
+def parse_time_period(value: str) -> Tuple[int, int]:
+    """
+    Parse a time_period filter into a window of epoch seconds
+
+    Args:
+        value: Time period such as "Q4-2025", "2025-11" or "2025"
+
+    Returns:
+        Tuple of (start, end) epoch seconds; start is inclusive, end exclusive
+
+    Raises:
+        ValueError: If the value is not a supported time period
+    """
+    text = value.strip()
+
+    match = _QUARTER.match(text)
+    if match:
+        quarter = int(match.group(1) or match.group(4))
+        year = int(match.group(2) or match.group(3))
+        first_month = 3 * (quarter - 1) + 1
+        return _epoch(year, first_month), _epoch(year, first_month + 3)
+
+    match = _HALF.match(text)
+    if match:
+        half = int(match.group(1) or match.group(4))
+        year = int(match.group(2) or match.group(3))
+        first_month = 6 * (half - 1) + 1
+        return _epoch(year, first_month), _epoch(year, first_month + 6)
+
+    match = _MONTH.match(text)
+    if match and 1 <= int(match.group(2)) <= 12:
+        year, month = int(match.group(1)), int(match.group(2))
+        return _epoch(year, month), _epoch(year, month + 1)
+
+    match = _YEAR.match(text)
+    if match:
+        year = int(match.group(1))
+        return _epoch(year, 1), _epoch(year + 1, 1)
+
+    raise ValueError(
+        f"Invalid time_period '{value}': expected a quarter (Q4-2025), "
+        "half year (H1-2025), month (2025-11) or year (2025)"
+    )
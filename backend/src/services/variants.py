@@ -0,0 +1,198 @@
+"""
+Process Variants
+
+This module groups the cases of an event log by variant: their exact
+sequence of activities. Traces are inserted into a prefix trie over activity
+codes one depth level at a time, so the trie is built in a single vectorized
+pass over the events and holds one node per distinct prefix. Every case ends
+on the trie node of its variant; only the requested top-k variants are ever
+turned back into activity names.
+"""
+
+import logging
+from typing import Any, Dict, List
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.services.dfg_miner import grouped_mean, grouped_quantiles
+from src.services.event_log import EventLog
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86400.0
+
+
+class VariantTable:
+    """
+    Variants of one event log with their frequencies and cycle times
+
+    Trie nodes are described by ``node_parents`` (-1 for children of the
+    root) and ``node_activities``; variant arrays are aligned with
+    ``variant_nodes``, the trie node each variant's cases end on.
+    """
+
+    def __init__(
+        self,
+        activity_labels: NDArray[np.str_],
+        node_parents: NDArray[np.int64],
+        node_activities: NDArray[np.int64],
+        variant_nodes: NDArray[np.int64],
+        case_counts: NDArray[np.int64],
+        mean_cycle_seconds: NDArray[np.float64],
+        median_cycle_seconds: NDArray[np.float64],
+    ) -> None:
+        self.activity_labels = activity_labels
+        self.node_parents = node_parents
+        self.node_activities = node_activities
+        self.variant_nodes = variant_nodes
+        self.case_counts = case_counts
+        self.mean_cycle_seconds = mean_cycle_seconds
+        self.median_cycle_seconds = median_cycle_seconds
+
+    @property
+    def num_variants(self) -> int:
+        """Number of distinct variants"""
+        return len(self.variant_nodes)
+
+    @property
+    def num_cases(self) -> int:
+        """Number of cases across all variants"""
+        return int(self.case_counts.sum())
+
+    def activities(self, node: int) -> List[str]:
+        """
+        Activity sequence of the trace ending on a trie node
+
+        Args:
+            node: Trie node id
+
+        Returns:
+            Activity names from the first to the last event
+        """
+        codes = []
+        while node >= 0:
+            codes.append(self.node_activities[node])
+            node = int(self.node_parents[node])
+        return [str(self.activity_labels[code]) for code in reversed(codes)]
+
+    def top(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Most frequent variants
+
+        Args:
+            limit: Maximum number of variants to return
+
+        Returns:
+            Variant dictionaries matching VariantModel, most frequent first
+        """
+        limit = min(limit, self.num_variants)
+        if limit <= 0:
+            return []
+
+        candidates = np.argpartition(-self.case_counts, limit - 1)[:limit]
+        # Ties are broken by trie node, so the order is stable between requests
+        ranked = candidates[
+            np.lexsort((self.variant_nodes[candidates], -self.case_counts[candidates]))
+        ]
+
+        total_cases = self.num_cases
+        return [
+            {
+                "rank": rank,
+                "activities": self.activities(int(self.variant_nodes[variant])),
+                "case_count": int(self.case_counts[variant]),
+                "case_percentage": float(self.case_counts[variant] / total_cases),
+                "average_cycle_time_days": float(
+                    self.mean_cycle_seconds[variant] / SECONDS_PER_DAY
+                ),
+                "median_cycle_time_days": float(
+                    self.median_cycle_seconds[variant] / SECONDS_PER_DAY
+                ),
+            }
+            for rank, variant in enumerate(ranked.tolist(), start=1)
+        ]
+
+
+def build_variant_table(log: EventLog) -> VariantTable:
+    """
+    Group the cases of an event log by variant
+
+    Cases are ordered by descending length, so the cases still active at
+    any depth are a prefix of that order. At each depth, the (parent node,
+    activity) keys of the active cases are deduplicated into the trie nodes
+    of that level.
+
+    Args:
+        log: Event log sorted by (case, timestamp)
+
+    Returns:
+        Variant table of the log
+    """
+    num_activities = max(log.num_activities, 1)
+    lengths = np.diff(log.case_offsets)
+    order = np.argsort(-lengths, kind="stable")
+    descending_lengths = -lengths[order]
+    first_events = log.case_offsets[:-1][order]
+
+    node_parents: List[NDArray[np.int64]] = []
+    node_activities: List[NDArray[np.int64]] = []
+    case_nodes = np.full(log.num_cases, -1, dtype=np.int64)
+    num_nodes = 0
+    max_length = int(lengths.max(initial=0))
+    for depth in range(max_length):
+        active = int(np.searchsorted(descending_lengths, -depth, side="left"))
+        activities = log.activity_codes[first_events[:active] + depth]
+        keys = (case_nodes[:active] + 1) * num_activities + activities
+        level_keys, level_nodes = np.unique(keys, return_inverse=True)
+
+        node_parents.append(level_keys // num_activities - 1)
+        node_activities.append(level_keys % num_activities)
+        case_nodes[:active] = num_nodes + level_nodes
+        num_nodes += len(level_keys)
+
+    variant_nodes, case_variants, case_counts = np.unique(
+        case_nodes, return_inverse=True, return_counts=True
+    )
+    cycle_seconds = (
+        log.timestamps[log.case_last_index] - log.timestamps[log.case_first_index]
+    )[order]
+    num_variants = len(variant_nodes)
+    (median_cycle_seconds,) = grouped_quantiles(
+        case_variants, cycle_seconds, num_variants, (0.5,)
+    )
+
+    logger.debug(
+        "Built variant trie of %s: %d prefixes, %d variants",
+        log.name or "event log",
+        num_nodes,
+        num_variants,
+    )
+    return VariantTable(
+        activity_labels=log.activity_labels,
+        node_parents=np.concatenate(node_parents or [np.zeros(0, dtype=np.int64)]),
+        node_activities=np.concatenate(
+            node_activities or [np.zeros(0, dtype=np.int64)]
+        ),
+        variant_nodes=variant_nodes,
+        case_counts=case_counts,
+        mean_cycle_seconds=grouped_mean(
+            case_variants, cycle_seconds.astype(np.float64), num_variants
+        ),
+        median_cycle_seconds=median_cycle_seconds,
+    )
+
+
+def variants_for(log: EventLog) -> VariantTable:
+    """
+    Variant table of an event log, built on first use
+
+    Args:
+        log: Event log
+
+    Returns:
+        Variant table attached to the log
+    """
+    if log.variants is None:
+        log.variants = build_variant_table(log)
+    return log.variants
@@ -0,0 +1,46 @@
+"""
+Shared test configuration
+
+Settings are read when src.core.config is imported, so the test environment
+is set up here, before any test module imports the application.
+"""
+
+import os
+import tempfile
+
+os.environ.setdefault("SUPABASE_URL", "http://supabase.test")
+os.environ.setdefault("SUPABASE_KEY", "test.anon.key")
+os.environ.setdefault("SUPABASE_JWT_SECRET", "test-jwt-secret")
+os.environ.setdefault("EVENT_LOG_CACHE_DIR", tempfile.mkdtemp(prefix="tessely-test-"))
+
+from collections.abc import Iterator  # noqa: E402
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from src.api.api import app  # noqa: E402
+from src.api.dependencies import get_current_user, get_user_supabase_client  # noqa: E402
+from src.core.supabase_client import get_supabase_client  # noqa: E402
+from src.tests.fake_supabase import FakeScopedClient, FakeSupabase  # noqa: E402
+
+USER_ID = "00000000-0000-0000-0000-000000000001"
+
+
+@pytest.fixture
+def supabase() -> FakeSupabase:
+    """Empty in-memory Supabase project"""
+    return FakeSupabase()
+
+
+@pytest.fixture
+def client(supabase: FakeSupabase) -> Iterator[TestClient]:
+    """API client authenticated as USER_ID, backed by the supabase fixture"""
+    app.dependency_overrides[get_current_user] = lambda: {"id": USER_ID}
+    app.dependency_overrides[get_user_supabase_client] = lambda: FakeScopedClient(
+        get_supabase_client(), "test-token", supabase
+    )
+    try:
+        with TestClient(app) as test_client:
+            yield test_client
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,213 @@
+"""
+In-memory Supabase for endpoint tests
+
+Answers the PostgREST and Storage requests of a ScopedSupabaseClient from
+Python dictionaries, applying the filters, ordering, limits and counts the
+endpoints use, so tests run the real client code without a project.
+"""
+
+import json
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import unquote
+
+import httpx
+from postgrest.utils import SyncClient
+
+from src.core.supabase_client import ScopedSupabaseClient
+
+Row = Dict[str, Any]
+
+_RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+
+def _file_content(request: httpx.Request) -> bytes:
+    """Content of a storage upload, sent raw or as the multipart file field"""
+    body = request.read()
+    content_type = request.headers.get("content-type", "")
+    if not content_type.startswith("multipart/form-data"):
+        return body
+    boundary = content_type.split("boundary=", 1)[1].encode()
+    for part in body.split(b"--" + boundary):
+        head, _, content = part.partition(b"\r\n\r\n")
+        if b'name="file"' in head:
+            return content.removesuffix(b"\r\n")
+    return b""
+
+
+def _split(text: str) -> List[str]:
+    """Split on commas outside parentheses and double quotes"""
+    parts: List[str] = []
+    depth, quoted, start = 0, False, 0
+    for i, char in enumerate(text):
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def _cast(value: str, like: Any) -> Any:
+    """Filter operand converted to the type of the column value"""
+    value = value.strip('"')
+    if isinstance(like, bool):
+        return value == "true"
+    if isinstance(like, int):
+        return int(value)
+    if isinstance(like, float):
+        return float(value)
+    return value
+
+
+def _matches(row: Row, column: str, condition: str) -> bool:
+    """Whether a row satisfies one ``op.operand`` filter on a column"""
+    negate = condition.startswith("not.")
+    op, _, operand = condition.removeprefix("not.").partition(".")
+    value = row.get(column)
+    if op == "is":
+        result = value is None if operand == "null" else value == (operand == "true")
+    elif value is None:
+        result = False
+    elif op == "in":
+        result = value in {_cast(v, value) for v in _split(operand.strip("()"))}
+    else:
+        other = _cast(operand, value)
+        result = {
+            "eq": value == other,
+            "neq": value != other,
+            "lt": value < other,
+            "lte": value <= other,
+            "gt": value > other,
+            "gte": value >= other,
+        }[op]
+    return result != negate
+
+
+def _matches_logic(row: Row, operator: str, conditions: str) -> bool:
+    """Whether a row satisfies an ``or(...)``/``and(...)`` filter group"""
+    results = []
+    for condition in _split(conditions.strip()[1:-1]):
+        if condition.startswith(("or(", "and(")):
+            nested, _, group = condition.partition("(")
+            results.append(_matches_logic(row, nested, f"({group}"))
+        else:
+            column, _, rest = condition.partition(".")
+            results.append(_matches(row, column, rest))
+    return any(results) if operator == "or" else all(results)
+
+
+class FakeSupabase:
+    """Tables and storage objects of a fake Supabase project"""
+
+    def __init__(self) -> None:
+        self.tables: Dict[str, List[Row]] = {}
+        self.objects: Dict[str, bytes] = {}
+        self.requests: List[httpx.Request] = []
+        # Return an error response instead of answering matching requests
+        self.fail: Optional[Callable[[httpx.Request], bool]] = None
+        self._next_id = 1
+
+    def insert(self, table: str, row: Row) -> Row:
+        """Add a row directly, assigning the next id if it has none"""
+        row = {"id": self._next_id, **row}
+        self._next_id = max(self._next_id, row["id"]) + 1
+        self.tables.setdefault(table, []).append(row)
+        return row
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        """Answer one HTTP request"""
+        self.requests.append(request)
+        if self.fail is not None and self.fail(request):
+            return httpx.Response(500, json={"message": "Injected failure"})
+        path = unquote(request.url.path)
+        if path.startswith("/rest/v1/"):
+            return self._rest(request, path.removeprefix("/rest/v1/"))
+        return self._storage(request, path.split("/object/", 1)[1])
+
+    def _filtered(self, request: httpx.Request, table: str) -> List[Row]:
+        """Rows of a table matching the filters of a request"""
+        rows = self.tables.setdefault(table, [])
+        for key, condition in request.url.params.multi_items():
+            if key in _RESERVED_PARAMS:
+                continue
+            if key in ("or", "and"):
+                rows = [row for row in rows if _matches_logic(row, key, condition)]
+            else:
+                rows = [row for row in rows if _matches(row, key, condition)]
+        return rows
+
+    def _rest(self, request: httpx.Request, table: str) -> httpx.Response:
+        """Answer a PostgREST request"""
+        if request.method == "POST":
+            body = json.loads(request.read())
+            rows = [
+                self.insert(table, row)
+                for row in (body if isinstance(body, list) else [body])
+            ]
+            return httpx.Response(201, json=rows)
+
+        rows = self._filtered(request, table)
+        if request.method == "DELETE":
+            self.tables[table] = [
+                row for row in self.tables[table] if all(row is not r for r in rows)
+            ]
+            return httpx.Response(200, json=rows)
+
+        params = request.url.params
+        orders = [
+            order for value in params.get_list("order") for order in value.split(",")
+        ]
+        for order in reversed(orders):
+            column, _, direction = order.partition(".")
+            rows = sorted(
+                rows, key=lambda row: row[column], reverse=direction.startswith("desc")
+            )
+        total = len(rows)
+        rows = rows[int(params.get("offset", 0)) :]
+        if "limit" in params:
+            rows = rows[: int(params["limit"])]
+        if "select" in params and params["select"] != "*":
+            columns = [column.strip() for column in params["select"].split(",")]
+            rows = [{column: row.get(column) for column in columns} for row in rows]
+
+        headers = {"Content-Range": f"0-{max(len(rows) - 1, 0)}/{total}"}
+        if request.method == "HEAD":
+            return httpx.Response(200, headers=headers)
+        return httpx.Response(200, json=rows, headers=headers)
+
+    def _storage(self, request: httpx.Request, key: str) -> httpx.Response:
+        """Answer a Storage object request"""
+        if request.method == "DELETE":
+            bucket = key.strip("/")
+            removed = []
+            for name in json.loads(request.read())["prefixes"]:
+                if self.objects.pop(f"{bucket}/{name}", None) is not None:
+                    removed.append({"name": name})
+            return httpx.Response(200, json=removed)
+        if request.method in ("POST", "PUT"):
+            self.objects[key] = _file_content(request)
+            return httpx.Response(200, json={"Key": key})
+        if key not in self.objects:
+            return httpx.Response(404, json={"message": "Object not found"})
+        return httpx.Response(200, content=self.objects[key])
+
+
+class FakeScopedClient(ScopedSupabaseClient):
+    """ScopedSupabaseClient whose requests are answered by a FakeSupabase"""
+
+    def __init__(self, client: Any, access_token: str, store: FakeSupabase) -> None:
+        self._transport = httpx.MockTransport(store.handle)
+        super().__init__(client, access_token)
+
+    def _scoped_session(self, session: httpx.Client, access_token: str) -> SyncClient:
+        """Copy of a singleton session that sends its requests to the store"""
+        headers = httpx.Headers(session.headers)
+        headers["Authorization"] = f"Bearer {access_token}"
+        return SyncClient(
+            base_url=session.base_url, headers=headers, transport=self._transport
+        )
@@ -0,0 +1,156 @@
+"""Tests for background analysis jobs and their SQLite store"""
+
+import asyncio
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.core.constants import JobStatus
+from src.services.analysis_jobs import AnalysisJobs, JobStore
+
+CSV = (
+    "case_id,activity,timestamp\n"
+    "1,Receive,2025-01-02 09:00:00\n"
+    "1,Approve,2025-01-02 10:00:00\n"
+    "2,Receive,2025-01-03 09:00:00\n"
+    "2,Reject,2025-01-03 11:00:00\n"
+)
+
+
+def _dead_pid() -> int:
+    """Id of a process that has exited"""
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def _set_owner(path: Path, job_id: str, owner_pid: Optional[int]) -> None:
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            "UPDATE analysis_jobs SET owner_pid = ? WHERE job_id = ?",
+            (owner_pid, job_id),
+        )
+
+
+def test_job_lifecycle(tmp_path: Path) -> None:
+    csv_path = tmp_path / "1.csv"
+    csv_path.write_text(CSV)
+
+    async def prepare() -> str:
+        return str(csv_path)
+
+    async def main() -> tuple[Dict[str, Any], Any, Any, Any]:
+        jobs = AnalysisJobs(JobStore(), max_workers=1)
+        try:
+            queued = await jobs.submit(
+                "user-1", {"id": 1, "file_name": "orders.csv"}, prepare
+            )
+            assert queued["status"] == JobStatus.QUEUED
+
+            job_id = queued["job_id"]
+            for _ in range(600):
+                job = await jobs.get(job_id, "user-1")
+                assert job is not None
+                if job["status"] not in (JobStatus.QUEUED, JobStatus.RUNNING):
+                    break
+                await asyncio.sleep(0.05)
+            return (
+                job,
+                await jobs.result(job_id, "user-1"),
+                await jobs.get(job_id, "user-2"),
+                await jobs.result(job_id, "user-2"),
+            )
+        finally:
+            await jobs.shutdown()
+
+    job, result, foreign_job, foreign_result = asyncio.run(main())
+
+    assert job["status"] == JobStatus.COMPLETED, job["error"]
+    assert job["progress"] == 1.0
+    assert result is not None
+    assert result["overall_metrics"]["total_cases_processed"] == 2
+    assert result["metadata"]["time_range"]["end"] == "2025-01-03"
+    assert foreign_job is None
+    assert foreign_result is None
+
+
+def test_failed_preparation_fails_the_job() -> None:
+    async def prepare() -> str:
+        raise FileNotFoundError("missing event log")
+
+    async def main() -> Optional[Dict[str, Any]]:
+        jobs = AnalysisJobs(JobStore(), max_workers=1)
+        job = await jobs.submit("user-1", {"id": 1, "file_name": "a.csv"}, prepare)
+        await asyncio.gather(*jobs._tasks)
+        status = await jobs.get(job["job_id"], "user-1")
+        await jobs.shutdown()
+        return status
+
+    job = asyncio.run(main())
+
+    assert job is not None
+    assert job["status"] == JobStatus.FAILED
+    assert job["error"] == "missing event log"
+
+
+def test_restart_fails_only_orphaned_jobs(tmp_path: Path) -> None:
+    path = tmp_path / "jobs.db"
+    store = JobStore(str(path))
+    live = store.create("user-1", "1", None)["job_id"]
+    dead = store.create("user-1", "2", None)["job_id"]
+    legacy = store.create("user-1", "3", None)["job_id"]
+    store.close()
+    # A live worker (the parent of this process), an exited one, and a job
+    # written before owners were recorded
+    _set_owner(path, live, os.getppid())
+    _set_owner(path, dead, _dead_pid())
+    _set_owner(path, legacy, None)
+
+    store = JobStore(str(path))
+    statuses = {
+        job_id: store.get(job_id, "user-1")["status"]  # type: ignore[index]
+        for job_id in (live, dead, legacy)
+    }
+    store.close()
+
+    assert statuses == {
+        live: JobStatus.QUEUED,
+        dead: JobStatus.FAILED,
+        legacy: JobStatus.FAILED,
+    }
+
+
+def test_purge_keeps_active_and_newest_finished_jobs() -> None:
+    store = JobStore(max_finished=2)
+    finished = []
+    for file_id in range(4):
+        job_id = store.create("user-1", str(file_id), None)["job_id"]
+        store.update(job_id, JobStatus.COMPLETED, "done", result={"id": file_id})
+        finished.append(job_id)
+    active = store.create("user-1", "9", None)["job_id"]
+
+    assert store.purge() == 2
+    assert store.get(finished[0], "user-1") is None
+    assert store.get(finished[1], "user-1") is None
+    assert store.result(finished[3], "user-1") == {"id": 3}
+    assert store.get(active, "user-1") is not None
+
+
+def test_purge_deletes_expired_finished_jobs() -> None:
+    store = JobStore(retention_seconds=60)
+    expired = store.create("user-1", "1", None)["job_id"]
+    store.update(expired, JobStatus.FAILED, "done", error="boom")
+    recent = store.create("user-1", "2", None)["job_id"]
+    store.update(recent, JobStatus.COMPLETED, "done", result={})
+    with store._connection:
+        store._connection.execute(
+            "UPDATE analysis_jobs SET updated_at = ? WHERE job_id = ?",
+            ("2000-01-01T00:00:00+00:00", expired),
+        )
+
+    assert store.purge() == 1
+    assert store.get(expired, "user-1") is None
+    assert store.get(recent, "user-1") is not None
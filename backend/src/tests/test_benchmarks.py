@@ -0,0 +1,23 @@
+"""Smoke test of the benchmark harness, so endpoint changes cannot break it"""
+
+from pathlib import Path
+
+import pytest
+
+from benchmarks.run import bench_api, bench_core
+from benchmarks.synthetic import LogSpec, generate_csv
+from src.core.config import settings
+
+
+def test_benchmarks_run_on_a_tiny_log(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    # The in-memory store numbers files from 1 too; keep its logs out of the
+    # cache the other tests warm up from
+    monkeypatch.setattr(settings, "EVENT_LOG_CACHE_DIR", str(tmp_path))
+    content = generate_csv(LogSpec(cases=20, activities=5, variants=4))
+
+    results = {**bench_core(content, repeat=1), **bench_api(content, repeat=1)}
+
+    assert "api_data_not_modified" in results
+    assert all(result["min_s"] >= 0 for result in results.values())
@@ -0,0 +1,84 @@
+"""Tests for ETag revalidation of the process mining endpoints"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.conditional import CACHE_CONTROL, is_not_modified
+from src.tests.test_csv_datasource import EVENT_LOG
+
+ENDPOINTS = [
+    "/api/v1/process-mining/data",
+    "/api/v1/process-mining/metrics",
+    "/api/v1/process-mining/case-roots",
+]
+
+
+@pytest.mark.parametrize(
+    ("if_none_match", "expected"),
+    [
+        (None, False),
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"other", "abc"', True),
+        ('"other"', False),
+        ("*", False),
+    ],
+)
+def test_if_none_match(if_none_match: str | None, expected: bool) -> None:
+    assert is_not_modified(if_none_match, '"abc"') is expected
+
+
+@pytest.mark.parametrize("url", ENDPOINTS)
+def test_current_etag_is_not_modified(client: TestClient, url: str) -> None:
+    first = client.get(url)
+    etag = first.headers["ETag"]
+
+    second = client.get(url, headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert first.headers["Cache-Control"] == CACHE_CONTROL
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["ETag"] == etag
+    assert second.headers["Cache-Control"] == CACHE_CONTROL
+
+
+def test_not_modified_data_varies_by_accept(client: TestClient) -> None:
+    url = ENDPOINTS[0]
+    headers = {"Accept": "application/msgpack"}
+    first = client.get(url, headers=headers)
+
+    second = client.get(
+        url, headers={**headers, "If-None-Match": first.headers["ETag"]}
+    )
+
+    assert first.headers["Vary"] == "Accept"
+    assert second.status_code == 304
+    assert second.headers["Vary"] == "Accept"
+
+
+def test_etag_depends_on_parameters_and_media_type(client: TestClient) -> None:
+    url = ENDPOINTS[0]
+    etags = {
+        client.get(url).headers["ETag"],
+        client.get(url, params={"time_period": "Q1-2025"}).headers["ETag"],
+        client.get(url, headers={"Accept": "application/msgpack"}).headers["ETag"],
+    }
+
+    assert len(etags) == 3
+
+
+def test_upload_changes_the_etag(client: TestClient) -> None:
+    url = ENDPOINTS[1]
+    etag = client.get(url).headers["ETag"]
+    upload = client.post(
+        "/api/v1/csv_datasource/upload",
+        files={"file": ("events.csv", EVENT_LOG, "text/csv")},
+    )
+    assert upload.status_code == 200, upload.text
+
+    response = client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["total_cases_processed"] == 1
@@ -0,0 +1,119 @@
+"""Tests for the CSV upload, listing and delete endpoints"""
+
+import httpx
+from fastapi.testclient import TestClient
+
+from src.core.constants import Uploads
+from src.services.event_log_format import FILE_EXTENSION
+from src.tests.fake_supabase import FakeSupabase
+
+EVENT_LOG = (
+    b"case_id,activity,timestamp\n"
+    b"1,Receive,2025-01-02 09:00:00\n"
+    b"1,Approve,2025-01-02 10:00:00\n"
+)
+
+
+def test_upload_with_an_empty_column(
+    client: TestClient, supabase: FakeSupabase
+) -> None:
+    response = client.post(
+        "/api/v1/csv_datasource/upload",
+        files={"file": ("plain.csv", b"a,b,c\n1,,x\n2,,y\n", "text/csv")},
+    )
+
+    assert response.status_code == 200, response.text
+    row = response.json()["data"]
+    assert row["event_log_url"] is None
+    sketches = {column["name"]: column for column in row["column_sketches"]}
+    assert (sketches["b"]["rows"], sketches["b"]["nulls"]) == (2, 2)
+    assert list(supabase.objects) == [f"{Uploads.BUCKET}/{row['file_url']}"]
+
+
+def test_upload_that_is_not_utf8_is_stored(
+    client: TestClient, supabase: FakeSupabase
+) -> None:
+    content = "case_id,activity,timestamp\n1,Café,2025-01-02 09:00:00\n"
+
+    response = client.post(
+        "/api/v1/csv_datasource/upload",
+        files={"file": ("latin1.csv", content.encode("cp1252"), "text/csv")},
+    )
+
+    assert response.status_code == 200, response.text
+    row = response.json()["data"]
+    assert row["event_log_url"] is None
+    assert row["column_sketches"] == []
+    assert supabase.objects[f"{Uploads.BUCKET}/{row['file_url']}"] == (
+        content.encode("cp1252")
+    )
+
+
+def test_failed_upload_removes_stored_objects(
+    client: TestClient, supabase: FakeSupabase
+) -> None:
+    def event_log_upload(request: httpx.Request) -> bool:
+        return request.method == "POST" and request.url.path.endswith(FILE_EXTENSION)
+
+    supabase.fail = event_log_upload
+    response = client.post(
+        "/api/v1/csv_datasource/upload",
+        files={"file": ("events.csv", EVENT_LOG, "text/csv")},
+    )
+
+    assert response.status_code == 500
+    assert supabase.objects == {}
+    assert supabase.tables.get(Uploads.TABLE, []) == []
+
+
+def test_failed_batch_insert_removes_stored_objects(
+    client: TestClient, supabase: FakeSupabase
+) -> None:
+    def table_insert(request: httpx.Request) -> bool:
+        return request.method == "POST" and "/rest/v1/" in request.url.path
+
+    supabase.fail = table_insert
+    response = client.post(
+        "/api/v1/csv_datasource/upload/batch",
+        files=[
+            ("files", ("events.csv", EVENT_LOG, "text/csv")),
+            ("files", ("plain.csv", b"a,b\n1,2\n", "text/csv")),
+        ],
+    )
+
+    assert response.status_code == 500
+    assert supabase.objects == {}
+    assert supabase.tables.get(Uploads.TABLE, []) == []
+
+
+def test_batch_delete(client: TestClient, supabase: FakeSupabase) -> None:
+    response = client.post(
+        "/api/v1/csv_datasource/upload/batch",
+        files=[
+            ("files", ("events.csv", EVENT_LOG, "text/csv")),
+            ("files", ("plain.csv", b"a,b\n1,2\n", "text/csv")),
+        ],
+    )
+    assert response.status_code == 200, response.text
+    events, plain = response.json()["data"]
+    other = supabase.insert(
+        Uploads.TABLE,
+        {"user_id": "someone-else", "file_url": "someone-else/x.csv"},
+    )
+    supabase.objects[f"{Uploads.BUCKET}/someone-else/x.csv"] = b"x"
+
+    response = client.post(
+        "/api/v1/csv_datasource/files/delete",
+        json={"file_ids": [events["id"], other["id"], 999]},
+    )
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["deleted_ids"] == [events["id"]]
+    assert body["not_found"] == [other["id"], 999]
+    assert sorted(supabase.objects) == [
+        f"{Uploads.BUCKET}/{plain['file_url']}",
+        f"{Uploads.BUCKET}/someone-else/x.csv",
+    ]
+    remaining = [row["id"] for row in supabase.tables[Uploads.TABLE]]
+    assert remaining == [plain["id"], other["id"]]
@@ -0,0 +1,48 @@
+"""Tests for the authentication mode resolution"""
+
+import logging
+from collections.abc import Iterator
+
+import pytest
+
+from src.api import dependencies
+from src.core.constants import AuthModes
+from src.core.messages import LogMessages
+
+
+@pytest.fixture(autouse=True)
+def fresh_auth_mode(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    dependencies.use_local_auth.cache_clear()
+    yield
+    monkeypatch.undo()
+    dependencies.use_local_auth.cache_clear()
+
+
+def test_missing_secret_is_reported_once(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    monkeypatch.setattr(dependencies.settings, "AUTH_MODE", AuthModes.LOCAL)
+    monkeypatch.setattr(dependencies.settings, "SUPABASE_JWT_SECRET", "")
+
+    with caplog.at_level(logging.WARNING, logger=dependencies.__name__):
+        results = [dependencies.use_local_auth() for _ in range(3)]
+
+    assert results == [False, False, False]
+    warnings = [
+        r for r in caplog.records if r.getMessage() == LogMessages.JWT_SECRET_MISSING
+    ]
+    assert len(warnings) == 1
+
+
+def test_local_mode_with_secret(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(dependencies.settings, "AUTH_MODE", AuthModes.LOCAL)
+    monkeypatch.setattr(dependencies.settings, "SUPABASE_JWT_SECRET", "secret")
+
+    assert dependencies.use_local_auth() is True
+
+
+def test_unknown_mode_fails_fast(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(dependencies.settings, "AUTH_MODE", "ldap")
+
+    with pytest.raises(ValueError, match="AUTH_MODE"):
+        dependencies.use_local_auth()
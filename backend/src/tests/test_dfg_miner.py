@@ -0,0 +1,96 @@
+"""Known-answer tests for directly-follows graph discovery"""
+
+import numpy as np
+import pytest
+
+from src.services import dfg_miner
+from src.services.dfg_miner import discover_dfg, grouped_mean, grouped_quantiles
+from src.services.event_log import EventLog
+
+START = np.datetime64("2025-01-02T09:00")
+
+# Minutes after START of every event; a -> b takes 10, 20 and 60 minutes
+CASES = {
+    "1": [("a", 0), ("b", 10), ("c", 40)],
+    "2": [("a", 0), ("b", 20), ("d", 25)],
+    "3": [("a", 0), ("b", 60), ("c", 70)],
+    "4": [("a", 0), ("c", 5)],
+}
+
+
+@pytest.fixture
+def log() -> EventLog:
+    cases, activities, timestamps = [], [], []
+    for case, events in CASES.items():
+        for activity, minutes in events:
+            cases.append(case)
+            activities.append(activity)
+            timestamps.append(str(START + np.timedelta64(minutes, "m")))
+    return EventLog.from_columns(cases, activities, timestamps)
+
+
+@pytest.mark.parametrize("dense", [True, False], ids=["bincount", "unique"])
+def test_edges(log: EventLog, monkeypatch: pytest.MonkeyPatch, dense: bool) -> None:
+    if not dense:
+        monkeypatch.setattr(dfg_miner, "MAX_DENSE_EDGE_KEYS", 0)
+    completed = np.array([True, False, True, True])
+
+    graph = discover_dfg(log, completed)
+
+    labels = graph.activity_labels
+    edges = {
+        (labels[source], labels[target]): i
+        for i, (source, target) in enumerate(
+            zip(graph.edge_sources, graph.edge_targets)
+        )
+    }
+    assert {key: int(graph.edge_counts[i]) for key, i in edges.items()} == {
+        ("a", "b"): 3,
+        ("a", "c"): 1,
+        ("b", "c"): 2,
+        ("b", "d"): 1,
+    }
+    probabilities = graph.edge_probabilities
+    assert probabilities[edges["a", "b"]] == pytest.approx(3 / 4)
+    assert probabilities[edges["b", "d"]] == pytest.approx(1 / 3)
+
+    ab = edges["a", "b"]
+    assert graph.edge_mean_seconds[ab] == pytest.approx(30 * 60)
+    assert graph.edge_median_seconds[ab] == pytest.approx(20 * 60)
+    # Position 0.95 * 2 = 1.9 of the sorted 10, 20, 60 minutes
+    assert graph.edge_p95_seconds[ab] == pytest.approx(56 * 60)
+    assert graph.edge_median_seconds[edges["b", "c"]] == pytest.approx(20 * 60)
+
+    code = {label: i for i, label in enumerate(labels)}
+    assert graph.activity_case_counts[code["b"]] == 3
+    assert graph.activity_success_rates[code["b"]] == pytest.approx(2 / 3)
+    assert graph.start_counts[code["a"]] == 4
+    assert graph.end_counts[code["c"]] == 3
+    # a is followed after 10, 20, 60 and 5 minutes
+    assert graph.activity_mean_to_next_seconds[code["a"]] == pytest.approx(23.75 * 60)
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        np.array([5, 1, 3, 10, 7], dtype=np.int64),
+        np.array([5.0, 1.0, 3.0, 10.0, 7.0]),
+        np.array([5, 1, 3, 10, 7], dtype=np.int64) - 20,
+    ],
+    ids=["packed", "float", "negative"],
+)
+def test_grouped_quantiles(values: np.ndarray) -> None:
+    groups = np.array([0, 0, 0, 2, 2])
+    offset = values[1] - 1
+
+    result = grouped_quantiles(groups, values, 3, (0.0, 0.5, 1.0))
+
+    assert result[:, 0] == pytest.approx(np.array([1, 3, 5]) + offset)
+    assert result[:, 1].tolist() == [0, 0, 0]
+    assert result[:, 2] == pytest.approx(np.array([7, 8.5, 10]) + offset)
+
+
+def test_grouped_mean() -> None:
+    means = grouped_mean(np.array([2, 0, 2]), np.array([1.0, 4.0, 2.0]), 4)
+
+    assert means.tolist() == [4.0, 0.0, 1.5, 0.0]
@@ -0,0 +1,135 @@
+"""Tests for parsing CSV files into columnar event logs"""
+
+import io
+
+import numpy as np
+import pytest
+
+from src.services.event_log import EventLog, parse_timestamps
+from src.services.process_mining_engine import ProcessMiningEngine
+
+# Out of order, with a short row; every case takes a different path and time
+CSV = (
+    "Case ID,Activity,Timestamp,Resource\n"
+    "c2,Receive,2025-01-03 09:00:00,ann\n"
+    "c1,Approve,2025-01-02 10:00:00,bob\n"
+    "c1,Receive,2025-01-02 09:00:00,ann\n"
+    "short,row\n"
+    "c2,Reject,2025-01-03 11:00:00,bob\n"
+    "c3,Receive,2025-01-04 09:00:00,ann\n"
+    "c4,Receive,2025-01-05 09:00:00,ann\n"
+    "c3,Approve,2025-01-04 12:00:00,bob\n"
+    "c4,Receive,2025-01-05 10:00:00,ann\n"
+    "c4,Approve,2025-01-05 13:00:00,bob\n"
+)
+
+
+def _epoch(timestamp: str) -> int:
+    return int(np.datetime64(timestamp, "s").astype(np.int64))
+
+
+@pytest.fixture
+def log() -> EventLog:
+    return EventLog.from_csv(io.StringIO(CSV), name="orders.csv", source_id="7")
+
+
+def test_events_are_encoded_and_sorted_by_case_and_time(log: EventLog) -> None:
+    assert (log.num_events, log.num_cases, log.num_activities) == (9, 4, 3)
+    assert (log.name, log.source_id, log.case_column) == ("orders.csv", "7", "Case ID")
+    assert log.case_labels[log.case_codes].tolist() == [
+        "c1", "c1", "c2", "c2", "c3", "c3", "c4", "c4", "c4"
+    ]  # fmt: skip
+    assert log.activity_labels[log.activity_codes].tolist() == [
+        "Receive", "Approve",
+        "Receive", "Reject",
+        "Receive", "Approve",
+        "Receive", "Receive", "Approve",
+    ]  # fmt: skip
+    assert log.case_offsets.tolist() == [0, 2, 4, 6, 9]
+    assert log.timestamps.tolist() == [
+        _epoch(timestamp)
+        for timestamp in (
+            "2025-01-02T09", "2025-01-02T10",
+            "2025-01-03T09", "2025-01-03T11",
+            "2025-01-04T09", "2025-01-04T12",
+            "2025-01-05T09", "2025-01-05T10", "2025-01-05T13",
+        )
+    ]  # fmt: skip
+
+
+def test_delimiter_does_not_change_the_parse(log: EventLog) -> None:
+    other = EventLog.from_csv(io.StringIO(CSV.replace(",", ";")), delimiter=";")
+
+    for column in ("case_codes", "activity_codes", "timestamps", "case_offsets"):
+        assert getattr(other, column).tolist() == getattr(log, column).tolist()
+    assert other.activity_labels.tolist() == log.activity_labels.tolist()
+
+
+def test_csv_without_event_log_columns_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        EventLog.from_csv(io.StringIO("a,b\n1,2\n"))
+    with pytest.raises(ValueError):
+        EventLog.from_csv(io.StringIO(""))
+
+
+def test_engine_known_answer(log: EventLog) -> None:
+    data = ProcessMiningEngine().analyze([log])
+
+    # c1: 1h, c2: 2h, c3: 3h, c4: 4h; Approve is the most common last activity
+    # and c4 repeats Receive, so it is not straight through
+    assert data["overall_metrics"] == {
+        "total_cases_processed": 4,
+        "overall_process_efficiency": pytest.approx(3 / 4),
+        "average_cycle_time_days": pytest.approx(2.5 / 24),
+        "straight_through_processing_rate": pytest.approx(3 / 4),
+    }
+    assert data["metadata"]["time_range"] == {
+        "start": "2025-01-02",
+        "end": "2025-01-05",
+    }
+
+    (process,) = data["processes"]
+    assert process["case_count"] == 4
+    nodes = {node["node_id"]: node for node in process["graph"]["nodes"]}
+    assert {name: node["node_type"] for name, node in nodes.items()} == {
+        "Receive": "start",
+        "Approve": "end",
+        "Reject": "end",
+    }
+    assert nodes["Receive"]["metrics"]["case_count_at_node"] == 4
+    assert nodes["Approve"]["metrics"]["case_count_at_node"] == 3
+
+    edges = {(edge["from"], edge["to"]): edge for edge in process["graph"]["edges"]}
+    assert {key: edge["frequency"] for key, edge in edges.items()} == {
+        ("Receive", "Approve"): 3,
+        ("Receive", "Reject"): 1,
+        ("Receive", "Receive"): 1,
+    }
+    assert edges["Receive", "Approve"]["probability"] == pytest.approx(3 / 5)
+    # Receive -> Approve took 1h, 3h and 3h
+    assert edges["Receive", "Approve"]["average_transition_time_mins"] == (
+        pytest.approx(140)
+    )
+    assert edges["Receive", "Approve"]["median_transition_time_mins"] == 180
+
+
+@pytest.mark.parametrize("missing", ["", "NaT"])
+def test_missing_timestamps_are_rejected(missing: str) -> None:
+    with pytest.raises(ValueError):
+        parse_timestamps(["2025-01-02 09:00:00", missing])
+
+
+def test_rows_with_a_blank_timestamp_are_skipped() -> None:
+    log = EventLog.from_csv(
+        io.StringIO(
+            "case_id,activity,timestamp\n"
+            "1,Receive,2025-01-02 09:00:00\n"
+            "1,Approve,\n"
+            "1,Ship,  \n"
+        )
+    )
+
+    assert log.num_events == 1
+    assert log.timestamps.tolist() == [
+        int(np.datetime64("2025-01-02T09:00:00", "s").astype(np.int64))
+    ]
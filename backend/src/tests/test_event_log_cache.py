@@ -0,0 +1,86 @@
+"""Tests for the local event log cache"""
+
+import os
+from pathlib import Path
+from typing import Dict, List
+
+from src.services.event_log_cache import EventLogCache
+
+
+class FakeBucket:
+    """Storage bucket serving fixed objects and counting downloads"""
+
+    def __init__(self, objects: Dict[str, bytes]) -> None:
+        self.objects = objects
+        self.downloads: List[str] = []
+
+    def download(self, path: str) -> bytes:
+        self.downloads.append(path)
+        return self.objects[path]
+
+
+def _age(path: str, seconds: float) -> None:
+    info = os.stat(path)
+    os.utime(path, (info.st_atime - seconds, info.st_mtime - seconds))
+
+
+def test_fetch_downloads_once(tmp_path: Path) -> None:
+    cache = EventLogCache(str(tmp_path / "cache"), max_bytes=0)
+    bucket = FakeBucket({"u/1.evlog": b"log"})
+
+    first = cache.fetch(bucket, "u/1.evlog", "1.evlog")
+    second = cache.fetch(bucket, "u/1.evlog", "1.evlog")
+
+    assert first == second
+    assert Path(first).read_bytes() == b"log"
+    assert bucket.downloads == ["u/1.evlog"]
+    assert os.stat(tmp_path / "cache").st_mode & 0o077 == 0
+
+
+def test_least_recently_used_files_are_evicted(tmp_path: Path) -> None:
+    cache = EventLogCache(str(tmp_path), max_bytes=25)
+    bucket = FakeBucket({f"u/{i}": b"x" * 10 for i in range(3)})
+
+    paths = [cache.fetch(bucket, "u/0", "0.evlog"), cache.fetch(bucket, "u/1", "1.csv")]
+    _age(paths[0], 20)
+    _age(paths[1], 30)
+    # A hit makes 0.evlog the most recently used again
+    cache.fetch(bucket, "u/0", "0.evlog")
+    cache.fetch(bucket, "u/2", "2.evlog")
+
+    assert sorted(os.listdir(tmp_path)) == ["0.evlog", "2.evlog"]
+    assert cache.evictions == 1
+
+
+def test_remove_deletes_every_copy(tmp_path: Path) -> None:
+    cache = EventLogCache(str(tmp_path), max_bytes=0)
+    bucket = FakeBucket({"a": b"1", "b": b"2"})
+    cache.fetch(bucket, "a", "7.evlog")
+    cache.fetch(bucket, "b", "7.csv")
+
+    cache.remove(7)
+    cache.remove(8)
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_recent_lists_only_cached_event_logs(tmp_path: Path) -> None:
+    os.chmod(tmp_path, 0o700)
+    for name in ("1.evlog", "2.evlog", "3.csv", "other.evlog"):
+        (tmp_path / name).write_bytes(b"")
+    _age(str(tmp_path / "1.evlog"), 10)
+    cache = EventLogCache(str(tmp_path), max_bytes=0)
+
+    assert cache.recent(".evlog", limit=5) == [
+        ("2", str(tmp_path / "2.evlog")),
+        ("1", str(tmp_path / "1.evlog")),
+    ]
+    assert cache.recent(".evlog", limit=1) == [("2", str(tmp_path / "2.evlog"))]
+
+
+def test_recent_ignores_a_shared_directory(tmp_path: Path) -> None:
+    (tmp_path / "1.evlog").write_bytes(b"")
+    os.chmod(tmp_path, 0o777)
+    cache = EventLogCache(str(tmp_path), max_bytes=0)
+
+    assert cache.recent(".evlog", limit=5) == []
@@ -0,0 +1,75 @@
+"""Tests for the binary event log format"""
+
+import numpy as np
+import pytest
+
+from src.services.event_log import EventLog
+from src.services.event_log_format import load_event_log, save_event_log
+from src.services.rollups import rollup_for
+
+
+@pytest.fixture
+def log() -> EventLog:
+    return EventLog.from_columns(
+        cases=["c2", "c1", "c1", "c2", "c3", "c1"],
+        activities=["Start", "Start", "Review", "End", "Start", "End"],
+        timestamps=[
+            "2025-01-03T09:00:00",
+            "2025-01-01T09:00:00",
+            "2025-01-01T10:30:00",
+            "2025-01-04T12:00:00",
+            "2025-04-02T08:00:00",
+            "2025-01-02T17:00:00",
+        ],
+        name="orders.csv",
+        case_column="order_id",
+        source_id="42",
+    )
+
+
+def test_round_trip_preserves_columns_and_metadata(log, tmp_path):
+    path = str(tmp_path / "orders.evlog")
+    save_event_log(log, path)
+    loaded = load_event_log(path)
+
+    np.testing.assert_array_equal(loaded.case_codes, log.case_codes)
+    np.testing.assert_array_equal(loaded.activity_codes, log.activity_codes)
+    np.testing.assert_array_equal(loaded.timestamps, log.timestamps)
+    np.testing.assert_array_equal(loaded.case_offsets, log.case_offsets)
+    assert loaded.case_labels.tolist() == log.case_labels.tolist()
+    assert loaded.activity_labels.tolist() == log.activity_labels.tolist()
+    assert (loaded.name, loaded.case_column, loaded.source_id) == (
+        "orders.csv",
+        "order_id",
+        "42",
+    )
+
+
+def test_round_trip_is_memory_mapped(log, tmp_path):
+    path = str(tmp_path / "orders.evlog")
+    save_event_log(log, path)
+    loaded = load_event_log(path)
+
+    assert not loaded.case_codes.flags.writeable
+    assert not loaded.timestamps.flags.writeable
+
+
+def test_round_trip_keeps_materialized_rollup(log, tmp_path):
+    path = str(tmp_path / "orders.evlog")
+    save_event_log(log, path)
+    loaded = load_event_log(path)
+
+    assert loaded.rollup is not None
+    expected = rollup_for(log).columns()
+    stored = loaded.rollup.columns()
+    assert stored.keys() == expected.keys()
+    for name, values in expected.items():
+        np.testing.assert_array_equal(stored[name], values)
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "orders.csv"
+    path.write_bytes(b"case_id,activity,timestamp\n")
+
+    with pytest.raises(ValueError, match="not a binary event log"):
+        load_event_log(str(path))
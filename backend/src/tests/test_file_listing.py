@@ -0,0 +1,116 @@
+"""Tests for keyset pagination of uploaded files"""
+
+from typing import Any, Dict, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.core.constants import Uploads
+from src.services.file_listing import decode_cursor, encode_cursor
+from src.tests.conftest import USER_ID
+from src.tests.fake_supabase import FakeSupabase
+
+URL = "/api/v1/csv_datasource/files"
+
+
+def _add_files(supabase: FakeSupabase, count: int) -> List[Dict[str, Any]]:
+    """Files of USER_ID, several sharing an upload time, plus another user's"""
+    rows = [
+        supabase.insert(
+            Uploads.TABLE,
+            {
+                "user_id": USER_ID,
+                "file_name": f"{i}.csv",
+                "file_url": f"{USER_ID}/{i}.csv",
+                # Three files per second, so pages split ties on uploaded_at
+                "uploaded_at": f"2025-01-01T00:00:{i // 3:02d}",
+            },
+        )
+        for i in range(count)
+    ]
+    supabase.insert(
+        Uploads.TABLE,
+        {"user_id": "someone-else", "uploaded_at": "2030-01-01T00:00:00"},
+    )
+    return rows
+
+
+def _pages(client: TestClient, limit: int) -> List[Dict[str, Any]]:
+    pages = []
+    cursor = None
+    while True:
+        params: Dict[str, Any] = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(URL, params=params)
+        assert response.status_code == 200, response.text
+        pages.append(response.json())
+        cursor = pages[-1]["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip() -> None:
+    cursor = encode_cursor({"uploaded_at": "2025-01-01T00:00:00", "id": 7})
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == ("2025-01-01T00:00:00", 7)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", "WzFd", "WyJ4IiwgIjEiXQ"])
+def test_invalid_cursor(cursor: str) -> None:
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 4, 10, 11])
+def test_pages_cover_every_file_once_newest_first(
+    client: TestClient, supabase: FakeSupabase, limit: int
+) -> None:
+    rows = _add_files(supabase, 10)
+
+    pages = _pages(client, limit)
+
+    ids = [row["id"] for page in pages for row in page["data"]]
+    expected = sorted(rows, key=lambda row: (row["uploaded_at"], row["id"]))
+    assert ids == [row["id"] for row in reversed(expected)]
+    assert all(len(page["data"]) <= limit for page in pages)
+    assert len(pages) == max(-(-10 // limit), 1)
+    assert {page["count"] for page in pages} == {10}
+
+
+def test_pages_only_return_list_columns(
+    client: TestClient, supabase: FakeSupabase
+) -> None:
+    _add_files(supabase, 1)
+
+    row = client.get(URL).json()["data"][0]
+
+    assert set(row) == {column.strip() for column in Uploads.LIST_COLUMNS.split(",")}
+
+
+def test_invalid_cursor_is_a_bad_request(client: TestClient) -> None:
+    response = client.get(URL, params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+
+
+def test_count_is_cached_until_an_upload(
+    client: TestClient, supabase: FakeSupabase
+) -> None:
+    _add_files(supabase, 2)
+
+    def count_requests() -> int:
+        return sum(request.method == "HEAD" for request in supabase.requests)
+
+    assert client.get(URL).json()["count"] == 2
+    assert client.get(URL).json()["count"] == 2
+    assert count_requests() == 1
+
+    response = client.post(
+        "/api/v1/csv_datasource/upload",
+        files={"file": ("new.csv", b"a\n1\n", "text/csv")},
+    )
+    assert response.status_code == 200, response.text
+    assert client.get(URL).json()["count"] == 3
+    assert count_requests() == 2
@@ -0,0 +1,36 @@
+"""Tests for the MessagePack graph payload"""
+
+import asyncio
+import io
+
+import msgpack
+import numpy as np
+
+from src.api.graph_payload import MSGPACK_MEDIA_TYPE, msgpack_response
+from src.models.process_mining import ProcessMiningDataResponse
+from src.services.event_log import EventLog
+from src.services.process_mining_engine import ProcessMiningEngine
+
+CSV = (
+    "case_id,activity,timestamp\n"
+    "1,Receive,2025-01-02 09:00:00\n"
+    "1,Approve,2025-01-02 10:00:00\n"
+    "2,Receive,2025-01-03 09:00:00\n"
+    "2,Reject,2025-01-03 11:00:00\n"
+)
+
+
+def test_msgpack_response_mirrors_the_data() -> None:
+    log = EventLog.from_csv(io.StringIO(CSV), name="orders.csv", source_id="1")
+    data = ProcessMiningEngine().analyze([log])
+
+    response = asyncio.run(msgpack_response(data, ProcessMiningDataResponse))
+
+    assert response.media_type == MSGPACK_MEDIA_TYPE
+    document = msgpack.unpackb(response.body, raw=False)
+    assert document["overall_metrics"] == data["overall_metrics"]
+    graph = document["processes"][0]["graph"]
+    edges = data["processes"][0]["graph"]["edges"]
+    assert graph["edge_count"] == len(edges)
+    sources = np.frombuffer(graph["edges"]["from"], dtype="<u4")
+    assert [graph["node_ids"][i] for i in sources] == [edge["from"] for edge in edges]
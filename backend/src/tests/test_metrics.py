@@ -0,0 +1,54 @@
+"""Tests for the Prometheus metrics scraped from /metrics"""
+
+from typing import Dict, Optional
+
+from fastapi.testclient import TestClient
+from prometheus_client.parser import text_string_to_metric_families
+
+DETAIL_ROUTE = "/api/v1/process-mining/processes/{process_id}"
+
+
+def _sample(client: TestClient, name: str, labels: Dict[str, str]) -> Optional[float]:
+    """Value of the scraped sample with a name and (a superset of) labels"""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    for family in text_string_to_metric_families(response.text):
+        for sample in family.samples:
+            if sample.name == name and labels.items() <= sample.labels.items():
+                return float(sample.value)
+    return None
+
+
+def test_requests_are_recorded_per_route_template(client: TestClient) -> None:
+    labels = {"method": "GET", "route": DETAIL_ROUTE}
+    counted = {**labels, "status": "404"}
+    before = _sample(client, "tessely_http_requests_total", counted) or 0
+    observed = _sample(client, "tessely_http_request_duration_seconds_count", labels)
+
+    for process_id in ("proc_998", "proc_999"):
+        response = client.get(f"/api/v1/process-mining/processes/{process_id}")
+        assert response.status_code == 404
+
+    assert _sample(client, "tessely_http_requests_total", counted) == before + 2
+    assert _sample(client, "tessely_http_request_duration_seconds_count", labels) == (
+        (observed or 0) + 2
+    )
+    bucket = {**labels, "le": "+Inf"}
+    assert _sample(client, "tessely_http_request_duration_seconds_bucket", bucket)
+    assert _sample(client, "tessely_http_requests_in_progress", labels) == 0
+
+
+def test_unmatched_paths_share_one_route_label(client: TestClient) -> None:
+    client.get("/no/such/path/1")
+    client.get("/no/such/path/2")
+
+    labels = {"method": "GET", "route": "unmatched", "status": "404"}
+    assert (_sample(client, "tessely_http_requests_total", labels) or 0) >= 2
+
+
+def test_stage_and_cache_metrics_are_exported(client: TestClient) -> None:
+    assert client.get("/api/v1/process-mining/data").status_code == 200
+
+    serialization = {"stage": "serialization"}
+    assert _sample(client, "tessely_stage_duration_seconds_count", serialization)
+    assert _sample(client, "tessely_cache_entries", {"cache": "principal"}) is not None
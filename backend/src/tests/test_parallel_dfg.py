@@ -0,0 +1,75 @@
+"""Tests that parallel discovery matches the single-process discovery"""
+
+from collections.abc import Iterator
+
+import numpy as np
+import pytest
+
+from src.services import parallel_dfg
+from src.services.dfg_miner import discover_dfg
+from src.services.event_log import EventLog
+from src.services.parallel_dfg import discover_parallel, shutdown_discovery_pool
+from src.services.rollups import case_outcomes
+
+
+@pytest.fixture
+def log() -> EventLog:
+    """Random log with repeated activities and equal timestamps"""
+    rng = np.random.default_rng(7)
+    lengths = rng.integers(1, 12, size=300)
+    cases = np.repeat(np.arange(len(lengths)), lengths)
+    activities = rng.integers(0, 6, size=len(cases))
+    timestamps = np.datetime64("2025-01-01T00:00:00") + np.cumsum(
+        rng.integers(0, 3600, size=len(cases))
+    ).astype("timedelta64[s]")
+    return EventLog.from_columns(
+        cases.astype(str).tolist(),
+        [f"activity {a}" for a in activities],
+        timestamps.astype(str).tolist(),
+    )
+
+
+@pytest.fixture
+def small_shards(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """Shard small logs as if they were large, and stop the workers afterwards"""
+    monkeypatch.setattr(parallel_dfg, "MIN_EVENTS_PER_SHARD", 200)
+    try:
+        yield
+    finally:
+        shutdown_discovery_pool()
+
+
+@pytest.mark.usefixtures("small_shards")
+def test_parallel_discovery_matches_discover_dfg(log: EventLog) -> None:
+    cycle_seconds, completed, straight_through = case_outcomes(log)
+    expected = discover_dfg(log, completed)
+
+    graph, *outcomes = discover_parallel(log, workers=2)
+
+    assert len(parallel_dfg._case_shards(log, 2)) == 2
+    for actual, wanted in zip(outcomes, (cycle_seconds, completed, straight_through)):
+        np.testing.assert_array_equal(actual, wanted)
+    for field in (
+        "edge_sources",
+        "edge_targets",
+        "edge_counts",
+        "activity_case_counts",
+        "activity_completed_cases",
+        "activity_outgoing",
+        "start_counts",
+        "end_counts",
+    ):
+        np.testing.assert_array_equal(
+            getattr(graph, field), getattr(expected, field), err_msg=field
+        )
+    # Interpolation positions are offset by the run starts, so quantiles may
+    # differ in the last bits
+    for field in (
+        "edge_mean_seconds",
+        "edge_median_seconds",
+        "edge_p95_seconds",
+        "activity_mean_to_next_seconds",
+    ):
+        np.testing.assert_allclose(
+            getattr(graph, field), getattr(expected, field), err_msg=field
+        )
@@ -0,0 +1,119 @@
+"""Tests for principal cache expiry and token revocation"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+from supabase import AuthApiError
+
+from src.api import dependencies
+from src.api.dependencies import TokenRevocationList, authenticate_locally
+from src.core import principal_cache as principal_cache_module
+from src.core.config import settings
+from src.core.principal_cache import PrincipalCache, token_hash
+
+
+class Clock:
+    """Settable replacement for the time module"""
+
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock(1_000_000.0)
+    monkeypatch.setattr(principal_cache_module, "time", clock)
+    return clock
+
+
+def _token(expires_at: float, sub: str = "user-1") -> str:
+    return jwt.encode(
+        {"sub": sub, "aud": "authenticated", "exp": int(expires_at)},
+        settings.SUPABASE_JWT_SECRET,
+        algorithm="HS256",
+    )
+
+
+def _lookup(cache: PrincipalCache, token: str, loads: List[str]) -> Dict[str, Any]:
+    async def loader() -> Dict[str, Any]:
+        loads.append(token)
+        return {"id": "user-1", "load": len(loads)}
+
+    return asyncio.run(cache.get_or_load(token, loader))
+
+
+def test_entries_expire_after_the_ttl(clock: Clock) -> None:
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    token = _token(clock.now + 3600)
+    loads: List[str] = []
+
+    _lookup(cache, token, loads)
+    clock.now += 59
+    assert _lookup(cache, token, loads)["load"] == 1
+    clock.now += 1
+    assert _lookup(cache, token, loads)["load"] == 2
+
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_entries_never_outlive_the_token(clock: Clock) -> None:
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    token = _token(clock.now + 10)
+    loads: List[str] = []
+
+    _lookup(cache, token, loads)
+    clock.now += 10
+    _lookup(cache, token, loads)
+
+    assert len(loads) == 2
+
+
+def test_logout_invalidates_and_lru_evicts(clock: Clock) -> None:
+    cache = PrincipalCache(max_size=1, ttl_seconds=60)
+    first, second = _token(clock.now + 3600), _token(clock.now + 3600, "user-2")
+    loads: List[str] = []
+
+    _lookup(cache, first, loads)
+    cache.invalidate(first)
+    _lookup(cache, first, loads)
+    _lookup(cache, second, loads)
+    _lookup(cache, first, loads)
+
+    assert loads == [first, first, second, first]
+    assert cache.stats()["evictions"] == 2
+
+
+def test_revoked_token_is_refused(monkeypatch: pytest.MonkeyPatch) -> None:
+    def get_user(token: str) -> Any:
+        raise AuthApiError("Session not found", 403, "session_not_found")
+
+    monkeypatch.setattr(
+        dependencies,
+        "get_supabase_client",
+        lambda: SimpleNamespace(auth=SimpleNamespace(get_user=get_user)),
+    )
+    revocations = TokenRevocationList(check_interval_seconds=60)
+    monkeypatch.setattr(dependencies, "revocation_list", revocations)
+    monkeypatch.setattr(settings, "AUTH_REVOCATION_CHECK", True)
+    token = _token(time.time() + 3600)
+
+    async def first_request() -> Dict[str, Any]:
+        user = authenticate_locally(token)
+        # Let the background check finish
+        await asyncio.gather(*list(revocations._tasks))
+        return user
+
+    assert asyncio.run(first_request())["id"] == "user-1"
+    assert revocations.is_revoked(token_hash(token))
+    with pytest.raises(HTTPException) as error:
+        authenticate_locally(token)
+    assert error.value.status_code == 401
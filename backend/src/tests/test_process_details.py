@@ -0,0 +1,74 @@
+"""Tests for looking up a single process without analyzing the dataset"""
+
+from typing import Any, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.services.process_mining_engine import ProcessMiningEngine
+from src.tests.test_csv_datasource import EVENT_LOG
+
+URL = "/api/v1/process-mining/processes"
+
+
+@pytest.fixture
+def computed(monkeypatch: pytest.MonkeyPatch) -> List[Any]:
+    """Source ids of the event logs the engine builds processes from"""
+    calls: List[Any] = []
+    build_process = ProcessMiningEngine.build_process
+    analyze = ProcessMiningEngine.analyze
+
+    def spy_build_process(self: Any, log: Any, *args: Any, **kwargs: Any) -> Any:
+        calls.append(log.source_id)
+        return build_process(self, log, *args, **kwargs)
+
+    def spy_analyze(self: Any, logs: Any, *args: Any, **kwargs: Any) -> Any:
+        calls.append([log.source_id for log in logs])
+        return analyze(self, logs, *args, **kwargs)
+
+    monkeypatch.setattr(ProcessMiningEngine, "build_process", spy_build_process)
+    monkeypatch.setattr(ProcessMiningEngine, "analyze", spy_analyze)
+    return calls
+
+
+def _upload(client: TestClient, name: str) -> str:
+    response = client.post(
+        "/api/v1/csv_datasource/upload",
+        files={"file": (name, EVENT_LOG, "text/csv")},
+    )
+    assert response.status_code == 200, response.text
+    return str(response.json()["data"]["id"])
+
+
+def test_only_the_requested_process_is_computed(
+    client: TestClient, computed: List[Any]
+) -> None:
+    first = _upload(client, "first.csv")
+    _upload(client, "second.csv")
+
+    response = client.get(f"{URL}/proc_{first}")
+
+    assert response.status_code == 200, response.text
+    assert response.json()["process_id"] == f"proc_{first}"
+    assert computed == [first]
+
+
+@pytest.mark.parametrize("process_id", ["proc_999", "proc_order_mgmt_v1"])
+def test_unknown_process_is_not_found_without_analysis(
+    client: TestClient, computed: List[Any], process_id: str
+) -> None:
+    _upload(client, "events.csv")
+
+    response = client.get(f"{URL}/{process_id}")
+
+    assert response.status_code == 404
+    assert computed == []
+
+
+def test_demo_process_without_event_logs(
+    client: TestClient, computed: List[Any]
+) -> None:
+    response = client.get(f"{URL}/proc_order_mgmt_v1")
+
+    assert response.status_code == 200, response.text
+    assert computed == []
@@ -0,0 +1,75 @@
+"""Tests for rollup cubes against the full process mining computation"""
+
+import numpy as np
+import pytest
+
+from src.services.event_log import EventLog
+from src.services.process_mining_engine import ProcessMiningEngine
+from src.services.rollups import Rollup, build_rollup, combine_rollups, rollup_for
+from src.services.time_periods import parse_time_period
+
+# Q1 cases mostly end in "cancel", Q2 cases in "ship": "ship" is the terminal
+# activity of the log, but not of the Q1 cases on their own
+CASES = [
+    ("q1-a", ["order", "cancel"], "2025-01-10T08:00:00"),
+    ("q1-b", ["order", "cancel"], "2025-02-03T09:30:00"),
+    ("q1-c", ["order", "pack", "ship"], "2025-03-20T23:00:00"),
+    ("q2-a", ["order", "pack", "ship"], "2025-04-02T10:00:00"),
+    ("q2-b", ["order", "pack", "pack", "ship"], "2025-05-15T12:00:00"),
+    ("q2-c", ["order", "pack", "ship"], "2025-06-30T18:00:00"),
+    ("q2-d", ["order", "ship"], "2025-06-30T19:00:00"),
+]
+
+
+@pytest.fixture
+def log() -> EventLog:
+    cases, activities, timestamps = [], [], []
+    for case, steps, start in CASES:
+        base = np.datetime64(start)
+        for hour, activity in enumerate(steps):
+            cases.append(case)
+            activities.append(activity)
+            timestamps.append(str(base + np.timedelta64(hour * 7, "h")))
+    return EventLog.from_columns(cases, activities, timestamps, name="orders.csv")
+
+
+@pytest.mark.parametrize("time_period", [None, "Q1-2025", "Q2-2025", "2025-06"])
+def test_rollups_match_the_full_computation(
+    log: EventLog, time_period: str | None
+) -> None:
+    window = parse_time_period(time_period) if time_period else None
+    sub_log = log.cases_started_between(*window) if window else log
+
+    expected = ProcessMiningEngine().analyze([sub_log])["overall_metrics"]
+    actual = combine_rollups([rollup_for(log)], window)
+
+    assert actual["total_cases_processed"] == expected["total_cases_processed"]
+    for key in (
+        "overall_process_efficiency",
+        "average_cycle_time_days",
+        "straight_through_processing_rate",
+    ):
+        assert actual[key] == pytest.approx(expected[key]), key
+
+
+def test_windows_judge_completion_by_the_log_terminal_activity(log: EventLog) -> None:
+    q1 = log.cases_started_between(*parse_time_period("Q1-2025"))
+
+    assert q1.terminal_activity() == log.terminal_activity()
+    metrics = ProcessMiningEngine().analyze([q1])["overall_metrics"]
+    assert metrics["overall_process_efficiency"] == pytest.approx(1 / 3)
+
+
+def test_rollup_days_sum_to_the_log(log: EventLog) -> None:
+    rollup = build_rollup(log)
+
+    assert rollup.days.tolist() == sorted(set(rollup.days.tolist()))
+    assert int(rollup.case_counts.sum()) == log.num_cases
+    assert rollup.totals()["completed"] == 5.0
+
+
+def test_from_columns_ignores_unknown_columns(log: EventLog) -> None:
+    columns = build_rollup(log).columns()
+    legacy = {**columns, "activity_events": np.arange(3)}
+
+    assert Rollup.from_columns(legacy).columns().keys() == columns.keys()
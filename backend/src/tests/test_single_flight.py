@@ -0,0 +1,103 @@
+"""Tests for single-flight coalescing and the caches built on it"""
+
+import asyncio
+from typing import Any, Dict
+
+from src.core.principal_cache import PrincipalCache
+from src.core.single_flight import SingleFlight
+from src.services.result_cache import ResultCache
+
+
+def test_concurrent_loads_share_one_call() -> None:
+    calls = 0
+
+    async def load() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return 42
+
+    async def main() -> list[int]:
+        flights: SingleFlight[str, int] = SingleFlight()
+        return await asyncio.gather(*(flights.run("key", load) for _ in range(5)))
+
+    assert asyncio.run(main()) == [42] * 5
+    assert calls == 1
+
+
+def test_failures_reach_every_waiter_and_are_not_remembered() -> None:
+    calls = 0
+
+    async def load() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        if calls == 1:
+            raise RuntimeError("upstream down")
+        return 7
+
+    async def main() -> tuple[list[Any], int]:
+        flights: SingleFlight[str, int] = SingleFlight()
+        first = await asyncio.gather(
+            flights.run("key", load), flights.run("key", load), return_exceptions=True
+        )
+        assert "key" not in flights
+        return first, await flights.run("key", load)
+
+    first, retried = asyncio.run(main())
+    assert all(isinstance(outcome, RuntimeError) for outcome in first)
+    assert retried == 7
+    assert calls == 2
+
+
+def test_result_cache_computes_once_per_key() -> None:
+    calls = 0
+
+    async def compute() -> Dict[str, Any]:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"nodes": []}
+
+    async def main(cache: ResultCache) -> None:
+        key = ("user", "v1", None, None)
+        await asyncio.gather(*(cache.get_or_compute(key, compute) for _ in range(3)))
+        await cache.get_or_compute(key, compute)
+
+    cache = ResultCache(max_entries=4)
+    asyncio.run(main(cache))
+    assert calls == 1
+    assert cache.stats() == {"size": 1, "hits": 3, "misses": 1, "evictions": 0}
+
+
+def test_principal_cache_counts_coalesced_lookups() -> None:
+    async def loader() -> Dict[str, Any]:
+        await asyncio.sleep(0.01)
+        return {"id": "user"}
+
+    async def main(cache: PrincipalCache) -> None:
+        await asyncio.gather(*(cache.get_or_load("token", loader) for _ in range(3)))
+        await cache.get_or_load("token", loader)
+
+    cache = PrincipalCache(max_size=4, ttl_seconds=60)
+    asyncio.run(main(cache))
+    stats = cache.stats()
+    assert (stats["misses"], stats["coalesced"], stats["hits"]) == (1, 2, 1)
+
+
+def test_result_cache_disabled_still_coalesces() -> None:
+    calls = 0
+
+    async def compute() -> Dict[str, Any]:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {}
+
+    async def main() -> None:
+        cache = ResultCache(max_entries=0)
+        key = ("user", "v1", None, None)
+        await asyncio.gather(*(cache.get_or_compute(key, compute) for _ in range(3)))
+
+    asyncio.run(main())
+    assert calls == 1
@@ -0,0 +1,69 @@
+"""Tests for column sketches and the single parse pass of uploads"""
+
+import io
+
+import numpy as np
+
+from src.services.csv_ingestion import parse_upload
+from src.services.sketches import ColumnSketch, TableSketch, hash_strings
+
+
+def test_empty_strings_hash_like_in_mixed_batches() -> None:
+    empty = hash_strings(["", ""], np.zeros(2, dtype=np.int64))
+    mixed = hash_strings(["", "ab"], np.array([0, 2], dtype=np.int64))
+
+    assert empty.dtype == np.uint64
+    assert empty[0] == empty[1] == mixed[0]
+    assert mixed[1] != mixed[0]
+
+
+def test_all_empty_column_is_all_null() -> None:
+    sketch = ColumnSketch("b")
+    sketch.update(["", "", ""])
+
+    assert (sketch.rows, sketch.nulls, sketch.distinct) == (3, 3, 0.0)
+
+
+def test_short_rows_are_padded_with_nulls() -> None:
+    table = TableSketch(["a", "b", "c"])
+    table.update([["1"], ["2", "x"]])
+
+    columns = [ColumnSketch.from_dict(data) for data in table.to_dicts()]
+    assert [(c.name, c.rows, c.nulls) for c in columns] == [
+        ("a", 2, 0),
+        ("b", 2, 1),
+        ("c", 2, 2),
+    ]
+
+
+def test_parse_upload_sketches_files_that_are_not_event_logs() -> None:
+    log, sketches = parse_upload(io.BytesIO(b"a,b,c\n1,,x\n2,,y\n"), "plain.csv")
+
+    assert log is None
+    columns = {data["name"]: ColumnSketch.from_dict(data) for data in sketches}
+    assert columns["a"].distinct == 2
+    assert (columns["b"].rows, columns["b"].nulls) == (2, 2)
+
+
+def test_parse_upload_builds_event_log_and_sketches_in_one_pass() -> None:
+    content = (
+        "case_id;activity;timestamp\n"
+        "1;Receive;2025-01-02 09:00:00\n"
+        "1;Approve;2025-01-02 10:00:00\n"
+        "2;Receive;2025-01-03 09:00:00\n"
+    )
+
+    log, sketches = parse_upload(io.BytesIO(content.encode()), "events.csv")
+
+    assert log is not None
+    assert (log.num_cases, log.num_events) == (2, 3)
+    columns = {data["name"]: ColumnSketch.from_dict(data) for data in sketches}
+    assert columns["case_id"].rows == 3
+    assert columns["case_id"].distinct == 2
+    assert columns["activity"].distinct == 2
+
+
+def test_parse_upload_gives_up_on_invalid_csv() -> None:
+    content = b"a,b\n1,2\n" + b"3," + b"x" * 200_000 + b"\n"
+
+    assert parse_upload(io.BytesIO(content), "huge.csv") == (None, [])
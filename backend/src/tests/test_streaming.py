@@ -0,0 +1,70 @@
+"""Tests that streamed JSON matches the response model's own serialization"""
+
+import io
+import json
+from typing import Any, Dict
+
+import pytest
+
+from src.api.streaming import iter_json, project
+from src.core.constants import ProcessMining
+from src.models.process_mining import (
+    ProcessDetailResponse,
+    ProcessMiningDataResponse,
+)
+from src.services.event_log import EventLog
+from src.services.process_mining_engine import ProcessMiningEngine
+from src.services.process_mining_service import ProcessMiningService
+
+CSV = (
+    "case_id,activity,timestamp,note\n"
+    "1,Receive,2025-01-02 09:00:00,x\n"
+    "1,Check,2025-01-02 09:30:00,x\n"
+    "1,Approve,2025-01-02 10:00:00,x\n"
+    "2,Receive,2025-01-03 09:00:00,x\n"
+    "2,Reject,2025-01-03 11:00:00,x\n"
+    "3,Receive,2025-01-04 09:00:00,x\n"
+    "3,Check,2025-01-04 09:10:00,x\n"
+    "3,Reject,2025-01-04 12:00:00,x\n"
+)
+
+
+def _analysis() -> Dict[str, Any]:
+    log = EventLog.from_csv(io.StringIO(CSV), name="orders.csv", source_id="1")
+    return ProcessMiningEngine().analyze([log])
+
+
+@pytest.fixture(params=[1000, 2], ids=["whole", "batched"])
+def batch_items(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> int:
+    """Stream lists whole, or in batches of two items"""
+    monkeypatch.setattr(ProcessMining, "STREAM_BATCH_ITEMS", request.param)
+    return int(request.param)
+
+
+@pytest.mark.parametrize("source", ["engine", "demo"])
+def test_iter_json_matches_model_dump_json(source: str, batch_items: int) -> None:
+    if source == "engine":
+        data = _analysis()
+    else:
+        data = ProcessMiningService()._get_mock_data()
+    expected = json.loads(
+        ProcessMiningDataResponse(**data).model_dump_json(by_alias=True)
+    )
+
+    chunks = list(iter_json(data, ProcessMiningDataResponse))
+
+    assert json.loads(b"".join(chunks)) == expected
+    if batch_items == 2:
+        assert len(chunks) > 1
+
+
+def test_project_matches_model_dump(batch_items: int) -> None:
+    process = {**_analysis()["processes"][0], "unknown": "dropped"}
+    model = ProcessDetailResponse(**process)
+
+    projected = project(process, ProcessDetailResponse)
+
+    assert projected == model.model_dump(by_alias=True)
+    assert json.loads(b"".join(iter_json(process, ProcessDetailResponse))) == (
+        json.loads(model.model_dump_json(by_alias=True))
+    )
@@ -0,0 +1,63 @@
+"""Known-answer tests for process variants"""
+
+import numpy as np
+import pytest
+
+from src.services.event_log import EventLog
+from src.services.variants import build_variant_table
+
+START = np.datetime64("2025-01-01T00:00:00")
+
+# Activities and hours after START of every case; the last event of a case
+# is at its cycle time
+CASES = [
+    ("abc", [0, 1, 1]),
+    ("abc", [0, 1, 2]),
+    ("abc", [0, 3, 6]),
+    ("ac", [0, 24]),
+    ("ac", [0, 72]),
+    ("ab", [0, 12]),
+    ("ab", [0, 12]),
+    ("abcb", [0, 1, 2, 3]),
+    ("d", [0]),
+]
+
+
+@pytest.fixture
+def log() -> EventLog:
+    cases, activities, timestamps = [], [], []
+    for case, (steps, hours) in enumerate(CASES):
+        for activity, hour in zip(steps, hours):
+            cases.append(f"case {case}")
+            activities.append(activity)
+            timestamps.append(str(START + np.timedelta64(hour, "h")))
+    return EventLog.from_columns(cases, activities, timestamps)
+
+
+def test_top_variants(log: EventLog) -> None:
+    table = build_variant_table(log)
+
+    assert (table.num_variants, table.num_cases) == (5, 9)
+    top = table.top(10)
+    # Equal counts rank shorter, then alphabetically earlier, traces first
+    assert [(v["activities"], v["case_count"]) for v in top] == [
+        (["a", "b", "c"], 3),
+        (["a", "b"], 2),
+        (["a", "c"], 2),
+        (["d"], 1),
+        (["a", "b", "c", "b"], 1),
+    ]
+    assert [v["rank"] for v in top] == [1, 2, 3, 4, 5]
+    assert top[0]["case_percentage"] == pytest.approx(3 / 9)
+    assert top[0]["average_cycle_time_days"] == pytest.approx(3 / 24)
+    assert top[0]["median_cycle_time_days"] == pytest.approx(2 / 24)
+    assert top[2]["average_cycle_time_days"] == pytest.approx(2)
+    assert top[3]["average_cycle_time_days"] == 0
+
+
+def test_top_k_is_a_prefix_of_the_full_ranking(log: EventLog) -> None:
+    table = build_variant_table(log)
+
+    full = table.top(10)
+    for k in range(6):
+        assert table.top(k) == full[:k]
@@ -4,20 +4,29 @@ export async function getUserCSVFiles() {
   const token = localStorage.getItem("@auth_token");
 
   try {
-    const response = await fetch(`${API_BASE_URL}/api/v1/csv_datasource/files`, {
-      method: "GET",
-      headers: {
-        Authorization: `Bearer ${token}`, 
-      },
-    });
+    // The listing is paginated; follow next_cursor until the last page
+    const files = [];
+    let cursor: string | null = null;
+    do {
+      const query: string = cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+      const response = await fetch(`${API_BASE_URL}/api/v1/csv_datasource/files${query}`, {
+        method: "GET",
+        headers: {
+          Authorization: `Bearer ${token}`, 
+        },
+      });
 
-    if (!response.ok) {
-      const errorData = await response.json();
-      throw new Error(errorData.detail || "Failed to fetch files");
-    }
+      if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.detail || "Failed to fetch files");
+      }
 
-    const data = await response.json();
-    return data.data;
+      const data = await response.json();
+      files.push(...data.data);
+      cursor = data.next_cursor;
+    } while (cursor);
+
+    return files;
   } catch (err) {
     console.error("Error fetching CSV files:", err);
     throw err;
@@ -25,44 +34,40 @@ export async function getUserCSVFiles() {
 }
 
 export async function uploadCSV(csvFiles: File[]) {
-  const results = [];
   const token = localStorage.getItem('@auth_token');
 
+  // One request for all files; the backend streams them concurrently
+  const formData = new FormData();
   for (const file of csvFiles) {
-    try {
-      const formData = new FormData();
-      formData.append('file', file);
-      
-      console.log(`Uploading file: ${file.name} (${file.size} bytes)`);
-      
-      const response = await fetch(`${API_BASE_URL}/api/v1/csv_datasource/upload`, {
-        method: 'POST',
-        headers: {
-          'Authorization': `Bearer ${token}`,
-        },
-        body: formData,
-      });
+    formData.append('files', file);
+  }
 
-      console.log('Response received:', response.status, response.statusText);
+  console.log(`Uploading ${csvFiles.length} files`);
 
-      if (!response.ok) {
-        const error = await response.json();
-        console.error('Upload failed:', error);
-        throw new Error(error.detail || 'Upload failed');
-      }
+  const response = await fetch(`${API_BASE_URL}/api/v1/csv_datasource/upload/batch`, {
+    method: 'POST',
+    headers: {
+      'Authorization': `Bearer ${token}`,
+    },
+    body: formData,
+  });
 
-      const result = await response.json();
-      console.log('Upload success:', result);
+  console.log('Response received:', response.status, response.statusText);
 
-      results.push(result.data);
-      
-    } catch (error) {
-      console.error(`Error uploading file: ${file.name}`, error);
-      throw error;  
-    }
+  const result = await response.json();
+  if (!response.ok) {
+    console.error('Upload failed:', result);
+    throw new Error(result.detail || 'Upload failed');
+  }
+
+  if (result.errors.length > 0) {
+    console.error('Some uploads failed:', result.errors);
+    const names = result.errors.map((error: { file_name: string }) => error.file_name);
+    throw new Error(`Upload failed for ${names.join(', ')}`);
   }
-  
-  return results;
+
+  console.log('Upload success:', result);
+  return result.data;
 }
 
 